@@ -0,0 +1,263 @@
+"""
+BACKTEST WALK-FORWARD
+=====================
+Évaluation des modèles sans regard vers le futur:
+- fenêtre d'entraînement croissante, un pli par journée (standings.assign_matchdays)
+- les plis s'exécutent dans un pool de processus
+- les features communes à tous les plis (encodage des équipes, buts, dates,
+  Elo avant-match) sont calculées une seule fois et partagées avec les workers;
+  l'Elo d'un pli est figé au début de la journée, comme l'entraînement des
+  autres modèles (aucun résultat de la journée testée n'est pris en compte)
+- log-loss, Brier et RPS par saison et par modèle
+
+Usage:
+    python backtest.py [--db data/matches.db] [--seasons 2021/2022 2022/2023] [--workers 4]
+"""
+
+import os
+import sys
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from storage import normalize_matches
+from standings import assign_matchdays, with_rounds
+from models.poisson import DixonColes, DEFAULT_XI
+from models.elo import EloModel, SCALE
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODELS = ('dixon_coles', 'poisson', 'elo', 'base_rates')
+MIN_TRAIN_MATCHES = 60
+
+# Features partagées par tous les plis (positionnées par _init_worker dans chaque processus)
+_SHARED: Dict[str, np.ndarray] = {}
+
+
+def encode_history(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Encode une fois pour toutes les matchs joués (tableaux partagés par les plis)
+
+    Returns:
+        Dict[str, np.ndarray]: teams, home, away, x, y, day, season, matchday, outcome,
+        elo_home, elo_away (Elo avant-match), elo_home_advantage
+    """
+    typed = with_rounds(normalize_matches(df), df)
+    typed = typed[typed['home_goals'].notna() & typed['away_goals'].notna() & typed['date'].notna()]
+    typed = typed.sort_values('date', kind='mergesort').reset_index(drop=True)
+
+    codes, teams = pd.factorize(pd.concat([typed['home_team'].astype(str), typed['away_team'].astype(str)]))
+    n = len(typed)
+    x = typed['home_goals'].to_numpy(dtype='float64')
+    y = typed['away_goals'].to_numpy(dtype='float64')
+    # Elo avant-match: un seul passage, chaque valeur ne dépend que des matchs antérieurs
+    elo_model = EloModel()
+    elo = elo_model.pre_match_ratings(typed)
+    return {
+        'teams': np.asarray(teams, dtype=str),
+        'home': codes[:n],
+        'away': codes[n:],
+        'x': x,
+        'y': y,
+        'day': (typed['date'] - pd.Timestamp('1970-01-01')).dt.days.to_numpy(),
+        'season': typed['season'].astype(str).to_numpy(),
+        'matchday': assign_matchdays(typed).to_numpy(dtype='int64'),
+        'outcome': np.select([x > y, x == y], [0, 1], default=2),
+        'elo_home': elo['home_elo'].to_numpy(),
+        'elo_away': elo['away_elo'].to_numpy(),
+        'elo_home_advantage': np.float64(elo_model.home_advantage),
+    }
+
+
+def _init_worker(shared: Dict[str, np.ndarray]):
+    global _SHARED
+    _SHARED = shared
+
+
+def _base_rates(train: np.ndarray, n_test: int) -> np.ndarray:
+    rates = np.bincount(_SHARED['outcome'][train], minlength=3) / train.sum()
+    return np.tile(rates, (n_test, 1))
+
+
+def frozen_elo_expected(shared: Dict[str, np.ndarray], test: np.ndarray, start_day: int) -> np.ndarray:
+    """
+    Espérance Elo des matchs du pli avec les classements figés au début de la journée
+
+    Le classement d'une équipe ne change qu'à ses propres matchs: son Elo au
+    jour start_day est son Elo avant-match lors de son premier match joué à
+    partir de ce jour (les matchs sont triés par date).
+    """
+    test_index = np.flatnonzero(test)
+    first = np.searchsorted(shared['day'], start_day)
+    window = np.arange(first, test_index.max() + 1)
+    # Premières apparitions de chaque équipe dans la fenêtre [début du pli, dernier match du pli]
+    teams = np.column_stack([shared['home'][window], shared['away'][window]]).ravel()
+    ratings = np.column_stack([shared['elo_home'][window], shared['elo_away'][window]]).ravel()
+    seen, first_seen = np.unique(teams, return_index=True)
+    frozen = dict(zip(seen, ratings[first_seen]))
+
+    home = np.array([frozen[team] for team in shared['home'][test_index]])
+    away = np.array([frozen[team] for team in shared['away'][test_index]])
+    return 1.0 / (1.0 + 10.0 ** ((away - home - shared['elo_home_advantage']) / SCALE))
+
+
+def _elo_probabilities(train: np.ndarray, test: np.ndarray, start_day: int) -> np.ndarray:
+    """Espérance Elo (classements figés au début du pli) -> 1X2 avec le taux de nuls de l'entraînement"""
+    draw = np.mean(_SHARED['outcome'][train] == 1)
+    expected = frozen_elo_expected(_SHARED, test, start_day)
+    home = np.clip(expected - draw / 2, 0.01, 1 - draw - 0.01)
+    return np.column_stack([home, np.full_like(home, draw), 1 - draw - home])
+
+
+def _poisson_probabilities(train: np.ndarray, test: np.ndarray, start_day: int,
+                           dixon_coles: bool, xi: float) -> np.ndarray:
+    s = _SHARED
+    weights = np.exp(-xi * (start_day - s['day'][train]))
+    model = DixonColes(xi=xi, dixon_coles=dixon_coles)
+    model.fit_arrays(s['teams'], s['home'][train], s['away'][train], s['x'][train], s['y'][train], weights)
+    home_idx, away_idx = s['home'][test], s['away'][test]
+    matrices = model.matrices_from_rates(
+        np.exp(model.attack[home_idx] + model.defence[away_idx] + model.home_advantage),
+        np.exp(model.attack[away_idx] + model.defence[home_idx]),
+    )
+    home = np.tril(matrices, -1).sum(axis=(1, 2))
+    draw = np.trace(matrices, axis1=1, axis2=2)
+    probs = np.column_stack([home, draw, np.triu(matrices, 1).sum(axis=(1, 2))])
+    return probs / probs.sum(axis=1, keepdims=True)
+
+
+def _run_fold(fold: tuple) -> Dict[str, np.ndarray]:
+    """Entraîne sur les matchs antérieurs à la journée et prédit la journée"""
+    season, matchday, models, xi = fold
+    s = _SHARED
+    test = (s['season'] == season) & (s['matchday'] == matchday)
+    start_day = s['day'][test].min()
+    train = s['day'] < start_day
+
+    result = {'index': np.flatnonzero(test)}
+    for name in models:
+        if name == 'dixon_coles':
+            result[name] = _poisson_probabilities(train, test, start_day, True, xi)
+        elif name == 'poisson':
+            result[name] = _poisson_probabilities(train, test, start_day, False, xi)
+        elif name == 'elo':
+            result[name] = _elo_probabilities(train, test, start_day)
+        elif name == 'base_rates':
+            result[name] = _base_rates(train, test.sum())
+        else:
+            raise ValueError(f"Modèle inconnu: {name}")
+    return result
+
+
+def walk_forward(df: pd.DataFrame, models: Sequence[str] = DEFAULT_MODELS, seasons: Sequence[str] = None,
+                 workers: int = None, min_train: int = MIN_TRAIN_MATCHES, xi: float = DEFAULT_XI) -> pd.DataFrame:
+    """
+    Prédictions walk-forward de chaque journée des saisons demandées
+
+    Args:
+        df (pd.DataFrame): Historique des matchs
+        models (Sequence[str]): Modèles évalués (voir DEFAULT_MODELS)
+        seasons (Sequence[str]): Saisons évaluées (toutes par défaut)
+        workers (int): Processus du pool (1 = exécution dans le processus courant)
+        min_train (int): Nombre minimal de matchs d'entraînement avant le premier pli
+
+    Returns:
+        pd.DataFrame: Une ligne par (match, modèle): season, matchday, home_team,
+        away_team, model, p_home, p_draw, p_away, outcome
+    """
+    shared = encode_history(df)
+    seasons = list(seasons) if seasons else list(dict.fromkeys(shared['season']))
+
+    folds = []
+    for season, matchday in sorted(set(zip(shared['season'], shared['matchday']))):
+        if season not in seasons:
+            continue
+        start_day = shared['day'][(shared['season'] == season) & (shared['matchday'] == matchday)].min()
+        if (shared['day'] < start_day).sum() >= min_train:
+            folds.append((season, matchday, tuple(models), xi))
+    if not folds:
+        raise ValueError("Aucun pli: historique trop court pour min_train")
+
+    workers = workers or os.cpu_count() or 1
+    logger.info(f"🔁 {len(folds)} plis, {len(models)} modèle(s), {workers} processus")
+    if workers == 1:
+        _init_worker(shared)
+        results = [_run_fold(fold) for fold in folds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shared,)) as executor:
+            results = list(executor.map(_run_fold, folds, chunksize=max(1, len(folds) // (4 * workers))))
+
+    # Assemblage en un seul DataFrame (un bloc de lignes par modèle)
+    index = np.concatenate([result['index'] for result in results])
+    frames = []
+    for name in models:
+        probs = np.concatenate([result[name] for result in results])
+        frames.append(pd.DataFrame({
+            'season': shared['season'][index],
+            'matchday': shared['matchday'][index],
+            'home_team': shared['teams'][shared['home'][index]],
+            'away_team': shared['teams'][shared['away'][index]],
+            'model': name,
+            'p_home': probs[:, 0],
+            'p_draw': probs[:, 1],
+            'p_away': probs[:, 2],
+            'outcome': shared['outcome'][index],
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def score_predictions(predictions: pd.DataFrame) -> pd.DataFrame:
+    """
+    Log-loss, Brier (multiclasse) et RPS par saison et par modèle
+
+    Returns:
+        pd.DataFrame: season, model, matches, log_loss, brier, rps
+    """
+    probs = predictions[['p_home', 'p_draw', 'p_away']].to_numpy()
+    actual = np.eye(3)[predictions['outcome'].to_numpy()]
+    scored = predictions[['season', 'model']].copy()
+    scored['log_loss'] = -np.log(np.clip((probs * actual).sum(axis=1), 1e-15, None))
+    scored['brier'] = ((probs - actual) ** 2).sum(axis=1)
+    # RPS: issues ordonnées domicile < nul < extérieur
+    cumulative = np.cumsum(probs, axis=1)[:, :2] - np.cumsum(actual, axis=1)[:, :2]
+    scored['rps'] = (cumulative ** 2).sum(axis=1) / 2
+    summary = scored.groupby(['season', 'model']).agg(
+        matches=('log_loss', 'size'), log_loss=('log_loss', 'mean'), brier=('brier', 'mean'), rps=('rps', 'mean'))
+    return summary.reset_index()
+
+
+def load_matches(db_path: str = None) -> pd.DataFrame:
+    """Historique depuis la base SQLite (MatchStore) ou, à défaut, depuis predict.load_history"""
+    if db_path:
+        from match_store import MatchStore
+        with MatchStore(db_path) as store:
+            return store.query()
+    from predict import load_history
+    return load_history()
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Backtest walk-forward des modèles de prédiction")
+    parser.add_argument('--db', help="Base SQLite MatchStore (sinon Parquet / CSV)")
+    parser.add_argument('--seasons', nargs='*', help="Saisons évaluées (toutes par défaut)")
+    parser.add_argument('--models', nargs='*', default=list(DEFAULT_MODELS))
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--output', help="CSV des prédictions de chaque pli")
+    args = parser.parse_args(argv)
+
+    predictions = walk_forward(load_matches(args.db), args.models, args.seasons, args.workers)
+    summary = score_predictions(predictions)
+    print(summary.to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+    if args.output:
+        predictions.to_csv(args.output, index=False, encoding='utf-8')
+        logger.info(f"✅ Prédictions sauvegardées dans {args.output}")
+    return summary
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main(sys.argv[1:])
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+BENCHMARK PARSING - Comparaison des backends HTML
+=================================================
+Mesure le débit (lignes/s) de chaque backend de html_parsing sur une page
+de type footystats_structure.html: le fichier sauvegardé par l'inspection
+s'il existe, sinon une page synthétique de même structure.
+
+Usage:
+    python benchmark_parsing.py [fichier.html] [--rows 2000] [--repeat 5]
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+from typing import List
+
+from html_parsing import available_backends
+
+logging.basicConfig(level=logging.INFO, format='%(message)s')
+logger = logging.getLogger(__name__)
+
+TEAMS = [
+    'Raja Casablanca', 'Wydad Casablanca', 'AS FAR', 'FUS Rabat', 'RS Berkane',
+    'Moghreb Fez', 'Hassania Agadir', 'Difaa Hassani', 'Ittihad Tanger', 'Olympic Safi',
+    'Mouloudia Oujda', 'Chabab Mohammedia', 'Maghreb Fès', 'Union Touarga',
+    'Youssoufia Berrechid', 'Sporting Casablanca',
+]
+
+
+def build_match_rows(n_rows: int, seed: int = 0, start: int = 0, link_prefix: str = 'match') -> List[str]:
+    """
+    Génère des lignes <tr> de table.matches-table au format FootyStats
+
+    Args:
+        n_rows (int): Nombre de lignes
+        seed (int): Graine pour des lignes reproductibles
+        start (int): Numéro de la première ligne (dates et liens de match)
+        link_prefix (str): Préfixe des liens de match (/morocco/<préfixe>-<numéro>)
+    """
+    rng = random.Random(seed)
+    rows = []
+    for i in range(start, start + n_rows):
+        home, away = rng.sample(TEAMS, 2)
+        hg, ag = rng.randint(0, 4), rng.randint(0, 4)
+        day = 1 + i % 28
+        month = 1 + (i // 28) % 12
+        rows.append(
+            f'<tr class="match-row"><td class="date">2023-{month:02d}-{day:02d}</td>'
+            f'<td class="team home"><a class="team-name" href="/clubs/{home}">{home}</a></td>'
+            f'<td class="score"><a class="match-link" href="/morocco/{link_prefix}-{i}">{hg} - {ag}</a>'
+            f'<span class="xg">{rng.uniform(0, 3):.2f} xG - {rng.uniform(0, 3):.2f} xG</span></td>'
+            f'<td class="team away"><a class="team-name" href="/clubs/{away}">{away}</a></td>'
+            f'<td class="status">FT</td></tr>'
+        )
+    return rows
+
+
+def wrap_matches_page(rows: List[str], padding: int = 200, head: str = '', load_more: bool = True) -> str:
+    """
+    Place des lignes <tr> dans une page FootyStats complète (navigation, scripts, table)
+
+    Args:
+        rows (List[str]): Lignes de la table
+        padding (int): Nombre de blocs de navigation/scripts autour de la table
+        head (str): HTML ajouté à la fin du <head> (ex: script du bouton "Voir plus")
+        load_more (bool): Ajoute le bouton `div.load_more`
+    """
+    filler = ''.join(
+        f'<li class="nav-item"><a href="/league/{i}">Ligue {i}</a><span class="flag">{i}</span></li>'
+        for i in range(padding)
+    )
+    scripts = ''.join(f'<script>var widget{i} = {{"id": {i}}};</script>' for i in range(padding // 10))
+    button = '<div class="load_more"><a href="#">Voir plus</a></div>' if load_more else ''
+    return (
+        '<html><head><title>Botola Pro Matches</title>' + scripts + head + '</head><body>'
+        '<nav><ul>' + filler + '</ul></nav>'
+        '<table class="matches-table"><thead><tr><th>Date</th><th>Home</th><th>Score</th>'
+        '<th>Away</th><th>Status</th></tr></thead><tbody>' + ''.join(rows) + '</tbody></table>'
+        + button +
+        '<footer><ul>' + filler + '</ul></footer></body></html>'
+    )
+
+
+def build_matches_page(n_rows: int, seed: int = 0, padding: int = 200) -> str:
+    """
+    Génère une page HTML au format FootyStats (table.matches-table + bouton load_more)
+
+    Args:
+        n_rows (int): Nombre de lignes de matchs
+        seed (int): Graine pour des pages reproductibles
+        padding (int): Nombre de blocs de navigation/scripts autour de la table
+    """
+    return wrap_matches_page(build_match_rows(n_rows, seed), padding)
+
+
+def run_benchmark(html: str, repeat: int = 5):
+    """Chronomètre chaque backend et affiche lignes/s"""
+    results = {}
+    for name, extract in available_backends().items():
+        best = float('inf')
+        n_rows = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            n_rows = len(extract(html))
+            best = min(best, time.perf_counter() - start)
+        results[name] = (n_rows, best)
+        logger.info(f"  {name:12} {n_rows:7d} lignes  {best * 1000:9.1f} ms  {n_rows / best:12,.0f} lignes/s")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des backends de parsing HTML")
+    parser.add_argument('fixture', nargs='?', default='footystats_structure.html')
+    parser.add_argument('--rows', type=int, default=2000, help="Lignes de la page synthétique")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if os.path.exists(args.fixture):
+        with open(args.fixture, 'r', encoding='utf-8') as f:
+            html = f.read()
+        logger.info(f"📖 Fixture: {args.fixture} ({len(html) / 1024:.0f} Ko)")
+    else:
+        html = build_matches_page(args.rows)
+        logger.info(f"🧪 Page synthétique: {args.rows} lignes ({len(html) / 1024:.0f} Ko)")
+
+    run_benchmark(html, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+BENCHMARK SCRAPER - Pipeline complet sur pages enregistrées
+===========================================================
+Rejoue des pages de saison enregistrées (fichiers HTML) et des pages
+synthétiques de 1k / 10k lignes, hors ligne et sans navigateur, et
+chronomètre chaque étape séparément pour chaque backend de parsing:
+    parse -> extract -> dataframe -> save
+Les résultats sont écrits en JSON (un fichier par exécution) et peuvent être
+comparés à une exécution de référence pour repérer les régressions.
+
+Usage:
+    python benchmark_scraper.py [pages.html ...] [--fixtures-dir benchmarks/fixtures]
+                                [--rows 1000 10000] [--repeat 3]
+                                [--output results.json] [--baseline previous.json]
+"""
+
+import os
+import sys
+import json
+import time
+import glob
+import platform
+import tempfile
+import subprocess
+import logging
+import argparse
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+import storage
+from html_parsing import backend_stages
+from benchmark_parsing import build_matches_page
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FIXTURES_DIR = os.path.join('benchmarks', 'fixtures')
+DEFAULT_RESULTS_DIR = os.path.join('benchmarks', 'results')
+DEFAULT_ROWS = (1000, 10000)
+STAGES = ('parse', 'extract', 'dataframe', 'save')
+# Ralentissement (relatif) au-delà duquel une étape est signalée
+REGRESSION_THRESHOLD = 0.10
+# Saison affectée aux lignes (comme le scraper), save_matches écrit un fichier par saison
+BENCHMARK_SEASON = 'benchmark'
+
+
+def collect_pages(paths: List[str], fixtures_dir: str, rows: List[int]) -> List[Tuple[str, str]]:
+    """
+    Pages rejouées: fichiers donnés, fichiers .html du répertoire de fixtures,
+    footystats_structure.html s'il existe, puis pages synthétiques
+
+    Returns:
+        List[Tuple[str, str]]: (nom, html)
+    """
+    files = list(paths) or sorted(glob.glob(os.path.join(fixtures_dir, '*.html')))
+    if not paths and os.path.exists('footystats_structure.html'):
+        files.append('footystats_structure.html')
+
+    pages = []
+    for path in files:
+        with open(path, 'r', encoding='utf-8') as f:
+            pages.append((os.path.basename(path), f.read()))
+    for n_rows in rows:
+        pages.append((f'synthetic_{n_rows}', build_matches_page(n_rows, seed=n_rows)))
+    return pages
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def _dataframe(records: List[Dict]) -> pd.DataFrame:
+    """Étape DataFrame du scraper: lignes étiquetées avec leur saison puis typées"""
+    df = pd.DataFrame.from_records(records)
+    df['season'] = BENCHMARK_SEASON
+    return storage.normalize_matches(df)
+
+
+def _save(df: pd.DataFrame, directory: str) -> int:
+    """Étape de sauvegarde du scraper: CSV, plus Parquet si activable; retourne les octets écrits"""
+    csv_path = os.path.join(directory, 'matches.csv')
+    df.to_csv(csv_path, index=False, encoding='utf-8')
+    written = os.path.getsize(csv_path)
+    if storage.HAS_PYARROW:
+        paths = storage.save_matches(df, os.path.join(directory, 'parquet'))
+        if not paths:
+            raise RuntimeError("Aucun fichier Parquet écrit: colonne 'season' manquante ?")
+        written += sum(os.path.getsize(path) for path in paths)
+    return written
+
+
+def benchmark_page(html: str, repeat: int = 3) -> Dict[str, Dict]:
+    """
+    Chronomètre les étapes de chaque backend sur une page (meilleur de `repeat`)
+
+    Returns:
+        Dict[str, Dict]: backend -> {rows, bytes_written, parse, extract, dataframe, save, total, rows_per_s}
+    """
+    results = {}
+    for name, (parse, extract) in backend_stages().items():
+        best = dict.fromkeys(STAGES, float('inf'))
+        n_rows = written = 0
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory() as directory:
+                tree, elapsed = _timed(parse, html)
+                best['parse'] = min(best['parse'], elapsed)
+                rows, elapsed = _timed(extract, tree)
+                best['extract'] = min(best['extract'], elapsed)
+                df, elapsed = _timed(_dataframe, rows)
+                best['dataframe'] = min(best['dataframe'], elapsed)
+                written, elapsed = _timed(_save, df, directory)
+                best['save'] = min(best['save'], elapsed)
+                n_rows = len(rows)
+            del tree
+
+        total = sum(best.values())
+        results[name] = dict(best, rows=n_rows, bytes_written=written, total=total,
+                             rows_per_s=n_rows / total if total else 0.0)
+    return results
+
+
+def _environment() -> Dict:
+    versions = {'python': platform.python_version(), 'pandas': pd.__version__}
+    for module in ('bs4', 'lxml', 'selectolax', 'pyarrow'):
+        try:
+            versions[module] = getattr(__import__(module), '__version__', 'installed')
+        except ImportError:
+            continue
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {'commit': commit, 'platform': platform.platform(), 'versions': versions}
+
+
+def run_suite(pages: List[Tuple[str, str]], repeat: int = 3) -> Dict:
+    """Exécute le benchmark sur toutes les pages; retourne le document JSON"""
+    report = {'timestamp': datetime.now().isoformat(timespec='seconds'), 'repeat': repeat,
+              'environment': _environment(), 'pages': {}}
+    for page_name, html in pages:
+        logger.info(f"\n📄 {page_name} ({len(html) / 1024:.0f} Ko)")
+        results = benchmark_page(html, repeat)
+        report['pages'][page_name] = {'size_bytes': len(html.encode('utf-8')), 'backends': results}
+        for backend, stats in results.items():
+            stages = '  '.join(f"{stage} {stats[stage] * 1000:8.1f} ms" for stage in STAGES)
+            logger.info(f"  {backend:12} {stats['rows']:6d} lignes  {stages}  {stats['rows_per_s']:10,.0f} lignes/s")
+    return report
+
+
+def compare(report: Dict, baseline: Dict, threshold: float = REGRESSION_THRESHOLD) -> List[str]:
+    """Étapes plus lentes que la référence au-delà du seuil (pages et backends communs)"""
+    regressions = []
+    for page_name, page in report['pages'].items():
+        previous_page = baseline.get('pages', {}).get(page_name)
+        if not previous_page:
+            continue
+        for backend, stats in page['backends'].items():
+            previous = previous_page['backends'].get(backend)
+            if not previous:
+                continue
+            for stage in STAGES + ('total',):
+                if previous.get(stage) and stats[stage] > previous[stage] * (1 + threshold):
+                    regressions.append(f"{page_name} / {backend} / {stage}: "
+                                       f"{previous[stage] * 1000:.1f} ms -> {stats[stage] * 1000:.1f} ms "
+                                       f"(+{stats[stage] / previous[stage] - 1:.0%})")
+    return regressions
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Benchmark du pipeline de scraping (hors ligne)")
+    parser.add_argument('pages', nargs='*', help="Pages HTML enregistrées (sinon --fixtures-dir)")
+    parser.add_argument('--fixtures-dir', default=DEFAULT_FIXTURES_DIR)
+    parser.add_argument('--rows', type=int, nargs='*', default=list(DEFAULT_ROWS),
+                        help="Tailles des pages synthétiques")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help="Fichier JSON des résultats (par défaut benchmarks/results/)")
+    parser.add_argument('--baseline', help="Résultats JSON d'une version précédente à comparer")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    pages = collect_pages(args.pages, args.fixtures_dir, args.rows)
+    if not pages:
+        logger.error("❌ Aucune page à rejouer")
+        return 1
+    report = run_suite(pages, args.repeat)
+
+    output = args.output or os.path.join(
+        DEFAULT_RESULTS_DIR, f"scraper_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"\n✅ Résultats sauvegardés dans {output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            logger.warning(f"⚠️  {len(regressions)} régression(s) par rapport à {args.baseline}:")
+            for line in regressions:
+                logger.warning(f"  {line}")
+            return 2
+        logger.info(f"✅ Aucune régression par rapport à {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    sys.exit(main(sys.argv[1:]))
@@ -6,19 +6,27 @@ depuis FootyStats.org avec gestion de Cloudflare et export en CSV.
 """
 
 import os
+import re
+import sys
 import time
 import pandas as pd
 import logging
 from datetime import datetime, timedelta
 from bs4 import BeautifulSoup
-from selenium import webdriver
+from html_parsing import make_soup, iter_match_rows, soup_match_rows
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from driver_pool import DriverPool, create_chrome_driver, profile_dir
+from selenium_waits import wait_for_rows_stable
+from incremental import IncrementalFilter, append_matches
+from storage import export_csv, parquet_enabled
+from match_store import sync_csv
+import settings
+from metrics import timer, incr, reported
+from rate_limiter import shared_limiter
 import requests
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Iterator
 
 # Configuration logging
 logging.basicConfig(
@@ -31,20 +39,27 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+XG_PATTERN = re.compile(r'(\d+\.?\d*)\s*xG')
+
 
 class BotolaScraper:
     """Scraper pour FootyStats.org - Botola Pro"""
     
-    def __init__(self, headless=False):
+    def __init__(self, headless=False, streaming=False, incremental: IncrementalFilter = None):
         """
         Initialise le scraper
         
         Args:
             headless (bool): Si True, lance le navigateur en mode headless (invisible)
+            streaming (bool): Si True, seule la table des matchs est parsée, ligne par ligne
+            incremental (IncrementalFilter): Si fourni, seuls les matchs nouveaux ou
+                modifiés sont extraits (arrêt dès les lignes déjà connues)
         """
-        self.base_url = "https://footystats.org/morocco/botola-pro"
+        self.base_url = settings.base_url()
         self.matches_url = f"{self.base_url}/matches"
         self.headless = headless
+        self.streaming = streaming
+        self.incremental = incremental
         self.driver = None
         self.session = requests.Session()
         self.session.headers.update({
@@ -52,144 +67,143 @@ class BotolaScraper:
         })
         
     def init_driver(self):
-        """Initialise le driver Selenium avec options optimisées"""
-        options = webdriver.ChromeOptions()
-        
-        if self.headless:
-            options.add_argument("--headless")
-        
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
-        options.add_argument("--start-maximized")
-        
+        """Initialise le driver Selenium avec options optimisées et profil persistant"""
         try:
-            self.driver = webdriver.Chrome(
-                service=Service(ChromeDriverManager().install()),
-                options=options
-            )
+            self.driver = create_chrome_driver(self.headless, profile_dir('botola_scraper'))
             logger.info("✅ Driver Selenium initialisé avec succès")
             return True
         except Exception as e:
             logger.error(f"❌ Erreur lors de l'initialisation du driver: {e}")
             return False
     
-    def get_page_with_selenium(self, url: str, wait_time: int = 15) -> Tuple[bool, BeautifulSoup]:
+    def get_page_source(self, url: str, wait_time: int = 15, driver=None) -> Tuple[bool, str]:
         """
-        Récupère une page avec Selenium pour contourner Cloudflare
+        Charge une page avec Selenium pour contourner Cloudflare
         
         Args:
             url (str): URL à scraper
             wait_time (int): Temps d'attente max en secondes
+            driver: Driver à utiliser (self.driver par défaut, ou driver emprunté au pool)
             
         Returns:
-            Tuple[bool, BeautifulSoup]: (succès, soup)
+            Tuple[bool, str]: (succès, HTML brut)
         """
+        driver = driver or self.driver
         try:
             logger.info(f"📄 Chargement de {url}...")
-            self.driver.get(url)
-            
-            # Attend que le contenu principal se charge
-            WebDriverWait(self.driver, wait_time).until(
-                EC.presence_of_all_elements_located((By.TAG_NAME, "tr"))
-            )
+            # Débit partagé avec les autres navigateurs du pool et les requêtes HTTP
+            shared_limiter().acquire(url)
+            start = time.perf_counter()
+            with timer('fetch'):
+                driver.get(url)
+            incr('requests')
             
-            time.sleep(3)  # Pause supplémentaire pour le rendu complet
+            with timer('wait'):
+                # Attend que le contenu principal se charge
+                WebDriverWait(driver, wait_time).until(
+                    EC.presence_of_all_elements_located((By.TAG_NAME, "tr"))
+                )
+                shared_limiter().feedback(url, 200, time.perf_counter() - start)
+                
+                # Rendu complet: document chargé et nombre de lignes stable
+                # (remplace l'ancienne pause fixe de 3s)
+                render_start = time.perf_counter()
+                if not wait_for_rows_stable(driver, "tr", timeout=wait_time):
+                    logger.warning("⚠️ Rendu toujours en cours, extraction de l'état actuel")
+                render_time = time.perf_counter() - render_start
             
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            logger.info("✅ Page chargée avec succès")
-            return True, soup
+            logger.info(f"✅ Page chargée avec succès (rendu: {render_time:.1f}s au lieu de 3s fixes)")
+            html = driver.page_source
+            incr('bytes_downloaded', len(html.encode('utf-8')))
+            return True, html
             
         except Exception as e:
+            shared_limiter().feedback(url, error=True)
             logger.error(f"❌ Erreur lors du chargement: {e}")
             return False, None
     
+    def get_page_with_selenium(self, url: str, wait_time: int = 15, driver=None) -> Tuple[bool, BeautifulSoup]:
+        """
+        Récupère une page avec Selenium pour contourner Cloudflare
+        
+        Args:
+            url (str): URL à scraper
+            wait_time (int): Temps d'attente max en secondes
+            driver: Driver à utiliser (self.driver par défaut)
+            
+        Returns:
+            Tuple[bool, BeautifulSoup]: (succès, soup)
+        """
+        success, html = self.get_page_source(url, wait_time, driver)
+        if not success:
+            return False, None
+        with timer('parse'):
+            return True, make_soup(html)
+    
     def extract_matches_from_page(self, soup: BeautifulSoup) -> List[Dict]:
         """
         Extrait les données des matchs depuis la page
         
+        Les lignes de `table.matches-table` sont lues avec les règles de
+        html_parsing.parse_match_rows, comme en streaming: les deux chemins
+        donnent les mêmes matchs.
+        
         Args:
             soup (BeautifulSoup): Contenu HTML parsé
             
         Returns:
             List[Dict]: Liste des matchs
         """
-        matches = []
-        
-        # Cherche les lignes de tableau contenant les matchs
-        # La structure de FootyStats varie, on teste plusieurs sélecteurs
-        table_rows = soup.find_all('tr')
-        logger.info(f"📊 {len(table_rows)} lignes trouvées")
-        
-        for row in table_rows:
-            try:
-                # Essaie d'extraire les infos du match
-                cells = row.find_all('td')
-                if len(cells) < 5:
-                    continue
-                
-                # Structure typique : [Date | Heure | Domicile | Score | Extérieur | Status | Résultat]
-                match_data = self._parse_match_row(row, cells)
-                
-                if match_data:
-                    matches.append(match_data)
-                    logger.debug(f"✓ Match extrait: {match_data['home_team']} vs {match_data['away_team']}")
-                    
-            except Exception as e:
-                logger.debug(f"Ligne ignorée: {e}")
-                continue
-        
+        matches = [self._build_match(match, row_text) for match, row_text in soup_match_rows(soup)]
         logger.info(f"✅ {len(matches)} matchs extraits")
         return matches
     
-    def _parse_match_row(self, row, cells: List) -> Dict:
+    def iter_matches_from_html(self, html: str) -> Iterator[Dict]:
         """
-        Parse une ligne de match
+        Génère les matchs de `table.matches-table` sans construire l'arbre de la page
+        
+        Seule la table des matchs est parsée, ligne par ligne: la mémoire reste
+        constante et le temps d'extraction dépend de la taille de la table.
+        Mêmes matchs que extract_matches_from_page.
         
         Args:
-            row: Élément TR de BeautifulSoup
-            cells: Liste des cellules TD
+            html (str): HTML brut de la page
             
-        Returns:
-            Dict: Données du match ou None
+        Yields:
+            Dict: Données d'un match
         """
-        try:
-            # Essaie plusieurs structures possibles
-            date_str = cells[0].get_text(strip=True) if len(cells) > 0 else None
-            time_str = cells[1].get_text(strip=True) if len(cells) > 1 else ""
-            home_team = cells[2].get_text(strip=True) if len(cells) > 2 else None
-            score_str = cells[3].get_text(strip=True) if len(cells) > 3 else None
-            away_team = cells[4].get_text(strip=True) if len(cells) > 4 else None
-            
-            # Valide les champs critiques
-            if not all([date_str, home_team, score_str, away_team]):
-                return None
-            
-            # Parse le score
-            home_goals, away_goals = self._parse_score(score_str)
-            
-            # Extrait les stats si disponibles
-            stats = self._extract_match_stats(row)
+        for match, row_text in iter_match_rows(html):
+            yield self._build_match(match, row_text)
+    
+    def _build_match(self, match: Dict, row_text: str) -> Dict:
+        """
+        Complète une ligne de html_parsing (date, équipes, score, lien) avec les buts et les stats
+        
+        Args:
+            match: Dict de html_parsing.parse_match_rows
+            row_text: Texte brut de la ligne (pour les stats)
             
-            return {
-                'date': date_str,
-                'time': time_str,
-                'home_team': home_team,
-                'away_team': away_team,
-                'score': score_str,
-                'home_goals': home_goals,
-                'away_goals': away_goals,
-                'xg_home': stats.get('xg_home', ''),
-                'xg_away': stats.get('xg_away', ''),
-                'shots_home': stats.get('shots_home', ''),
-                'shots_away': stats.get('shots_away', ''),
-                'possession_home': stats.get('possession_home', ''),
-                'possession_away': stats.get('possession_away', ''),
-            }
-        except Exception as e:
-            logger.debug(f"Erreur parsing: {e}")
-            return None
+        Returns:
+            Dict: Données du match
+        """
+        home_goals, away_goals = self._parse_score(match['score'])
+        stats = self._extract_stats_from_text(row_text)
+        return {
+            'date': match['date'],
+            'time': '',
+            'home_team': match['home_team'],
+            'away_team': match['away_team'],
+            'score': match['score'],
+            'home_goals': home_goals,
+            'away_goals': away_goals,
+            'xg_home': stats.get('xg_home', ''),
+            'xg_away': stats.get('xg_away', ''),
+            'shots_home': stats.get('shots_home', ''),
+            'shots_away': stats.get('shots_away', ''),
+            'possession_home': stats.get('possession_home', ''),
+            'possession_away': stats.get('possession_away', ''),
+            'match_url': match['match_url'],
+        }
     
     def _parse_score(self, score_str: str) -> Tuple[int, int]:
         """
@@ -216,6 +230,18 @@ class BotolaScraper:
         Args:
             row: Élément TR
             
+        Returns:
+            Dict: Statistiques du match
+        """
+        return self._extract_stats_from_text(row.get_text())
+    
+    def _extract_stats_from_text(self, row_text: str) -> Dict:
+        """
+        Extrait les stats depuis le texte brut d'une ligne
+        
+        Args:
+            row_text (str): Texte de la ligne
+            
         Returns:
             Dict: Statistiques du match
         """
@@ -223,12 +249,8 @@ class BotolaScraper:
         
         # Cherche les éléments contenant xG, tirs, possession
         # Cette partie dépend de la structure spécifique du site
-        row_text = row.get_text()
-        
         # Exemple : cherche des patterns de xG
-        import re
-        xg_pattern = r'(\d+\.?\d*)\s*xG'
-        matches = re.findall(xg_pattern, row_text)
+        matches = XG_PATTERN.findall(row_text)
         
         if len(matches) >= 2:
             stats['xg_home'] = matches[0]
@@ -236,17 +258,18 @@ class BotolaScraper:
         
         return stats
     
-    def scrape_season(self, season: str = None) -> pd.DataFrame:
+    def scrape_season(self, season: str = None, driver=None) -> pd.DataFrame:
         """
         Scrape tous les matchs d'une saison
         
         Args:
             season (str): Saison à scraper (ex: "2023/2024")
+            driver: Driver emprunté à un DriverPool (self.driver par défaut)
             
         Returns:
             pd.DataFrame: DataFrame avec tous les matchs
         """
-        if not self.driver:
+        if driver is None and not self.driver:
             if not self.init_driver():
                 logger.error("❌ Impossible d'initialiser le driver")
                 return None
@@ -255,32 +278,48 @@ class BotolaScraper:
         if season:
             url += f"?season={season}"
         
-        success, soup = self.get_page_with_selenium(url)
+        if self.streaming:
+            success, html = self.get_page_source(url, driver=driver)
+        else:
+            success, soup = self.get_page_with_selenium(url, driver=driver)
         if not success:
             logger.error("❌ Échec du chargement de la page")
             return None
         
-        matches = self.extract_matches_from_page(soup)
+        # En streaming, parsing et extraction sont entrelacés: tout compte dans 'extract'
+        with timer('extract'):
+            if self.streaming:
+                rows = self.iter_matches_from_html(html)
+            else:
+                rows = self.extract_matches_from_page(soup)
+            if self.incremental is not None:
+                rows = self.incremental.filter(rows, season)
+            df = pd.DataFrame.from_records(rows)
+        incr('rows', len(df))
         
-        if not matches:
+        if df.empty:
             logger.warning("⚠️ Aucun match trouvé")
             return pd.DataFrame()
         
-        df = pd.DataFrame(matches)
         logger.info(f"📊 DataFrame créé avec {len(df)} matchs")
         
         return df
     
-    def scrape_multiple_seasons(self, seasons: List[str]) -> pd.DataFrame:
+    def scrape_multiple_seasons(self, seasons: List[str], pool: DriverPool = None) -> pd.DataFrame:
         """
         Scrape plusieurs saisons et les combine
         
         Args:
             seasons (List[str]): Liste des saisons à scraper
+            pool (DriverPool): Si fourni, les saisons sont réparties en parallèle
+                sur les navigateurs libres du pool
             
         Returns:
             pd.DataFrame: DataFrame combiné
         """
+        if pool is not None:
+            return self._scrape_seasons_with_pool(seasons, pool)
+        
         all_matches = []
         
         for season in seasons:
@@ -290,7 +329,26 @@ class BotolaScraper:
             if df is not None and not df.empty:
                 df['season'] = season
                 all_matches.append(df)
-                time.sleep(2)  # Délai entre les requêtes
+        
+        if not all_matches:
+            logger.warning("⚠️ Aucune donnée récupérée")
+            return pd.DataFrame()
+        
+        combined_df = pd.concat(all_matches, ignore_index=True)
+        logger.info(f"✅ Total: {len(combined_df)} matchs sur {len(seasons)} saisons")
+        
+        return combined_df
+    
+    def _scrape_seasons_with_pool(self, seasons: List[str], pool: DriverPool) -> pd.DataFrame:
+        """Répartit les saisons sur les drivers libres du pool"""
+        logger.info(f"\n🏆 Scraping de {len(seasons)} saisons sur {pool.size} navigateur(s)...")
+        dfs = pool.map(lambda driver, season: self.scrape_season(season, driver), seasons)
+        
+        all_matches = []
+        for season, df in zip(seasons, dfs):
+            if df is not None and not df.empty:
+                df['season'] = season
+                all_matches.append(df)
         
         if not all_matches:
             logger.warning("⚠️ Aucune donnée récupérée")
@@ -314,7 +372,8 @@ class BotolaScraper:
             filename = f"botola_matches_{timestamp}.csv"
         
         try:
-            df.to_csv(filename, index=False, encoding='utf-8')
+            with timer('save'):
+                df.to_csv(filename, index=False, encoding='utf-8')
             logger.info(f"✅ Fichier sauvegardé: {filename}")
             logger.info(f"📈 Taille: {len(df)} lignes, {len(df.columns)} colonnes")
             return filename
@@ -338,8 +397,17 @@ class BotolaScraper:
         self.close()
 
 
-def main():
-    """Fonction principale de scraping"""
+@reported('selenium')
+def main(incremental: bool = False, streaming: bool = False):
+    """
+    Fonction principale de scraping
+    
+    Args:
+        incremental (bool): Si True, n'ajoute que les matchs nouveaux ou modifiés
+            à botola_matches.csv au lieu de tout re-scraper et l'écraser
+        streaming (bool): Si True, seule la table des matchs est parsée, ligne par ligne
+    """
+    output_file = "botola_matches.csv"
     
     logger.info("=" * 60)
     logger.info("🏆 BOTOLA PRO SCRAPER - FootyStats.org")
@@ -348,12 +416,23 @@ def main():
     # Saisons à scraper (3 dernières années)
     seasons = ["2023/2024", "2022/2023", "2021/2022"]
     
+    incremental_filter = IncrementalFilter.from_csv(output_file) if incremental else None
+    
     # Utilise le scraper en context manager (ferme automatiquement le driver)
-    with BotolaScraper(headless=False) as scraper:
+    with BotolaScraper(headless=False, streaming=streaming, incremental=incremental_filter) as scraper:
         try:
             # Scrape les saisons
             df_botola = scraper.scrape_multiple_seasons(seasons)
             
+            if incremental:
+                # Mode incrémental: fusion des seuls matchs nouveaux/modifiés
+                with timer('save'):
+                    append_matches(output_file, df_botola if df_botola is not None else pd.DataFrame())
+                    if parquet_enabled():
+                        export_csv(output_file)
+                    sync_csv(output_file)
+                return output_file
+            
             if df_botola is not None and not df_botola.empty:
                 # Affiche un aperçu
                 logger.info("\n📊 APERÇU DES DONNÉES:")
@@ -361,7 +440,12 @@ def main():
                 logger.info(f"\nColonnes: {list(df_botola.columns)}")
                 
                 # Sauvegarde en CSV
-                csv_file = scraper.save_to_csv(df_botola, "botola_matches.csv")
+                csv_file = scraper.save_to_csv(df_botola, output_file)
+                with timer('save'):
+                    if csv_file and parquet_enabled():
+                        export_csv(csv_file)
+                    if csv_file:
+                        sync_csv(csv_file)
                 
                 # Statistiques
                 logger.info("\n📈 STATISTIQUES:")
@@ -385,7 +469,7 @@ def main():
 
 
 if __name__ == "__main__":
-    csv_output = main()
+    csv_output = main(incremental='--incremental' in sys.argv, streaming='--streaming' in sys.argv)
     if csv_output:
         logger.info(f"\n✅ Succès! Fichier créé: {csv_output}")
     else:
@@ -0,0 +1,313 @@
+"""
+BOTOLA PRO SCRAPER - Variante asynchrone (httpx, HTTP/2)
+========================================================
+Même contrat que botola_scraper_http.BotolaScraper.scrape_multiple_seasons,
+sur une boucle asyncio:
+- un seul client httpx, HTTP/2 (multiplexage des requêtes sur une connexion)
+  si le paquet h2 est installé, sinon HTTP/1.1 avec pool de connexions
+- téléchargements concurrents (pages de saison, pages de match) bornés par
+  un sémaphore, rythme imposé par le limiteur adaptatif partagé
+- cache disque HttpCache (GET conditionnels ETag / Last-Modified)
+- parsing déporté dans un pool de threads (ou de processus): la boucle ne
+  bloque jamais sur BeautifulSoup / lxml
+
+Installation: pip install "httpx[http2]"
+"""
+
+import sys
+import time
+import random
+import asyncio
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+import settings
+from botola_scraper_http import USER_AGENTS
+from html_parsing import parse_match_rows
+from http_cache import HttpCache, DEFAULT_TTL, season_ttl
+from incremental import IncrementalFilter, append_matches
+from storage import export_csv, parquet_enabled
+from match_store import sync_csv
+from match_details import add_match_details_async, details_enabled
+from metrics import timer, incr, reported
+from rate_limiter import AdaptiveRateLimiter, shared_limiter, THROTTLE_STATUSES
+
+logger = logging.getLogger(__name__)
+
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
+try:
+    import h2  # noqa: F401 (requis par httpx pour HTTP/2)
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+DEFAULT_CONCURRENCY = 8
+OUTPUT_FILE = "botola_matches_all_seasons.csv"
+
+BROWSER_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9,fr;q=0.8',
+    'Referer': 'https://www.google.com/',
+    'DNT': '1',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+
+async def _in_thread(func, *args):
+    """Appel bloquant (disque, limiteur de débit) dans le pool par défaut de la boucle"""
+    return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+def extract_season_rows(html: str, season_name: str) -> List[Dict]:
+    """Parse une page de saison (exécuté dans le pool: fonction de module, sérialisable)"""
+    return [{'season': season_name, **match} for match in parse_match_rows(html)]
+
+
+class AsyncBotolaScraper:
+    """Scraper HTTP asynchrone pour FootyStats.org - Botola Pro"""
+
+    def __init__(self, max_concurrency: int = DEFAULT_CONCURRENCY, cache_dir: str = 'cache',
+                 incremental: IncrementalFilter = None, rate_limiter: AdaptiveRateLimiter = None,
+                 http2: bool = True, parse_workers: int = None, processes: bool = False,
+                 timeout: float = 20.0, details: bool = False):
+        """
+        Args:
+            max_concurrency (int): Requêtes simultanées maximum (sémaphore)
+            cache_dir (str): Répertoire du cache HTTP (None pour le désactiver)
+            incremental (IncrementalFilter): Si fourni, seuls les matchs nouveaux ou modifiés sont gardés
+            rate_limiter (AdaptiveRateLimiter): Limiteur par hôte (partagé par défaut)
+            http2 (bool): HTTP/2 si le paquet h2 est installé
+            parse_workers (int): Taille du pool de parsing
+            processes (bool): Pool de processus au lieu de threads pour le parsing
+            timeout (float): Timeout d'une requête (secondes)
+            details (bool): Complète xG, tirs et possession depuis les pages de match
+        """
+        if not HAS_HTTPX:
+            raise ImportError("httpx est requis pour le scraper asynchrone: pip install \"httpx[http2]\"")
+        self.max_concurrency = max_concurrency
+        self.cache = HttpCache(cache_dir) if cache_dir else None
+        self.incremental = incremental
+        self.rate_limiter = rate_limiter or shared_limiter()
+        self.http2 = http2 and HAS_HTTP2
+        if http2 and not HAS_HTTP2:
+            logger.warning("⚠️ Paquet h2 absent: HTTP/1.1 (pip install \"httpx[http2]\")")
+        self.parse_workers = parse_workers
+        self.processes = processes
+        self.timeout = timeout
+        self.details = details
+        self._client: Optional['httpx.AsyncClient'] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._executor: Optional[Executor] = None
+
+    def _make_client(self) -> 'httpx.AsyncClient':
+        limits = httpx.Limits(max_connections=self.max_concurrency,
+                              max_keepalive_connections=self.max_concurrency)
+        return httpx.AsyncClient(http2=self.http2, limits=limits, timeout=self.timeout,
+                                 follow_redirects=True,
+                                 headers=dict(BROWSER_HEADERS, **{'User-Agent': random.choice(USER_AGENTS)}))
+
+    async def __aenter__(self):
+        self._client = self._make_client()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        pool = ProcessPoolExecutor if self.processes else ThreadPoolExecutor
+        self._executor = pool(max_workers=self.parse_workers)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._client.aclose()
+        self._executor.shutdown(wait=True)
+        if self.cache:
+            self.cache.flush()
+
+    async def warmup_session(self, url: str):
+        """Requête initiale pour obtenir les cookies du site"""
+        try:
+            await _in_thread(self.rate_limiter.acquire, url)
+            response = await self._client.get(url)
+            self.rate_limiter.feedback(url, response.status_code, response.elapsed.total_seconds(),
+                                       response.headers.get('Retry-After'))
+            logger.info(f"Session préchauffée ({response.http_version})")
+        except httpx.HTTPError as e:
+            self.rate_limiter.feedback(url, error=True)
+            logger.warning(f"Préchauffage échoué: {e}. On continue.")
+
+    async def fetch_html(self, url: str, ttl: float = DEFAULT_TTL, headers: Dict[str, str] = None,
+                         max_retries: int = 3) -> Optional[str]:
+        """
+        Télécharge le corps d'une URL (cache disque, sémaphore, limiteur, reprises)
+
+        Returns:
+            Optional[str]: Corps de la réponse, None en cas d'échec
+        """
+        entry = self.cache.lookup(url) if self.cache else None
+        if entry and self.cache.is_fresh(entry):
+            html = await _in_thread(self.cache.read, url)
+            if html is not None:
+                incr('cache_hits')
+                return html
+            entry = None
+
+        for attempt in range(max_retries):
+            request_headers = dict(headers or {})
+            if self.cache:
+                request_headers.update(self.cache.conditional_headers(entry))
+            # Le limiteur est bloquant (time.sleep): attente hors de la boucle
+            await _in_thread(self.rate_limiter.acquire, url)
+            async with self._semaphore:
+                start = time.perf_counter()
+                try:
+                    with timer('fetch'):
+                        response = await self._client.get(url, headers=request_headers)
+                except httpx.HTTPError as e:
+                    logger.warning(f"Erreur tentative {attempt+1}/{max_retries} ({url}): {e}")
+                    incr('http_errors')
+                    if attempt < max_retries - 1:
+                        incr('retries')
+                    self.rate_limiter.feedback(url, error=True)
+                    continue
+            elapsed = time.perf_counter() - start
+            incr('requests')
+            incr('bytes_downloaded', len(response.content))
+            self.rate_limiter.feedback(url, response.status_code, elapsed, response.headers.get('Retry-After'))
+
+            if response.status_code == 304 and entry:
+                html = await _in_thread(self.cache.read, url)
+                if html is not None:
+                    self.cache.touch(url, ttl)
+                    return html
+                entry = None
+                continue
+            if response.status_code >= 400:
+                logger.warning(f"Tentative {attempt+1}/{max_retries}: HTTP {response.status_code} ({url})")
+                incr('http_errors')
+                if attempt < max_retries - 1:
+                    incr('retries')
+                if response.status_code in THROTTLE_STATUSES or response.status_code >= 500:
+                    continue
+                return None
+
+            html = response.text
+            if self.cache:
+                await _in_thread(self.cache.store, url, html, response.headers.get('ETag'),
+                                 response.headers.get('Last-Modified'), ttl)
+            return html
+        logger.error(f"Impossible de charger {url} après {max_retries} tentatives")
+        return None
+
+    async def fetch_all(self, urls: List[str], ttl: float = DEFAULT_TTL,
+                        headers: Dict[str, str] = None) -> Dict[str, Optional[str]]:
+        """Télécharge plusieurs URLs simultanément (pages de saison, pages de match)"""
+        bodies = await asyncio.gather(*(self.fetch_html(url, ttl, headers) for url in urls))
+        return dict(zip(urls, bodies))
+
+    async def parse(self, func, *args):
+        """Exécute un parsing dans le pool (la boucle reste libre)"""
+        with timer('parse'):
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def scrape_season(self, season_name: str, url: str) -> pd.DataFrame:
+        """Scrape une saison entière à partir d'une URL directe"""
+        html = await self.fetch_html(url, ttl=season_ttl(season_name))
+        if html is None:
+            logger.error(f"Échec: impossible de charger les données pour {season_name}")
+            return pd.DataFrame()
+        matches = await self.parse(extract_season_rows, html, season_name)
+        if self.incremental is not None:
+            matches = list(self.incremental.filter(matches, season_name))
+            logger.info(f"Saison {season_name}: {len(matches)} matchs nouveaux ou modifiés")
+        else:
+            logger.info(f"Saison {season_name}: {len(matches)} matchs")
+        incr('rows', len(matches))
+        return pd.DataFrame(matches) if matches else pd.DataFrame()
+
+    async def scrape_seasons(self, seasons: Dict[str, str], concurrent: bool = True) -> pd.DataFrame:
+        """Version coroutine de scrape_multiple_seasons (client déjà ouvert)"""
+        if not all(self._is_cached(url) for url in seasons.values()):
+            await self.warmup_session(settings.site_root())
+        if concurrent:
+            dfs = await asyncio.gather(*(self.scrape_season(name, url) for name, url in seasons.items()))
+        else:
+            dfs = [await self.scrape_season(name, url) for name, url in seasons.items()]
+
+        all_matches_df = [df for df in dfs if not df.empty]
+        if not all_matches_df:
+            logger.warning("Aucune donnée n'a été récupérée.")
+            return pd.DataFrame()
+        df = pd.concat(all_matches_df, ignore_index=True)
+        if self.details:
+            df = await add_match_details_async(df, self)
+        return df
+
+    def _is_cached(self, url: str) -> bool:
+        entry = self.cache.lookup(url) if self.cache else None
+        return bool(entry) and self.cache.is_fresh(entry)
+
+    async def _run(self, seasons: Dict[str, str], concurrent: bool) -> pd.DataFrame:
+        async with self:
+            return await self.scrape_seasons(seasons, concurrent)
+
+    def scrape_multiple_seasons(self, seasons: Dict[str, str], concurrent: bool = True) -> pd.DataFrame:
+        """
+        Scrape plusieurs saisons à partir d'un dictionnaire d'URLs (même contrat que le scraper HTTP)
+
+        Args:
+            seasons (Dict[str, str]): {nom_saison: url}
+            concurrent (bool): Si True, les saisons sont téléchargées simultanément
+        """
+        logger.info(f"Mode asynchrone: {len(seasons)} saisons, {self.max_concurrency} requêtes simultanées, "
+                    f"{'HTTP/2' if self.http2 else 'HTTP/1.1'}")
+        return asyncio.run(self._run(seasons, concurrent))
+
+    def save_to_csv(self, df: pd.DataFrame, filename: str):
+        """Sauvegarde en CSV"""
+        try:
+            with timer('save'):
+                df.to_csv(filename, index=False, encoding='utf-8')
+            logger.info(f"Fichier sauvegardé: {filename}")
+        except Exception as e:
+            logger.error(f"Erreur de sauvegarde: {e}")
+
+
+@reported('async')
+def main(incremental: bool = False):
+    """
+    Fonction principale
+
+    Args:
+        incremental (bool): N'ajoute que les matchs nouveaux/modifiés au CSV existant
+    """
+    logger.info("=" * 60)
+    logger.info("BOTOLA PRO SCRAPER - Async HTTP (httpx)")
+    logger.info("=" * 60)
+
+    incremental_filter = IncrementalFilter.from_csv(OUTPUT_FILE) if incremental else None
+    scraper = AsyncBotolaScraper(incremental=incremental_filter, details=details_enabled())
+    try:
+        df_botola = scraper.scrape_multiple_seasons(settings.season_urls())
+        if incremental:
+            with timer('save'):
+                append_matches(OUTPUT_FILE, df_botola)
+        elif not df_botola.empty:
+            logger.info(f"\nScraping terminé. Total de {len(df_botola)} matchs récupérés.")
+            scraper.save_to_csv(df_botola, OUTPUT_FILE)
+        else:
+            logger.error("Aucune donnée n'a été récupérée après le scraping.")
+            return
+        with timer('save'):
+            if parquet_enabled():
+                export_csv(OUTPUT_FILE)
+            sync_csv(OUTPUT_FILE)
+    except Exception as e:
+        logger.error(f"Erreur critique dans main: {e}", exc_info=True)
+
+
+if __name__ == "__main__":
+    main(incremental='--incremental' in sys.argv)
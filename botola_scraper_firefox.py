@@ -11,6 +11,10 @@ import pandas as pd
 import logging
 from datetime import datetime, timedelta
 from bs4 import BeautifulSoup
+from html_parsing import make_soup
+from selenium_waits import wait_for_rows_stable
+import settings
+from rate_limiter import shared_limiter
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -44,7 +48,7 @@ class BotolaScraper:
         Args:
             headless (bool): Si True, lance le navigateur en mode headless (invisible)
         """
-        self.base_url = "https://footystats.org/morocco/botola-pro"
+        self.base_url = settings.base_url()
         self.matches_url = f"{self.base_url}/matches"
         self.headless = headless
         self.driver = None
@@ -90,20 +94,25 @@ class BotolaScraper:
         """
         try:
             logger.info(f"📄 Chargement de {url}...")
+            shared_limiter().acquire(url)
+            start = time.perf_counter()
             self.driver.get(url)
             
             # Attend que le contenu principal se charge
             WebDriverWait(self.driver, wait_time).until(
                 EC.presence_of_all_elements_located((By.TAG_NAME, "tr"))
             )
+            shared_limiter().feedback(url, 200, time.perf_counter() - start)
             
-            time.sleep(2)  # Pause supplémentaire pour le rendu complet
+            # Rendu complet: document chargé et nombre de lignes stable
+            wait_for_rows_stable(self.driver, "tr", timeout=wait_time)
             
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            soup = make_soup(self.driver.page_source)
             logger.info("✅ Page chargée avec succès")
             return True, soup
             
         except Exception as e:
+            shared_limiter().feedback(url, error=True)
             logger.error(f"❌ Erreur lors du chargement: {e}")
             return False, None
     
@@ -290,7 +299,6 @@ class BotolaScraper:
             if df is not None and not df.empty:
                 df['season'] = season
                 all_matches.append(df)
-                time.sleep(2)  # Délai entre les requêtes
         
         if not all_matches:
             logger.warning("⚠️ Aucune donnée récupérée")
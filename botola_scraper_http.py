@@ -6,15 +6,27 @@ Utilise requests + BeautifulSoup avec stratégies anti-protection
 """
 
 import os
+import sys
 import time
 import pandas as pd
 import logging
 from datetime import datetime
 from bs4 import BeautifulSoup
+from html_parsing import make_soup
 import requests
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Iterator
 import json
 import random
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from http_cache import HttpCache, DEFAULT_TTL, season_ttl
+from incremental import IncrementalFilter, append_matches
+from storage import export_csv, parquet_enabled
+from match_store import sync_csv
+from match_details import add_match_details, details_enabled
+import settings
+from metrics import timer, incr, reported
+from rate_limiter import AdaptiveRateLimiter, shared_limiter, THROTTLE_STATUSES
 
 # Configuration logging
 logging.basicConfig(
@@ -37,9 +49,27 @@ USER_AGENTS = [
 class BotolaScraper:
     """Scraper pour FootyStats.org - Botola Pro (HTTP Pure)"""
     
-    def __init__(self, headless=False):
-        """Initialise le scraper"""
+    def __init__(self, headless=False, max_workers: int = 4, rate_limiter: AdaptiveRateLimiter = None,
+                 cache_dir: str = 'cache', incremental: IncrementalFilter = None):
+        """
+        Initialise le scraper
+
+        Args:
+            max_workers (int): Taille du pool de threads en mode concurrent
+            rate_limiter (AdaptiveRateLimiter): Limiteur de débit par hôte (par défaut celui
+                partagé par tous les scrapers du processus, voir [RATE_LIMIT])
+            cache_dir (str): Répertoire du cache HTTP (None pour le désactiver)
+            incremental (IncrementalFilter): Si fourni, seuls les matchs nouveaux ou modifiés sont extraits
+        """
+        self.max_workers = max_workers
+        self.incremental = incremental
+        self.cache = HttpCache(cache_dir) if cache_dir else None
+        self.rate_limiter = rate_limiter or shared_limiter()
         self.session = requests.Session()
+        # Pool de connexions partagé, dimensionné pour le nombre de workers
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         # --- UPDATE: More comprehensive headers to mimic a real browser ---
         self.session.headers.update({
             'User-Agent': random.choice(USER_AGENTS),
@@ -60,37 +90,140 @@ class BotolaScraper:
         """Makes an initial request to the base URL to acquire cookies."""
         try:
             logger.info(f"Warming up session by visiting {url}...")
-            self.session.get(url, timeout=15)
+            self.rate_limiter.acquire(url)
+            start = time.perf_counter()
+            response = self.session.get(url, timeout=15)
+            self.rate_limiter.feedback(url, response.status_code, time.perf_counter() - start,
+                                       response.headers.get('Retry-After'))
             logger.info("Session is warm, cookies should be set.")
-            time.sleep(2) # Brief pause after warmup
         except requests.exceptions.RequestException as e:
+            self.rate_limiter.feedback(url, error=True)
             logger.warning(f"Warm-up request failed: {e}. Continuing anyway.")
 
-    def get_page(self, url: str, max_retries: int = 3) -> Tuple[bool, BeautifulSoup]:
-        """Récupère une page avec retry logic"""
+    def fetch_html(self, url: str, max_retries: int = 3, ttl: float = DEFAULT_TTL,
+                   headers: Dict[str, str] = None) -> Optional[str]:
+        """
+        Télécharge le corps d'une URL avec retry logic et cache disque
+
+        Args:
+            url (str): URL à charger
+            max_retries (int): Nombre de tentatives
+            ttl (float): Durée de validité en cache (None: jamais expirée)
+            headers (Dict[str, str]): En-têtes supplémentaires (ex: XHR)
+
+        Returns:
+            Optional[str]: Corps de la réponse, None en cas d'échec
+        """
+        entry = self.cache.lookup(url) if self.cache else None
+        if entry and self.cache.is_fresh(entry):
+            html = self.cache.read(url)
+            if html is not None:
+                logger.info(f"Cache: {url}")
+                incr('cache_hits')
+                return html
+            entry = None
+
         for attempt in range(max_retries):
             try:
                 logger.info(f"Tentative {attempt+1}/{max_retries} - Chargement {url}...")
-                self.session.headers['User-Agent'] = random.choice(USER_AGENTS)
-                response = self.session.get(url, timeout=20)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.text, 'html.parser')
-                logger.info("Succès: Page chargée")
-                return True, soup
+                # Attend le débit autorisé et la fin d'une éventuelle pause (429, Retry-After)
+                self.rate_limiter.acquire(url)
+                # User-Agent par requête: les en-têtes de la session sont partagés entre threads
+                request_headers = {'User-Agent': random.choice(USER_AGENTS)}
+                request_headers.update(headers or {})
+                if self.cache:
+                    request_headers.update(self.cache.conditional_headers(entry))
+                start = time.perf_counter()
+                with timer('fetch'):
+                    response = self.session.get(url, timeout=20, headers=request_headers)
+                elapsed = time.perf_counter() - start
+                incr('requests')
+                incr('bytes_downloaded', len(response.content))
+                self.rate_limiter.feedback(url, response.status_code, elapsed, response.headers.get('Retry-After'))
+                if response.status_code in THROTTLE_STATUSES:
+                    logger.warning(f"Tentative {attempt+1}: HTTP {response.status_code}, ralentissement")
+                    incr('http_errors')
+                    if attempt < max_retries - 1:
+                        incr('retries')
+                    continue
+
+                html = None
+                if response.status_code == 304 and entry:
+                    html = self.cache.read(url)
+                    if html is not None:
+                        self.cache.touch(url, ttl)
+                        logger.info("Succès: Page inchangée (304), servie depuis le cache")
+                    else:
+                        # Objet évincé entre-temps: on refait un GET complet
+                        entry = None
+                        continue
+                if html is None:
+                    response.raise_for_status()
+                    html = response.text
+                    if self.cache:
+                        self.cache.store(url, html, response.headers.get('ETag'),
+                                         response.headers.get('Last-Modified'), ttl)
+                    logger.info("Succès: Page chargée")
+                return html
             except requests.exceptions.RequestException as e:
                 logger.warning(f"Erreur tentative {attempt+1}: {e}")
-                time.sleep(5 + random.uniform(0, 2)) # Increased delay
+                incr('http_errors')
+                if attempt < max_retries - 1:
+                    incr('retries')
+                if getattr(e, 'response', None) is None:
+                    # Pas de réponse (timeout, connexion): pause exponentielle avant la tentative suivante
+                    self.rate_limiter.feedback(url, error=True)
                 continue
         logger.error("Impossible de charger la page après plusieurs tentatives")
-        return False, None
+        return None
+
+    def get_page(self, url: str, max_retries: int = 3, ttl: float = DEFAULT_TTL) -> Tuple[bool, BeautifulSoup]:
+        """Récupère et parse une page (voir fetch_html)"""
+        html = self.fetch_html(url, max_retries, ttl)
+        if html is None:
+            return False, None
+        with timer('parse'):
+            return True, make_soup(html)
+
+    def fetch_html_pages(self, urls: List[str], ttl: float = DEFAULT_TTL,
+                         headers: Dict[str, str] = None) -> Dict[str, Optional[str]]:
+        """
+        Télécharge plusieurs URLs en parallèle (corps bruts)
+
+        Le pool est borné par max_workers et chaque requête passe par le
+        limiteur de débit adaptatif par hôte: les workers se partagent le
+        débit que le site tolère (ralenti sur 429 / 503).
+
+        Returns:
+            Dict[str, Optional[str]]: corps par URL (None si échec)
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = executor.map(lambda url: self.fetch_html(url, ttl=ttl, headers=headers), urls)
+            return dict(zip(urls, results))
+
+    def fetch_pages(self, urls: List[str], ttl: float = DEFAULT_TTL) -> Dict[str, BeautifulSoup]:
+        """
+        Télécharge et parse plusieurs pages (saisons ou pages de match) en parallèle
+
+        Returns:
+            Dict[str, BeautifulSoup]: soup par URL (None si échec)
+        """
+        pages = self.fetch_html_pages(urls, ttl)
+        with timer('parse'):
+            return {url: make_soup(html) if html is not None else None for url, html in pages.items()}
     
     def extract_matches_from_page(self, soup: BeautifulSoup, season_name: str) -> List[Dict]:
         """Extrait les données des matchs depuis la page"""
-        matches = []
+        matches = list(self._iter_matches(soup, season_name))
+        logger.info(f"Matchs extraits: {len(matches)}")
+        return matches
+
+    def _iter_matches(self, soup: BeautifulSoup, season_name: str) -> Iterator[Dict]:
+        """Génère les matchs ligne par ligne (permet l'arrêt anticipé en mode incrémental)"""
         match_table = soup.select_one("table.matches-table")
         if not match_table:
             logger.warning("Table des matchs non trouvée sur la page.")
-            return []
+            return
             
         table_rows = match_table.select("tbody tr")
         logger.info(f"Lignes trouvées: {len(table_rows)}")
@@ -99,82 +232,134 @@ class BotolaScraper:
             cells = row.find_all('td')
             if len(cells) < 5: continue
             match_data = self._parse_match_row(cells, season_name)
-            if match_data: matches.append(match_data)
-        
-        logger.info(f"Matchs extraits: {len(matches)}")
-        return matches
+            if match_data: yield match_data
     
     def _parse_match_row(self, cells: List, season_name: str) -> Dict:
         """Parse une ligne de match"""
         try:
             home_team = cells[1].select_one("a.team-name").get_text(strip=True)
             away_team = cells[3].select_one("a.team-name").get_text(strip=True)
-            score = cells[2].select_one("a.match-link").get_text(strip=True)
+            score_link = cells[2].select_one("a.match-link")
+            score = score_link.get_text(strip=True)
             date = cells[0].get_text(strip=True)
-            return {'season': season_name, 'date': date, 'home_team': home_team, 'away_team': away_team, 'score': score}
+            return {'season': season_name, 'date': date, 'home_team': home_team, 'away_team': away_team, 'score': score,
+                    'match_url': score_link.get('href')}
         except Exception: return None
 
     def scrape_season(self, season_name: str, url: str) -> pd.DataFrame:
         """Scrape une saison entière à partir d'une URL directe"""
         logger.info(f"\n=== Saison {season_name} ===")
-        success, soup = self.get_page(url)
+        success, soup = self.get_page(url, ttl=season_ttl(season_name))
         if not success:
             logger.error(f"Échec: impossible de charger les données pour {season_name}")
             return pd.DataFrame()
-        matches = self.extract_matches_from_page(soup, season_name)
-        return pd.DataFrame(matches) if matches else pd.DataFrame()
+        with timer('extract'):
+            if self.incremental is not None:
+                matches = list(self.incremental.filter(self._iter_matches(soup, season_name), season_name))
+                logger.info(f"Matchs nouveaux ou modifiés: {len(matches)}")
+            else:
+                matches = self.extract_matches_from_page(soup, season_name)
+            incr('rows', len(matches))
+            return pd.DataFrame(matches) if matches else pd.DataFrame()
     
-    def scrape_multiple_seasons(self, seasons: Dict[str, str]) -> pd.DataFrame:
-        """Scrape plusieurs saisons à partir d'un dictionnaire d'URLs"""
+    def scrape_multiple_seasons(self, seasons: Dict[str, str], concurrent: bool = False) -> pd.DataFrame:
+        """
+        Scrape plusieurs saisons à partir d'un dictionnaire d'URLs
+
+        Args:
+            seasons (Dict[str, str]): {nom_saison: url}
+            concurrent (bool): Si True, les saisons sont récupérées via le pool de threads
+        """
         # --- UPDATE: Perform a warm-up request before scraping ---
-        self.warmup_session("https://footystats.org/")
-        
+        # (inutile si toutes les saisons sont servies par le cache)
+        if not all(self._is_cached(url) for url in seasons.values()):
+            self.warmup_session(settings.site_root())
+
+        try:
+            if concurrent:
+                return self._scrape_seasons_concurrently(seasons)
+            return self._scrape_seasons_sequentially(seasons)
+        finally:
+            if self.cache:
+                self.cache.flush()
+
+    def _is_cached(self, url: str) -> bool:
+        """True si l'URL peut être servie par le cache sans requête réseau"""
+        entry = self.cache.lookup(url) if self.cache else None
+        return bool(entry) and self.cache.is_fresh(entry)
+
+    def _scrape_seasons_sequentially(self, seasons: Dict[str, str]) -> pd.DataFrame:
+        """Scrape les saisons l'une après l'autre (rythme imposé par le limiteur de débit)"""
         all_matches_df = []
         for i, (season_name, season_url) in enumerate(seasons.items()):
             logger.info(f"\n[{i+1}/{len(seasons)}] Scraping saison {season_name}...")
             df = self.scrape_season(season_name, season_url)
             if not df.empty: all_matches_df.append(df)
-            if i < len(seasons) - 1:
-                delay = 3 + random.uniform(0, 3)
-                logger.info(f"Attente {delay:.1f}s avant la saison suivante...")
-                time.sleep(delay)
         
         if not all_matches_df:
             logger.warning("Aucune donnée n'a été récupérée.")
             return pd.DataFrame()
         
         return pd.concat(all_matches_df, ignore_index=True)
+
+    def _scrape_seasons_concurrently(self, seasons: Dict[str, str]) -> pd.DataFrame:
+        """Scrape les saisons en parallèle; l'ordre du dictionnaire est conservé"""
+        logger.info(f"Mode concurrent: {len(seasons)} saisons, {self.max_workers} workers")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            dfs = list(executor.map(self.scrape_season, seasons.keys(), seasons.values()))
+
+        all_matches_df = [df for df in dfs if not df.empty]
+        if not all_matches_df:
+            logger.warning("Aucune donnée n'a été récupérée.")
+            return pd.DataFrame()
+
+        return pd.concat(all_matches_df, ignore_index=True)
     
     def save_to_csv(self, df: pd.DataFrame, filename: str):
         """Sauvegarde en CSV"""
         try:
-            df.to_csv(filename, index=False, encoding='utf-8')
+            with timer('save'):
+                df.to_csv(filename, index=False, encoding='utf-8')
             logger.info(f"Fichier sauvegardé: {filename}")
         except Exception as e: logger.error(f"Erreur de sauvegarde: {e}")
 
-def main():
-    """Fonction principale"""
+@reported('http')
+def main(incremental: bool = False):
+    """
+    Fonction principale
+
+    Args:
+        incremental (bool): N'ajoute que les matchs nouveaux/modifiés au CSV existant
+    """
     logger.info("=" * 60)
     logger.info("BOTOLA PRO SCRAPER - HTTP Method (Pure Python)")
     logger.info("=" * 60)
     
-    seasons_urls = {
-        "2023/2024": "https://footystats.org/morocco/botola-pro/matches?season_id=9102",
-        "2022/2023": "https://footystats.org/morocco/botola-pro/matches?season_id=8223",
-        "2021/2022": "https://footystats.org/morocco/botola-pro/matches?season_id=7235"
-    }
+    seasons_urls = settings.season_urls()
     
-    scraper = BotolaScraper()
+    output_file = "botola_matches_all_seasons.csv"
+    incremental_filter = IncrementalFilter.from_csv(output_file) if incremental else None
+    scraper = BotolaScraper(incremental=incremental_filter)
     
     try:
-        df_botola = scraper.scrape_multiple_seasons(seasons_urls)
-        if not df_botola.empty:
+        df_botola = scraper.scrape_multiple_seasons(seasons_urls, concurrent=True)
+        if details_enabled() and not df_botola.empty:
+            df_botola = add_match_details(df_botola, scraper)
+        if incremental:
+            with timer('save'):
+                append_matches(output_file, df_botola)
+        elif not df_botola.empty:
             logger.info(f"\nScraping terminé. Total de {len(df_botola)} matchs récupérés.")
-            scraper.save_to_csv(df_botola, "botola_matches_all_seasons.csv")
+            scraper.save_to_csv(df_botola, output_file)
         else:
             logger.error("Aucune donnée n'a été récupérée après le scraping.")
+            return
+        with timer('save'):
+            if parquet_enabled():
+                export_csv(output_file)
+            sync_csv(output_file)
     except Exception as e:
         logger.error(f"Erreur critique dans main: {e}", exc_info=True)
 
 if __name__ == "__main__":
-    main()
+    main(incremental='--incremental' in sys.argv)
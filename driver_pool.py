@@ -0,0 +1,182 @@
+"""
+POOL DE DRIVERS SELENIUM
+========================
+Réutilisation de navigateurs Chrome entre les saisons:
+- ChromeDriverManager().install() exécuté une seule fois par processus
+- N navigateurs pré-chauffés, chacun avec un profil persistant (les cookies
+  Cloudflare survivent d'une exécution à l'autre)
+- Distribution des saisons aux drivers libres en parallèle
+- Remplacement automatique des navigateurs plantés
+"""
+
+import queue
+import logging
+import functools
+from pathlib import Path
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+logger = logging.getLogger(__name__)
+
+# Profils Chrome persistants (sous le répertoire cache/ créé par main.setup_directories)
+PROFILE_ROOT = Path('cache') / 'browser_profiles'
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+
+@functools.lru_cache(maxsize=None)
+def chromedriver_path() -> str:
+    """Chemin du ChromeDriver, installé une seule fois par processus"""
+    return ChromeDriverManager().install()
+
+
+def profile_dir(name: str) -> str:
+    """Répertoire de profil persistant (créé si besoin)"""
+    path = PROFILE_ROOT / name
+    path.mkdir(parents=True, exist_ok=True)
+    return str(path.resolve())
+
+
+def create_chrome_driver(headless: bool = True, user_data_dir: str = None) -> webdriver.Chrome:
+    """
+    Lance un Chrome avec les options anti-détection du projet
+
+    Args:
+        headless (bool): Mode invisible
+        user_data_dir (str): Profil persistant (cookies, cache du navigateur)
+    """
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument(f"user-agent={USER_AGENT}")
+    options.add_argument("--start-maximized")
+    if user_data_dir:
+        options.add_argument(f"--user-data-dir={user_data_dir}")
+
+    return webdriver.Chrome(service=Service(chromedriver_path()), options=options)
+
+
+def is_alive(driver) -> bool:
+    """Vérifie que le navigateur répond encore"""
+    try:
+        driver.current_url
+        return True
+    except WebDriverException:
+        return False
+
+
+class DriverPool:
+    """Pool de N navigateurs pré-chauffés avec profils persistants"""
+
+    def __init__(self, size: int = 2, headless: bool = True, factory: Callable = None,
+                 warmup_url: str = None, name: str = 'pool'):
+        """
+        Args:
+            size (int): Nombre de navigateurs
+            headless (bool): Mode invisible (ignoré si factory est fourni)
+            factory (Callable): factory(user_data_dir) -> driver (Chrome par défaut)
+            warmup_url (str): Page visitée au démarrage (passage Cloudflare, cookies)
+            name (str): Préfixe des répertoires de profil
+        """
+        self.size = size
+        self.factory = factory or (lambda user_data_dir: create_chrome_driver(headless, user_data_dir))
+        self.warmup_url = warmup_url
+        self.name = name
+        self._idle = queue.Queue()
+        self._drivers = {}
+        self._started = False
+
+    def _profile(self, slot: int) -> str:
+        return profile_dir(f"{self.name}_{slot}")
+
+    def _launch(self, slot: int):
+        driver = self.factory(self._profile(slot))
+        if self.warmup_url:
+            try:
+                driver.get(self.warmup_url)
+            except WebDriverException as e:
+                logger.warning(f"⚠️ Warm-up du driver {slot} échoué: {e}")
+        self._drivers[slot] = driver
+        return driver
+
+    def start(self):
+        """Lance et pré-chauffe tous les navigateurs"""
+        if self._started:
+            return self
+        logger.info(f"🚀 Démarrage de {self.size} navigateur(s)...")
+        # Créations séquentielles: undetected-chromedriver patche le binaire au lancement
+        for slot in range(self.size):
+            self._launch(slot)
+            self._idle.put(slot)
+        self._started = True
+        logger.info("✅ Pool de drivers prêt")
+        return self
+
+    def _recycle(self, slot: int):
+        """Remplace un navigateur planté (même profil, cookies conservés)"""
+        logger.warning(f"♻️  Driver {slot} ne répond plus, redémarrage...")
+        try:
+            self._drivers[slot].quit()
+        except Exception:
+            pass
+        return self._launch(slot)
+
+    @contextmanager
+    def driver(self):
+        """Emprunte un driver libre (bloque si tous sont occupés)"""
+        if not self._started:
+            self.start()
+        slot = self._idle.get()
+        try:
+            driver = self._drivers[slot]
+            if not is_alive(driver):
+                driver = self._recycle(slot)
+            yield driver
+        except WebDriverException:
+            if not is_alive(self._drivers[slot]):
+                self._recycle(slot)
+            raise
+        finally:
+            self._idle.put(slot)
+
+    def map(self, fn: Callable, items: Iterable) -> List:
+        """
+        Applique fn(driver, item) sur chaque item en parallèle sur les drivers libres
+
+        Returns:
+            List: Résultats dans l'ordre des items
+        """
+        def run(item):
+            with self.driver() as driver:
+                return fn(driver, item)
+
+        if not self._started:
+            self.start()
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(run, items))
+
+    def close(self):
+        """Ferme tous les navigateurs"""
+        for driver in self._drivers.values():
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        self._drivers.clear()
+        self._idle = queue.Queue()
+        self._started = False
+        logger.info("🛑 Pool de drivers fermé")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
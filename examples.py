@@ -99,9 +99,10 @@ df['home_win'] = (df['home_goals'] > df['away_goals']).astype(int)
 df['away_win'] = (df['away_goals'] > df['home_goals']).astype(int)
 df['draw'] = (df['home_goals'] == df['away_goals']).astype(int)
 
-# Moyennes mobiles par équipe
-home_avg = df.groupby('home_team')['home_goals'].rolling(3).mean()
-away_avg = df.groupby('away_team')['away_goals'].rolling(3).mean()
+# Forme par équipe (domicile + extérieur, matchs précédents uniquement)
+from features import build_features
+df = build_features(df, windows=(3, 5, 10))
+print(df[['home_team', 'home_goals_for_r5', 'away_goals_for_r5', 'diff_points_ewm']].tail())
 
 # Exporter
 df.to_csv('botola_features.csv', index=False)
@@ -176,9 +177,12 @@ y = (df['home_goals'] > df['away_goals']).astype(int)
 # Split train/test
 X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
-# Entraîner
-model = RandomForestClassifier(n_estimators=100, random_state=42)
-model.fit(X_train, y_train)
+# Entraîner (ou recharger le modèle déjà ajusté sur les mêmes données)
+from model_cache import ModelCache
+model = ModelCache().get_or_fit(
+    RandomForestClassifier(n_estimators=100, random_state=42), df,
+    fit=lambda m, _: m.fit(X_train, y_train),
+)
 
 # Évaluer
 accuracy = model.score(X_test, y_test)
@@ -186,6 +190,14 @@ print(f"Précision: {accuracy:.2%}")
 
 # Prédire
 print(f"\\nPrédictions (premiers résultats): {model.predict(X_test[:5])}")
+
+# Modèle de buts Dixon-Coles (attaque / défense / avantage du terrain)
+from models import DixonColes, outcome_probabilities
+
+dc = DixonColes().fit(df)
+matrices = dc.score_matrices(['Raja Casablanca'], ['Wydad Casablanca'])
+print(outcome_probabilities(matrices))
+print(dc.ratings().head())
     """)
 
 
@@ -256,6 +268,23 @@ print(f"Nuls: {len(draws)} ({len(draws)/len(df)*100:.1f}%)")
 for team in df['home_team'].unique()[:3]:
     matches = len(df[(df['home_team'] == team) | (df['away_team'] == team)])
     print(f"{team}: {matches} matches")
+
+# Même questions via la base SQLite indexée (recherches par index, sans scan)
+from match_store import MatchStore
+
+store = MatchStore('data/matches.db')
+store.import_csv('botola_matches.csv')
+raja = store.team_matches('Raja Casablanca', venue='home')
+derby = store.head_to_head('Raja Casablanca', 'Wydad Casablanca')
+season_2023 = store.season('2023/2024')
+
+# En mémoire: index paire / équipe construit une fois, requêtes en O(k)
+from h2h_index import MatchIndex
+
+index = MatchIndex(df)
+last_derbies = index.head_to_head('Raja Casablanca', 'Wydad Casablanca', k=5)
+raja_form = index.team_history('Raja Casablanca', k=5)
+print(index.h2h_features('Raja Casablanca', 'Wydad Casablanca', k=5))
     """)
 
 
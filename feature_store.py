@@ -0,0 +1,271 @@
+"""
+FEATURE STORE INCRÉMENTAL - État de forme par équipe
+====================================================
+Au lieu de recalculer toutes les moyennes mobiles sur l'historique complet à
+chaque journée scrapée, on conserve par équipe:
+- les N derniers matchs (tampon circulaire, N = plus grande fenêtre)
+- les accumulateurs EWM (numérateur / dénominateur)
+- les totaux courants (somme, nombre de valeurs) et la date du dernier match
+La mise à jour ne parcourt que les matchs datés du high-water mark (date du
+dernier match intégré) ou après: O(nouveaux matchs); la lecture des features d'un match
+à venir est en temps constant. Les features sont identiques à celles de
+features.build_features (mêmes noms, mêmes fenêtres, même demi-vie).
+"""
+
+import sys
+import logging
+import warnings
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+import settings
+from features import STATS, WINDOWS, EWM_HALFLIFE, team_match_view, feature_columns
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = Path(settings.get_str('DATA', 'OUTPUT_DIR', fallback='data')) / 'feature_state.npz'
+
+
+class FeatureStore:
+    """État de forme persistant de chaque équipe"""
+
+    def __init__(self, windows: Sequence[int] = WINDOWS, halflife: float = EWM_HALFLIFE):
+        self.windows = tuple(windows)
+        self.halflife = halflife
+        self.size = max(self.windows)
+        self.decay = 0.5 ** (1.0 / halflife)
+        self.teams: Dict[str, int] = {}
+        n_stats = len(STATS)
+        self.ring = np.full((0, self.size, n_stats), np.nan)
+        self.played = np.zeros(0, dtype=np.int64)
+        self.ewm_num = np.zeros((0, n_stats))
+        self.ewm_den = np.zeros((0, n_stats))
+        self.totals = np.zeros((0, n_stats))
+        self.counts = np.zeros((0, n_stats), dtype=np.int64)
+        self.last_date = np.zeros(0, dtype='datetime64[ns]')
+        self.seen = set()
+
+    def _team_index(self, team: str) -> int:
+        """Indice de l'équipe (agrandit les tableaux d'état pour une nouvelle équipe)"""
+        index = self.teams.get(team)
+        if index is None:
+            index = len(self.teams)
+            self.teams[team] = index
+            n_stats = len(STATS)
+            self.ring = np.concatenate([self.ring, np.full((1, self.size, n_stats), np.nan)])
+            self.played = np.append(self.played, 0)
+            self.ewm_num = np.vstack([self.ewm_num, np.zeros(n_stats)])
+            self.ewm_den = np.vstack([self.ewm_den, np.zeros(n_stats)])
+            self.totals = np.vstack([self.totals, np.zeros(n_stats)])
+            self.counts = np.vstack([self.counts, np.zeros(n_stats, dtype=np.int64)])
+            self.last_date = np.append(self.last_date, np.datetime64('NaT', 'ns'))
+        return index
+
+    def _push(self, team: str, date: np.datetime64, values: np.ndarray):
+        """Ajoute un match joué à l'état de l'équipe (O(nombre de statistiques))"""
+        i = self._team_index(team)
+        self.ring[i, self.played[i] % self.size] = values
+        self.played[i] += 1
+
+        present = ~np.isnan(values)
+        # EWM "adjust" de pandas, valeurs manquantes ignorées (ignore_na=True)
+        self.ewm_num[i, present] = self.ewm_num[i, present] * self.decay + values[present]
+        self.ewm_den[i, present] = self.ewm_den[i, present] * self.decay + 1.0
+        self.totals[i, present] += values[present]
+        self.counts[i, present] += 1
+        self.last_date[i] = date
+
+    @property
+    def high_water_mark(self) -> Optional[pd.Timestamp]:
+        """Date du dernier match intégré (None si l'état est vide)"""
+        dates = self.last_date[~np.isnat(self.last_date)]
+        return pd.Timestamp(dates.max()) if len(dates) else None
+
+    def update(self, df: pd.DataFrame) -> int:
+        """
+        Intègre les matchs joués pas encore vus (dans l'ordre chronologique)
+
+        Seules les lignes datées du high-water mark ou après sont lues (filtre
+        vectorisé): le coût en Python dépend du nombre de nouveaux matchs, pas
+        de l'historique. Les matchs sans score sont ignorés; un match est ajouté
+        aux deux équipes ou à aucune: s'il est plus ancien que le dernier match
+        connu d'une de ses équipes, il est ignoré (rebuild nécessaire).
+
+        Returns:
+            int: Nombre de matchs ajoutés
+        """
+        mark = self.high_water_mark
+        if mark is not None:
+            dates = pd.to_datetime(df['date'], errors='coerce')
+            older = int((dates < mark).sum())
+            if older > len(self.seen):
+                logger.warning(f"⚠️ Au moins {older - len(self.seen)} match(s) antérieurs au {mark.date()} "
+                               f"non intégrés (utiliser rebuild)")
+            df = df[dates >= mark]
+
+        long = team_match_view(df)
+        long = long[long['points'].notna() & long['date'].notna()]
+        home = long[long['is_home']].set_index('match_id')
+        away = long[~long['is_home']].set_index('match_id').reindex(home.index)
+        home = home.sort_index().sort_values('date', kind='mergesort')
+        away = away.loc[home.index]
+        home_values = home[STATS].to_numpy(dtype='float64')
+        away_values = away[STATS].to_numpy(dtype='float64')
+
+        added, skipped = set(), 0
+        for n, (date, home_team, away_team) in enumerate(zip(home['date'], home['team'], home['opponent'])):
+            key = (str(date.date()), home_team, away_team)
+            if key in self.seen or key in added:
+                continue
+            date = np.datetime64(date, 'ns')
+            # Les deux équipes doivent pouvoir recevoir le match avant d'en pousser une
+            if any(self._is_after(team, date) for team in (home_team, away_team)):
+                skipped += 1
+                continue
+            self._push(home_team, date, home_values[n])
+            self._push(away_team, date, away_values[n])
+            added.add(key)
+
+        self.seen.update(added)
+        if skipped:
+            logger.warning(f"⚠️ {skipped} match(s) antérieurs à l'état ignorés (utiliser rebuild)")
+        logger.info(f"✅ Feature store: {len(added)} match(s) ajoutés ({len(self.teams)} équipes)")
+        return len(added)
+
+    def _is_after(self, team: str, date: np.datetime64) -> bool:
+        """True si l'équipe a déjà un match intégré à cette date ou après"""
+        i = self.teams.get(team)
+        return i is not None and not np.isnat(self.last_date[i]) and date <= self.last_date[i]
+
+    @classmethod
+    def rebuild(cls, df: pd.DataFrame, **kwargs) -> 'FeatureStore':
+        """Reconstruit l'état depuis l'historique complet"""
+        store = cls(**kwargs)
+        store.update(df)
+        return store
+
+    def team_features(self, team: str, date=None) -> Dict[str, float]:
+        """
+        Features de l'équipe avant son prochain match (mêmes noms que features.py)
+
+        Args:
+            team (str): Équipe
+            date: Date du match à venir (pour rest_days)
+        """
+        features = dict.fromkeys(feature_columns(self.windows), np.nan)
+        i = self.teams.get(team)
+        features['matches_played'] = 0 if i is None else int(self.played[i])
+        if i is None:
+            return features
+
+        played = int(self.played[i])
+        for window in self.windows:
+            n = min(window, played)
+            # Les n derniers matchs du tampon circulaire
+            slots = (played - 1 - np.arange(n)) % self.size
+            recent = self.ring[i, slots]
+            with warnings.catch_warnings():
+                # Statistique jamais renseignée sur la fenêtre: NaN attendu
+                warnings.simplefilter('ignore', RuntimeWarning)
+                means = np.nanmean(recent, axis=0) if n else np.full(len(STATS), np.nan)
+            for stat, value in zip(STATS, means):
+                features[f'{stat}_r{window}'] = value
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ewm = np.where(self.ewm_den[i] > 0, self.ewm_num[i] / self.ewm_den[i], np.nan)
+        for stat, value in zip(STATS, ewm):
+            features[f'{stat}_ewm'] = value
+        if date is not None and not np.isnat(self.last_date[i]):
+            features['rest_days'] = float((pd.Timestamp(date) - pd.Timestamp(self.last_date[i])).days)
+        return features
+
+    def fixture_features(self, home_team: str, away_team: str, date=None) -> Dict[str, float]:
+        """Vecteur de features d'un match à venir (home_*, away_*, diff_*), en temps constant"""
+        home = self.team_features(home_team, date)
+        away = self.team_features(away_team, date)
+        vector = {f'home_{k}': v for k, v in home.items()}
+        vector.update({f'away_{k}': v for k, v in away.items()})
+        vector.update({f'diff_{k}': home[k] - away[k] for k in home if k != 'matches_played'})
+        return vector
+
+    def team_table(self) -> pd.DataFrame:
+        """Features de chaque équipe avant son prochain match (une ligne par équipe, rest_days vide)"""
+        rows = [self.team_features(team) for team in self.teams]
+        return pd.DataFrame(rows, index=list(self.teams), columns=feature_columns(self.windows))
+
+    def snapshot(self, fixtures: pd.DataFrame) -> pd.DataFrame:
+        """
+        Features de plusieurs matchs à venir (colonnes home_team, away_team, date optionnelle)
+
+        Une ligne par équipe est calculée une fois, puis jointe aux matchs par
+        indexation: le coût ne dépend pas du nombre de matchs.
+        """
+        columns = feature_columns(self.windows)
+        table = self.team_table()
+        last_date = pd.Series(self.last_date, index=table.index)
+        dates = pd.to_datetime(fixtures['date'], errors='coerce').to_numpy() if 'date' in fixtures.columns else None
+        sides = {}
+        for prefix in ('home', 'away'):
+            teams = fixtures[f'{prefix}_team'].astype(str).to_numpy()
+            side = table.reindex(teams).reset_index(drop=True)
+            side['matches_played'] = side['matches_played'].fillna(0).astype('int64')
+            if dates is not None:
+                side['rest_days'] = pd.Series(dates - last_date.reindex(teams).to_numpy()).dt.days.astype('float64')
+            sides[prefix] = side
+        vector = pd.concat([sides['home'].add_prefix('home_'), sides['away'].add_prefix('away_')], axis=1)
+        diff = {f'diff_{col}': sides['home'][col] - sides['away'][col] for col in columns if col != 'matches_played'}
+        return pd.concat([fixtures.reset_index(drop=True), vector, pd.DataFrame(diff)], axis=1)
+
+    def team_totals(self) -> pd.DataFrame:
+        """Moyennes sur tout l'historique de chaque équipe (totaux courants)"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(self.counts > 0, self.totals / np.maximum(self.counts, 1), np.nan)
+        return pd.DataFrame(means, index=list(self.teams), columns=STATS).assign(matches_played=self.played)
+
+    def save(self, path: str = None) -> Path:
+        """Sauvegarde l'état (npz compressé)"""
+        path = Path(path or DEFAULT_PATH)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        seen = np.array(sorted(self.seen), dtype=str).reshape(-1, 3)
+        np.savez_compressed(
+            path, teams=np.array(list(self.teams), dtype=str), windows=np.array(self.windows),
+            halflife=self.halflife, ring=self.ring, played=self.played, ewm_num=self.ewm_num,
+            ewm_den=self.ewm_den, totals=self.totals, counts=self.counts,
+            last_date=self.last_date, seen=seen,
+        )
+        return path
+
+    @classmethod
+    def load(cls, path: str = None) -> 'FeatureStore':
+        """Recharge un état sauvegardé (état vide si le fichier n'existe pas)"""
+        path = Path(path or DEFAULT_PATH)
+        if not path.exists():
+            return cls()
+        data = np.load(path)
+        store = cls(windows=data['windows'].tolist(), halflife=float(data['halflife']))
+        store.teams = {team: i for i, team in enumerate(data['teams'].tolist())}
+        for name in ('ring', 'played', 'ewm_num', 'ewm_den', 'totals', 'counts', 'last_date'):
+            setattr(store, name, data[name])
+        store.seen = {tuple(key) for key in data['seen'].tolist()}
+        return store
+
+
+def update_from_csv(csv_path: str, state_path: str = None) -> FeatureStore:
+    """Charge l'état, y intègre les nouveaux matchs du CSV et le sauvegarde"""
+    store = FeatureStore.load(state_path)
+    store.update(pd.read_csv(csv_path))
+    store.save(state_path)
+    return store
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    # Usage: python feature_store.py [matches.csv] [équipe domicile] [équipe extérieur]
+    csv_file = sys.argv[1] if len(sys.argv) > 1 else 'botola_matches.csv'
+    state = update_from_csv(csv_file)
+    if len(sys.argv) > 3:
+        vector = state.fixture_features(sys.argv[2], sys.argv[3])
+        for name, value in vector.items():
+            print(f"{name:30s} {value:.3f}")
@@ -0,0 +1,160 @@
+"""
+FEATURES DE FORME - Moyennes mobiles vectorisées par équipe
+===========================================================
+- vue longue équipe-match construite une seule fois (chaque match compte
+  pour les deux équipes, domicile et extérieur)
+- moyennes glissantes (3, 5, 10 matchs) des buts, xG, tirs, possession et
+  points via sommes cumulées NumPy, sans boucle Python par équipe
+- forme exponentielle (EWM) via groupby().ewm()
+- uniquement les matchs ANTÉRIEURS: aucune fuite d'information sur le match
+  à prédire (les matchs à venir, sans score, reçoivent aussi leurs features)
+"""
+
+import sys
+import logging
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from storage import normalize_matches
+
+logger = logging.getLogger(__name__)
+
+WINDOWS = (3, 5, 10)
+EWM_HALFLIFE = 4  # en matchs
+
+# Colonnes de la vue longue: (colonne domicile, colonne extérieur) -> statistique
+SIDE_COLUMNS = {
+    'goals_for': ('home_goals', 'away_goals'),
+    'goals_against': ('away_goals', 'home_goals'),
+    'xg_for': ('xg_home', 'xg_away'),
+    'xg_against': ('xg_away', 'xg_home'),
+    'shots_for': ('shots_home', 'shots_away'),
+    'shots_against': ('shots_away', 'shots_home'),
+    'possession': ('possession_home', 'possession_away'),
+}
+STATS = list(SIDE_COLUMNS) + ['points']
+
+
+def team_match_view(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vue longue: une ligne par (match, équipe), triée par équipe puis date
+
+    Colonnes: match_id (index du match dans df), team, opponent, is_home, date,
+    et les statistiques STATS du point de vue de l'équipe.
+    """
+    typed = normalize_matches(df)
+    sides = []
+    for is_home, (team_col, opp_col) in ((True, ('home_team', 'away_team')), (False, ('away_team', 'home_team'))):
+        side = pd.DataFrame({
+            'match_id': typed.index,
+            'team': typed[team_col].astype(str).to_numpy(),
+            'opponent': typed[opp_col].astype(str).to_numpy(),
+            'is_home': is_home,
+            'date': typed['date'].to_numpy(),
+        })
+        for stat, (home_col, away_col) in SIDE_COLUMNS.items():
+            side[stat] = typed[home_col if is_home else away_col].astype('float64').to_numpy()
+        sides.append(side)
+
+    long = pd.concat(sides, ignore_index=True)
+    diff = long['goals_for'] - long['goals_against']
+    long['points'] = np.select([diff > 0, diff == 0, diff < 0], [3.0, 1.0, 0.0], default=np.nan)
+    return long.sort_values(['team', 'date', 'match_id'], kind='mergesort').reset_index(drop=True)
+
+
+def _group_starts(teams: pd.Series) -> np.ndarray:
+    """Position de la première ligne du groupe de chaque ligne (vue triée par équipe)"""
+    codes = teams.to_numpy()
+    is_start = np.ones(len(codes), dtype=bool)
+    is_start[1:] = codes[1:] != codes[:-1]
+    return np.maximum.accumulate(np.where(is_start, np.arange(len(codes)), 0))
+
+
+def rolling_previous_mean(values: np.ndarray, starts: np.ndarray, window: int) -> np.ndarray:
+    """
+    Moyenne des `window` valeurs précédentes du même groupe (valeur courante exclue)
+
+    Sommes cumulées exclusives: somme(i) = S[i] - S[max(i - window, début du groupe)].
+    Les NaN sont ignorés (moyenne sur les valeurs disponibles, NaN si aucune).
+    """
+    present = ~np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(present, values, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(present)))
+    idx = np.arange(len(values))
+    lower = np.maximum(idx - window, starts)
+    total = sums[idx] - sums[lower]
+    n = counts[idx] - counts[lower]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(n > 0, total / n, np.nan)
+
+
+def add_form_features(long: pd.DataFrame, windows: Sequence[int] = WINDOWS,
+                      halflife: float = EWM_HALFLIFE) -> pd.DataFrame:
+    """
+    Ajoute à la vue longue les moyennes glissantes et EWM des matchs précédents
+
+    Colonnes ajoutées: <stat>_r<w>, <stat>_ewm, matches_played, rest_days.
+    """
+    long = long.copy()
+    starts = _group_starts(long['team'])
+    idx = np.arange(len(long))
+    features = {'matches_played': idx - starts}
+
+    for stat in STATS:
+        values = long[stat].to_numpy(dtype='float64')
+        for window in windows:
+            features[f'{stat}_r{window}'] = rolling_previous_mean(values, starts, window)
+
+    # EWM sur les valeurs décalées d'un match: la valeur courante n'entre jamais dans sa propre forme
+    previous = long.groupby('team', sort=False)[STATS].shift(1)
+    ewm = previous.groupby(long['team'], sort=False).ewm(halflife=halflife, ignore_na=True).mean()
+    ewm = ewm.reset_index(level=0, drop=True).reindex(long.index)
+    for stat in STATS:
+        features[f'{stat}_ewm'] = ewm[stat].to_numpy()
+
+    previous_date = long.groupby('team', sort=False)['date'].shift(1)
+    features['rest_days'] = (long['date'] - previous_date).dt.days.to_numpy(dtype='float64')
+    return pd.concat([long, pd.DataFrame(features, index=long.index)], axis=1)
+
+
+def feature_columns(windows: Sequence[int] = WINDOWS) -> list:
+    """Noms des features par équipe (sans préfixe home_/away_)"""
+    return (['matches_played', 'rest_days']
+            + [f'{stat}_r{w}' for stat in STATS for w in windows]
+            + [f'{stat}_ewm' for stat in STATS])
+
+
+def build_features(df: pd.DataFrame, windows: Sequence[int] = WINDOWS,
+                   halflife: float = EWM_HALFLIFE) -> pd.DataFrame:
+    """
+    Features de forme jointes aux matchs (une ligne par match, même index que df)
+
+    Chaque feature par équipe est ajoutée deux fois, préfixée home_ et away_,
+    ainsi que les différences diff_<feature> (domicile - extérieur).
+
+    Returns:
+        pd.DataFrame: df + features
+    """
+    long = add_form_features(team_match_view(df), windows, halflife)
+    columns = feature_columns(windows)
+
+    result = df.copy()
+    for prefix, is_home in (('home_', True), ('away_', False)):
+        side = long.loc[long['is_home'] == is_home].set_index('match_id')[columns]
+        result = result.join(side.add_prefix(prefix))
+    for col in columns:
+        if col != 'matches_played':
+            result[f'diff_{col}'] = result[f'home_{col}'] - result[f'away_{col}']
+    return result
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    source = sys.argv[1] if len(sys.argv) > 1 else 'botola_matches.csv'
+    target = sys.argv[2] if len(sys.argv) > 2 else 'botola_features.csv'
+    matches = pd.read_csv(source)
+    features = build_features(matches)
+    features.to_csv(target, index=False, encoding='utf-8')
+    logger.info(f"✅ {len(features)} matchs, {len(features.columns)} colonnes écrits dans {target}")
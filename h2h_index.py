@@ -0,0 +1,205 @@
+"""
+INDEX CONFRONTATIONS DIRECTES / ÉQUIPES
+=======================================
+Index précalculés sur une table de matchs:
+- paire d'équipes (non ordonnée) -> positions des matchs, triées par date
+- équipe -> positions de ses matchs, triées par date
+Construit en un passage, mis à jour à l'ajout de matchs; une requête
+"k derniers matchs" coûte O(k) au lieu d'un filtrage complet du DataFrame.
+Les colonnes sont stockées dans des tableaux numpy préalloués (capacité
+doublée au besoin): un ajout coûte O(nouveaux matchs), sans copie de
+l'historique. Équipes et saisons sont codées sur un type catégoriel fixe,
+étendu en fin de liste à l'arrivée d'une équipe ou d'une saison.
+"""
+
+import bisect
+import logging
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from storage import COLUMN_DTYPES, normalize_matches
+
+logger = logging.getLogger(__name__)
+
+INITIAL_CAPACITY = 1024
+NULLABLE_INTEGERS = ('Int8', 'Int16')
+# Type numpy de stockage de chaque type pandas du schéma
+STORAGE_DTYPES = {'datetime64[ns]': 'datetime64[ns]', 'string': object, 'category': 'int32',
+                  'Int8': 'int8', 'Int16': 'int16', 'float32': 'float32'}
+
+
+def pair_key(team_a: str, team_b: str) -> Tuple[str, str]:
+    """Clé non ordonnée d'une confrontation"""
+    return (team_a, team_b) if team_a <= team_b else (team_b, team_a)
+
+
+class MatchIndex:
+    """Matchs typés + index paire -> positions et équipe -> positions"""
+
+    def __init__(self, df: pd.DataFrame = None):
+        self._size = 0
+        # Colonnes préallouées (codes pour les catégories, valeurs + masque pour les entiers nullables)
+        self._columns: Dict[str, np.ndarray] = {col: np.empty(0, STORAGE_DTYPES[dtype])
+                                                for col, dtype in COLUMN_DTYPES.items()}
+        self._masks: Dict[str, np.ndarray] = {col: np.empty(0, bool) for col, dtype in COLUMN_DTYPES.items()
+                                              if dtype in NULLABLE_INTEGERS}
+        # Catégories dans l'ordre d'apparition: les codes déjà stockés ne changent jamais
+        self._dtypes = {'team': pd.CategoricalDtype([]), 'season': pd.CategoricalDtype([])}
+        self._frame = None
+        # Listes triées de (date en ns, position) pour chaque clé
+        self._pairs: Dict[Tuple[str, str], List[Tuple[int, int]]] = defaultdict(list)
+        self._teams: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        if df is not None:
+            self.append(df)
+
+    def _column_dtypes(self) -> Dict[str, pd.CategoricalDtype]:
+        team = self._dtypes['team']
+        return {'home_team': team, 'away_team': team, 'season': self._dtypes['season']}
+
+    def _extend_categories(self, new: pd.DataFrame):
+        """Ajoute les valeurs inconnues à la fin des catégories"""
+        for name, columns in (('team', ['home_team', 'away_team']), ('season', ['season'])):
+            known = self._dtypes[name].categories
+            values = pd.unique(np.concatenate([new[col].cat.categories.to_numpy() for col in columns]))
+            added = [value for value in values if value not in known]
+            if added:
+                self._dtypes[name] = pd.CategoricalDtype(known.append(pd.Index(added)))
+
+    def _reserve(self, n: int):
+        """Garantit la place pour n matchs de plus (croissance géométrique: O(1) amorti par match)"""
+        needed = self._size + n
+        capacity = len(self._columns['date'])
+        if needed <= capacity:
+            return
+        capacity = max(needed, 2 * capacity, INITIAL_CAPACITY)
+        for store in (self._columns, self._masks):
+            for col, values in store.items():
+                grown = np.empty(capacity, values.dtype)
+                grown[:self._size] = values[:self._size]
+                store[col] = grown
+
+    def _store(self, new: pd.DataFrame, start: int):
+        rows = slice(start, start + len(new))
+        dtypes = self._column_dtypes()
+        for col, dtype in COLUMN_DTYPES.items():
+            values = new[col]
+            if dtype == 'category':
+                self._columns[col][rows] = values.cat.set_categories(dtypes[col].categories).cat.codes.to_numpy()
+            elif dtype in NULLABLE_INTEGERS:
+                self._columns[col][rows] = values.to_numpy(STORAGE_DTYPES[dtype], na_value=0)
+                self._masks[col][rows] = values.isna().to_numpy()
+            elif dtype == 'string':
+                self._columns[col][rows] = values.to_numpy(object, na_value=None)
+            else:
+                self._columns[col][rows] = values.to_numpy(STORAGE_DTYPES[dtype])
+
+    def _rows(self, positions, index: pd.Index = None) -> pd.DataFrame:
+        """Lignes aux positions globales données, dans cet ordre, indexées par leur position"""
+        positions = np.asarray(positions, dtype='int64')
+        dtypes = self._column_dtypes()
+        data = {}
+        for col, dtype in COLUMN_DTYPES.items():
+            values = self._columns[col][positions]
+            if dtype == 'category':
+                data[col] = pd.Categorical.from_codes(values, dtype=dtypes[col])
+            elif dtype in NULLABLE_INTEGERS:
+                data[col] = pd.arrays.IntegerArray(values, self._masks[col][positions])
+            elif dtype == 'string':
+                data[col] = pd.array(values, dtype='string')
+            else:
+                data[col] = values
+        return pd.DataFrame(data, index=pd.Index(positions) if index is None else index)
+
+    @property
+    def matches(self) -> pd.DataFrame:
+        """Table complète des matchs (assemblée à la première lecture après un ajout)"""
+        if self._frame is None:
+            self._frame = self._rows(np.arange(self._size), pd.RangeIndex(self._size))
+        return self._frame
+
+    def append(self, df: pd.DataFrame) -> int:
+        """
+        Ajoute des matchs et met à jour les index (O(nouveaux matchs) pour des
+        matchs plus récents que ceux déjà indexés)
+
+        Returns:
+            int: Nombre de matchs ajoutés
+        """
+        new = normalize_matches(df)
+        new = new[new['date'].notna()].reset_index(drop=True)
+        if new.empty:
+            return 0
+        for col in ('home_team', 'away_team', 'season'):
+            new[col] = new[col].cat.rename_categories(str)
+        start = self._size
+        self._extend_categories(new)
+        self._reserve(len(new))
+        self._store(new, start)
+        self._size += len(new)
+        self._frame = None
+
+        home = new['home_team'].astype(str).to_numpy()
+        away = new['away_team'].astype(str).to_numpy()
+        dates = new['date'].to_numpy().astype('int64')
+        for offset in np.argsort(dates, kind='mergesort'):
+            entry = (int(dates[offset]), start + int(offset))
+            for keyed, key in ((self._pairs, pair_key(home[offset], away[offset])),
+                               (self._teams, home[offset]), (self._teams, away[offset])):
+                positions = keyed[key]
+                if not positions or positions[-1] <= entry:
+                    positions.append(entry)
+                else:
+                    bisect.insort(positions, entry)
+        logger.info(f"✅ Index: {len(new)} match(s) ajoutés ({len(self._pairs)} confrontations)")
+        return len(new)
+
+    def head_to_head_positions(self, team_a: str, team_b: str, k: int = None) -> List[int]:
+        """Positions des k dernières confrontations (toutes si k est None), de la plus ancienne à la plus récente"""
+        entries = self._pairs.get(pair_key(team_a, team_b), [])
+        return [position for _, position in (entries[-k:] if k else entries)]
+
+    def team_positions(self, team: str, k: int = None) -> List[int]:
+        """Positions des k derniers matchs de l'équipe"""
+        entries = self._teams.get(team, [])
+        return [position for _, position in (entries[-k:] if k else entries)]
+
+    def head_to_head(self, team_a: str, team_b: str, k: int = None) -> pd.DataFrame:
+        """k dernières confrontations directes (les deux sens)"""
+        return self._rows(self.head_to_head_positions(team_a, team_b, k))
+
+    def team_history(self, team: str, k: int = None) -> pd.DataFrame:
+        """k derniers matchs de l'équipe (domicile et extérieur)"""
+        return self._rows(self.team_positions(team, k))
+
+    def h2h_features(self, home_team: str, away_team: str, k: int = 5, before=None) -> Dict[str, float]:
+        """
+        Résumé des k dernières confrontations du point de vue de l'équipe à domicile
+
+        Args:
+            before: Ne compter que les matchs antérieurs à cette date (pas de fuite
+                    d'information pour un match déjà joué)
+        """
+        entries = self._pairs.get(pair_key(home_team, away_team), [])
+        if before is not None:
+            entries = entries[:bisect.bisect_left(entries, (pd.Timestamp(before).value, -1))]
+        recent = self._rows([position for _, position in entries[-k:]])
+        played = recent[recent['home_goals'].notna() & recent['away_goals'].notna()]
+
+        is_home = (played['home_team'].astype(str) == home_team).to_numpy()
+        goals_for = np.where(is_home, played['home_goals'], played['away_goals']).astype('float64')
+        goals_against = np.where(is_home, played['away_goals'], played['home_goals']).astype('float64')
+        n = len(played)
+        return {
+            'h2h_matches': n,
+            'h2h_wins': int((goals_for > goals_against).sum()),
+            'h2h_draws': int((goals_for == goals_against).sum()),
+            'h2h_losses': int((goals_for < goals_against).sum()),
+            'h2h_goals_for': goals_for.mean() if n else np.nan,
+            'h2h_goals_against': goals_against.mean() if n else np.nan,
+        }
+
+    def __len__(self) -> int:
+        return self._size
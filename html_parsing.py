@@ -0,0 +1,255 @@
+"""
+PARSING HTML - Backends de parsing rapides
+==========================================
+Point d'entrée unique pour le parsing des pages FootyStats:
+- make_soup(): BeautifulSoup avec le parser le plus rapide disponible (lxml > html.parser)
+- parse_match_rows(): extraction des lignes de `table.matches-table` via
+  selectolax, lxml ou html.parser selon ce qui est installé
+- soup_match_rows(): mêmes lignes depuis un BeautifulSoup déjà construit,
+  avec le texte de chaque ligne (stats)
+- iter_match_rows(): équivalent streaming de soup_match_rows()
+"""
+
+import logging
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+logger = logging.getLogger(__name__)
+
+try:
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    try:
+        # selectolax < 1.0 (backend Modest)
+        from selectolax.parser import HTMLParser
+        HAS_SELECTOLAX = True
+    except ImportError:
+        HAS_SELECTOLAX = False
+
+MATCH_ROW_SELECTOR = "table.matches-table tbody tr"
+MATCHES_TABLE_CLASS = "matches-table"
+# Taille des blocs envoyés au parser incrémental
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def best_bs4_parser() -> str:
+    """Nom du tree builder BeautifulSoup le plus rapide installé"""
+    return 'lxml' if HAS_LXML else 'html.parser'
+
+
+def make_soup(markup, parse_only=None, parser: str = None) -> BeautifulSoup:
+    """
+    Construit un BeautifulSoup avec le parser le plus rapide disponible
+
+    Args:
+        markup: HTML (str ou bytes)
+        parse_only: SoupStrainer optionnel pour ne construire qu'une partie de l'arbre
+        parser (str): Force un tree builder ('lxml', 'html.parser')
+    """
+    return BeautifulSoup(markup, parser or best_bs4_parser(), parse_only=parse_only)
+
+
+def _match_dict(date: str, home_team: str, score: str, away_team: str, match_url: str = None) -> Optional[Dict]:
+    if not (home_team and away_team and score):
+        return None
+    return {'date': date, 'home_team': home_team, 'away_team': away_team, 'score': score,
+            'match_url': match_url or None}
+
+
+def _row_match_bs4(row) -> Optional[Dict]:
+    cells = row.find_all('td')
+    if len(cells) < 4:
+        return None
+    home = cells[1].select_one("a.team-name")
+    away = cells[3].select_one("a.team-name")
+    score = cells[2].select_one("a.match-link") or cells[2].select_one("a")
+    if not (home and away and score):
+        return None
+    return _match_dict(cells[0].get_text(strip=True), home.get_text(strip=True),
+                       score.get_text(strip=True), away.get_text(strip=True), score.get('href'))
+
+
+def soup_match_rows(soup: BeautifulSoup) -> Iterator[Tuple[Dict, str]]:
+    """
+    Lignes valides de `table.matches-table` d'une page déjà parsée, règles de parse_match_rows
+
+    Yields:
+        Tuple[Dict, str]: (match, texte de la ligne avec les cellules séparées par des espaces)
+    """
+    for row in soup.select(MATCH_ROW_SELECTOR):
+        match = _row_match_bs4(row)
+        if match:
+            yield match, row.get_text(' ')
+
+
+def _extract_bs4(soup: BeautifulSoup) -> List[Dict]:
+    matches = []
+    for row in soup.select(MATCH_ROW_SELECTOR):
+        match = _row_match_bs4(row)
+        if match:
+            matches.append(match)
+    return matches
+
+
+def _rows_bs4(html: str, parser: str) -> List[Dict]:
+    return _extract_bs4(make_soup(html, parser=parser))
+
+
+def _extract_selectolax(tree) -> List[Dict]:
+    matches = []
+    for row in tree.css(MATCH_ROW_SELECTOR):
+        cells = row.css('td')
+        if len(cells) < 4:
+            continue
+        home = cells[1].css_first("a.team-name")
+        away = cells[3].css_first("a.team-name")
+        score = cells[2].css_first("a.match-link") or cells[2].css_first("a")
+        if home and away and score:
+            match = _match_dict(cells[0].text(strip=True), home.text(strip=True),
+                                score.text(strip=True), away.text(strip=True), score.attributes.get('href'))
+            if match:
+                matches.append(match)
+    return matches
+
+
+def _rows_selectolax(html: str) -> List[Dict]:
+    return _extract_selectolax(HTMLParser(html))
+
+
+def backend_stages() -> Dict[str, Tuple[Callable, Callable]]:
+    """
+    Étapes séparées de chaque backend installé: (parse(html) -> arbre, extract(arbre) -> lignes)
+
+    Utilisé par le benchmark pour chronométrer le parsing et l'extraction indépendamment.
+    """
+    stages = {}
+    if HAS_SELECTOLAX:
+        stages['selectolax'] = (HTMLParser, _extract_selectolax)
+    if HAS_LXML:
+        stages['lxml'] = (lambda html: make_soup(html, parser='lxml'), _extract_bs4)
+    stages['html.parser'] = (lambda html: make_soup(html, parser='html.parser'), _extract_bs4)
+    return stages
+
+
+def available_backends() -> Dict[str, Callable[[str], List[Dict]]]:
+    """Backends d'extraction installés, du plus rapide au plus lent"""
+    backends = {}
+    if HAS_SELECTOLAX:
+        backends['selectolax'] = _rows_selectolax
+    if HAS_LXML:
+        backends['lxml'] = lambda html: _rows_bs4(html, 'lxml')
+    backends['html.parser'] = lambda html: _rows_bs4(html, 'html.parser')
+    return backends
+
+
+def parse_match_rows(html: str, backend: str = None) -> List[Dict]:
+    """
+    Extrait les matchs de `table.matches-table` (date, équipes, score, lien de la page du match)
+
+    Args:
+        html (str): Page complète ou fragment contenant la table
+        backend (str): 'selectolax', 'lxml' ou 'html.parser' (le plus rapide par défaut)
+
+    Returns:
+        List[Dict]: Un dict par ligne valide
+    """
+    backends = available_backends()
+    if backend is None:
+        backend = next(iter(backends))
+    elif backend not in backends:
+        raise ValueError(f"Backend de parsing indisponible: {backend} (disponibles: {list(backends)})")
+    return backends[backend](html)
+
+
+def iter_match_rows(html: str, table_class: str = MATCHES_TABLE_CLASS) -> Iterator[Tuple[Dict, str]]:
+    """
+    Équivalent streaming de parse_match_rows: mêmes règles d'extraction
+    (date en cellule 0, `a.team-name` en cellules 1 et 3, `a.match-link` en
+    cellule 2), mêmes dicts, mémoire constante
+
+    Yields:
+        Tuple[Dict, str]: (match, texte de la ligne avec les cellules séparées par des espaces)
+    """
+    if HAS_LXML:
+        rows = _iter_rows_lxml(html, table_class, _row_match_lxml)
+    else:
+        rows = _iter_rows_strainer(html, table_class, lambda row: (_row_match_bs4(row), row.get_text(' ')))
+    for match, row_text in rows:
+        if match:
+            yield match, row_text
+
+
+def _lxml_text(element, strip: bool = True) -> str:
+    # Équivalent de get_text(strip=True) de BeautifulSoup
+    if strip:
+        return ''.join(text.strip() for text in element.itertext())
+    return ''.join(element.itertext())
+
+
+def _lxml_link(cell, css_class: str = None):
+    # Premier <a> de la cellule (avec la classe demandée si fournie)
+    for link in cell.iter('a'):
+        if css_class is None or css_class in (link.get('class') or '').split():
+            return link
+    return None
+
+
+def _row_match_lxml(row) -> Tuple[Optional[Dict], str]:
+    row_text = ' '.join(text.strip() for text in row.itertext() if text.strip())
+    cells = list(row.iter('td'))
+    if len(cells) < 4:
+        return None, row_text
+    home = _lxml_link(cells[1], 'team-name')
+    away = _lxml_link(cells[3], 'team-name')
+    score = _lxml_link(cells[2], 'match-link')
+    if score is None:
+        score = _lxml_link(cells[2])
+    if home is None or away is None or score is None:
+        return None, row_text
+    return _match_dict(_lxml_text(cells[0]), _lxml_text(home), _lxml_text(score), _lxml_text(away),
+                       score.get('href')), row_text
+
+
+def _iter_rows_lxml(html: str, table_class: str, convert: Callable) -> Iterator:
+    parser = etree.HTMLPullParser(events=('start', 'end'), remove_comments=True)
+    table_depth = 0
+
+    def drain():
+        nonlocal table_depth
+        for event, element in parser.read_events():
+            if element.tag == 'table':
+                if event == 'start' and (table_depth or table_class in (element.get('class') or '').split()):
+                    table_depth += 1
+                elif event == 'end' and table_depth:
+                    table_depth -= 1
+                continue
+            if event != 'end':
+                continue
+            if table_depth and element.tag == 'tr':
+                yield convert(element)
+                element.clear()
+                # Supprime les lignes déjà traitées pour garder le tbody vide
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+            elif not table_depth and element.tag not in ('html', 'body'):
+                element.clear()
+
+    for start in range(0, len(html), STREAM_CHUNK_SIZE):
+        parser.feed(html[start:start + STREAM_CHUNK_SIZE])
+        yield from drain()
+    parser.close()
+    yield from drain()
+
+
+def _iter_rows_strainer(html: str, table_class: str, convert: Callable) -> Iterator:
+    soup = make_soup(html, parse_only=SoupStrainer('table', class_=table_class))
+    for row in soup.find_all('tr'):
+        yield convert(row)
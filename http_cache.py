@@ -0,0 +1,178 @@
+"""
+CACHE HTTP - Réponses FootyStats sur disque
+===========================================
+Cache adressé par contenu des pages téléchargées (répertoire cache/):
+- TTL par classe d'URL (saisons terminées: jamais expirées, saison en cours: quelques minutes)
+- Revalidation par GET conditionnel (ETag / If-Modified-Since)
+- Éviction LRU bornée en taille
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# TTL (secondes) des pages de la saison en cours
+CURRENT_SEASON_TTL = 10 * 60
+# TTL par défaut des URLs non classées
+DEFAULT_TTL = 60 * 60
+# Taille maximale du cache sur disque
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+# Les saisons de Botola se terminent au plus tard fin juillet
+SEASON_END_MONTH = 7
+
+
+def is_finished_season(season_name: str, today: date = None) -> bool:
+    """
+    Indique si une saison (ex: "2022/2023") est terminée
+
+    Args:
+        season_name (str): Nom de la saison au format AAAA/AAAA
+        today (date): Date de référence (aujourd'hui par défaut)
+    """
+    today = today or date.today()
+    try:
+        end_year = int(season_name.split('/')[-1])
+    except ValueError:
+        return False
+    return (today.year, today.month) > (end_year, SEASON_END_MONTH)
+
+
+def season_ttl(season_name: str) -> Optional[float]:
+    """TTL d'une page de saison: None (jamais expirée) si la saison est terminée"""
+    return None if is_finished_season(season_name) else CURRENT_SEASON_TTL
+
+
+class HttpCache:
+    """Cache disque des réponses HTTP, adressé par contenu (SHA-256 du corps)"""
+
+    def __init__(self, cache_dir: str = 'cache', max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            cache_dir (str): Répertoire racine (créé par main.setup_directories)
+            max_bytes (int): Taille maximale des objets stockés
+        """
+        self.root = Path(cache_dir) / 'http'
+        self.objects_dir = self.root / 'objects'
+        self.index_path = self.root / 'index.json'
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self._index = self._load_index()
+
+    def _load_index(self) -> Dict[str, Dict]:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_index(self):
+        # Écriture atomique pour ne jamais laisser un index tronqué
+        tmp_path = self.index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Retourne l'entrée d'index pour l'URL (ou None)"""
+        with self._lock:
+            entry = self._index.get(url)
+            return dict(entry) if entry else None
+
+    def is_fresh(self, entry: Dict) -> bool:
+        """Une entrée sans TTL n'expire jamais"""
+        ttl = entry.get('ttl')
+        return ttl is None or time.time() - entry['fetched_at'] < ttl
+
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        """En-têtes de revalidation pour un GET conditionnel"""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def read(self, url: str) -> Optional[str]:
+        """Lit le corps en cache pour l'URL et met à jour son rang LRU"""
+        with self._lock:
+            entry = self._index.get(url)
+            if not entry:
+                return None
+            try:
+                body = self._object_path(entry['digest']).read_text(encoding='utf-8')
+            except FileNotFoundError:
+                del self._index[url]
+                return None
+            entry['accessed_at'] = time.time()
+            return body
+
+    def store(self, url: str, body: str, etag: str = None, last_modified: str = None,
+              ttl: Optional[float] = DEFAULT_TTL):
+        """Enregistre une réponse 200"""
+        data = body.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        with self._lock:
+            if not path.exists():
+                path.parent.mkdir(exist_ok=True)
+                path.write_bytes(data)
+            now = time.time()
+            self._index[url] = {
+                'digest': digest,
+                'size': len(data),
+                'etag': etag,
+                'last_modified': last_modified,
+                'ttl': ttl,
+                'fetched_at': now,
+                'accessed_at': now,
+            }
+            self._evict()
+            self._save_index()
+
+    def touch(self, url: str, ttl: Optional[float] = DEFAULT_TTL):
+        """Prolonge une entrée après une réponse 304 Not Modified"""
+        with self._lock:
+            entry = self._index.get(url)
+            if entry:
+                entry['fetched_at'] = entry['accessed_at'] = time.time()
+                entry['ttl'] = ttl
+                self._save_index()
+
+    def _evict(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de max_bytes"""
+        sizes = {e['digest']: e['size'] for e in self._index.values()}
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return
+
+        refcount = {}
+        for e in self._index.values():
+            refcount[e['digest']] = refcount.get(e['digest'], 0) + 1
+
+        for url, entry in sorted(self._index.items(), key=lambda item: item[1]['accessed_at']):
+            if total <= self.max_bytes:
+                break
+            del self._index[url]
+            refcount[entry['digest']] -= 1
+            if refcount[entry['digest']] == 0:
+                self._object_path(entry['digest']).unlink(missing_ok=True)
+                total -= entry['size']
+                logger.debug(f"Cache: éviction de {url}")
+
+    def flush(self):
+        """Persiste l'index (rangs LRU mis à jour par les lectures)"""
+        with self._lock:
+            self._save_index()
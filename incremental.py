@@ -0,0 +1,178 @@
+"""
+SCRAPING INCRÉMENTAL
+====================
+Ne récupère que les matchs nouveaux ou modifiés par rapport au fichier existant:
+- high-water mark (date la plus récente) par saison lu depuis le CSV
+- arrêt du parsing dès que l'on atteint une série de lignes déjà connues,
+  antérieures au high-water mark, si la table liste les matchs du plus récent
+  au plus ancien (ordre détecté sur les premières lignes; tri chronologique:
+  toute la table est lue, les lignes connues sont ignorées)
+- fusion (upsert) des nouveaux matchs dans le CSV sur la clé naturelle
+"""
+
+import os
+import logging
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Clé naturelle d'un match
+MATCH_KEY = ['season', 'date', 'home_team', 'away_team']
+# Nombre de lignes connues consécutives (antérieures au high-water mark) avant arrêt
+STOP_AFTER_KNOWN = 5
+NEWEST_FIRST = 'newest_first'
+OLDEST_FIRST = 'oldest_first'
+
+
+def load_existing(path: str) -> pd.DataFrame:
+    """Charge le CSV existant (DataFrame vide s'il n'existe pas)"""
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=MATCH_KEY)
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def parse_date(value) -> pd.Timestamp:
+    """Date de match en Timestamp (NaT si illisible)"""
+    return pd.to_datetime(value, errors='coerce')
+
+
+def date_order(first_date, later_date) -> Optional[str]:
+    """
+    Ordre d'une table d'après deux de ses dates (la première ligne, une ligne suivante)
+
+    Returns:
+        Optional[str]: NEWEST_FIRST, OLDEST_FIRST, ou None si indéterminé (dates égales ou illisibles)
+    """
+    first, later = parse_date(first_date), parse_date(later_date)
+    if pd.isna(first) or pd.isna(later) or first == later:
+        return None
+    return NEWEST_FIRST if later < first else OLDEST_FIRST
+
+
+class IncrementalFilter:
+    """Filtre les lignes scrapées pour ne garder que les matchs nouveaux ou modifiés"""
+
+    def __init__(self, existing: pd.DataFrame, stop_after: int = STOP_AFTER_KNOWN):
+        """
+        Args:
+            existing (pd.DataFrame): Matchs déjà stockés
+            stop_after (int): Lignes connues consécutives avant d'arrêter le parsing
+        """
+        self.stop_after = stop_after
+        self.known = {}
+        self.high_water_marks = {}
+        if existing.empty or not set(MATCH_KEY).issubset(existing.columns):
+            return
+
+        score = existing['score'] if 'score' in existing.columns else pd.Series('', index=existing.index)
+        keys = zip(*(existing[col].astype(str) for col in MATCH_KEY))
+        self.known = dict(zip(keys, score.astype(str)))
+
+        dates = parse_date(existing['date'])
+        self.high_water_marks = dates.groupby(existing['season']).max().dropna().to_dict()
+        for season, mark in self.high_water_marks.items():
+            logger.info(f"📌 Saison {season}: dernier match connu le {mark.date()}")
+
+    @classmethod
+    def from_csv(cls, path: str, **kwargs) -> 'IncrementalFilter':
+        return cls(load_existing(path), **kwargs)
+
+    def is_known(self, season: str, date: str, home_team: str, away_team: str) -> bool:
+        """True si la ligne est déjà stockée et antérieure au high-water mark de la saison"""
+        if (season, date, home_team, away_team) not in self.known:
+            return False
+        mark = self.high_water_marks.get(season)
+        row_date = parse_date(date)
+        return mark is not None and not pd.isna(row_date) and row_date <= mark
+
+    def is_settled(self, season: str, date: str, home_team: str, away_team: str) -> bool:
+        """
+        True si la ligne est connue et strictement antérieure au high-water mark:
+        dans une table du plus récent au plus ancien, toutes les lignes suivantes
+        sont alors connues (un match ajouté le jour du high-water mark peut
+        encore suivre une ligne connue de la même date)
+        """
+        mark = self.high_water_marks.get(season)
+        return self.is_known(season, date, home_team, away_team) and parse_date(date) < mark
+
+    def filter(self, rows: Iterable[Dict], season: str) -> Iterator[Dict]:
+        """
+        Génère les lignes nouvelles ou modifiées (score différent)
+
+        Si la table liste les matchs du plus récent au plus ancien (ordre lu sur
+        les deux premières dates différentes), la lecture de `rows` s'arrête
+        après `stop_after` lignes connues consécutives antérieures au
+        high-water mark: avec un générateur de parsing (mode streaming), le
+        reste de la table n'est même pas parsé. Dans une table chronologique,
+        les nouveaux matchs sont à la fin: toutes les lignes sont lues.
+        """
+        known_streak = 0
+        order = None
+        first_date = None
+        for row in rows:
+            key = (season, str(row.get('date', '')), str(row.get('home_team', '')), str(row.get('away_team', '')))
+            if order is None:
+                if first_date is None:
+                    first_date = key[1] if not pd.isna(parse_date(key[1])) else None
+                else:
+                    order = date_order(first_date, key[1])
+            stored_score = self.known.get(key)
+            if stored_score is not None and stored_score == str(row.get('score', '')) and self.is_known(*key):
+                if self.is_settled(*key):
+                    known_streak += 1
+                if order == NEWEST_FIRST and known_streak >= self.stop_after:
+                    logger.info(f"⏹️  Saison {season}: lignes déjà connues atteintes, arrêt du parsing")
+                    return
+                continue
+            known_streak = 0
+            yield row
+
+
+def merge_matches(existing: pd.DataFrame, new: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
+    """
+    Fusionne les nouveaux matchs (upsert sur MATCH_KEY)
+
+    Les lignes connues ne sont mises à jour que sur les colonnes fournies par le
+    scraper (un scraper HTTP sans xG n'efface pas les xG déjà stockés); les
+    lignes inconnues sont ajoutées à la fin.
+
+    Returns:
+        Tuple[pd.DataFrame, int]: (DataFrame fusionné, nombre de lignes ajoutées ou modifiées)
+    """
+    if new.empty:
+        return existing, 0
+    if existing.empty:
+        return new.reset_index(drop=True), len(new)
+
+    # Même représentation que load_existing (texte, '' pour les valeurs absentes)
+    new = new.astype(object).where(new.notna(), '').astype(str)
+    new = new.drop_duplicates(subset=MATCH_KEY, keep='last').set_index(MATCH_KEY)
+    merged = existing.astype(str).set_index(MATCH_KEY)
+
+    is_known = new.index.isin(merged.index)
+    updates = new[is_known]
+    for col in updates.columns:
+        if col not in merged.columns:
+            merged[col] = ''
+        values = updates[col][updates[col] != '']
+        merged.loc[values.index, col] = values
+
+    merged = pd.concat([merged, new[~is_known]]).reset_index()
+    columns = list(existing.columns) + [col for col in merged.columns if col not in existing.columns]
+    return merged[columns], len(new)
+
+
+def append_matches(path: str, new: pd.DataFrame) -> int:
+    """
+    Ajoute les matchs nouveaux/modifiés au CSV existant
+
+    Returns:
+        int: Nombre de lignes ajoutées ou modifiées
+    """
+    merged, changed = merge_matches(load_existing(path), new)
+    if changed:
+        merged.to_csv(path, index=False, encoding='utf-8')
+    logger.info(f"✅ {changed} match(s) nouveaux ou modifiés ajoutés à {path} ({len(merged)} au total)")
+    return changed
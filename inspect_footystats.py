@@ -5,13 +5,13 @@ Utilisé pour identifier les sélecteurs CSS exacts et la structure des données
 """
 
 import logging
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+from driver_pool import create_chrome_driver, profile_dir
+from selenium_waits import poll_interval, wait_for_rows_stable
+from html_parsing import make_soup
+import settings
 import json
 import time
 
@@ -19,34 +19,36 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
-def inspect_footystats_structure():
-    """Inspecte la structure HTML de FootyStats pour extraire les sélecteurs"""
+def inspect_footystats_structure(driver=None):
+    """
+    Inspecte la structure HTML de FootyStats pour extraire les sélecteurs
     
-    url = "https://footystats.org/morocco/botola-pro/matches"
+    Args:
+        driver: Driver déjà lancé (ex: emprunté à un DriverPool); sinon un
+            Chrome avec profil persistant est lancé puis fermé
+    """
+    
+    # Même source que les scrapers ([SCRAPER] BASE_URL, ex: mock_server.py en local)
+    url = f"{settings.base_url()}/matches"
     
     logger.info("🔍 Inspection de FootyStats.org...")
     logger.info(f"URL: {url}")
     
-    options = webdriver.ChromeOptions()
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64)")
-    
-    driver = webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()),
-        options=options
-    )
+    owns_driver = driver is None
+    if owns_driver:
+        driver = create_chrome_driver(headless=False, user_data_dir=profile_dir("inspect"))
     
     try:
         logger.info("⏳ Chargement de la page (attente Cloudflare)...")
         driver.get(url)
         
-        # Attend que les éléments se chargent
-        time.sleep(10)
-        WebDriverWait(driver, 20).until(
+        # Attend que les tables apparaissent (Cloudflare compris) puis que le rendu se stabilise
+        WebDriverWait(driver, 30, poll_frequency=poll_interval()).until(
             EC.presence_of_all_elements_located((By.TAG_NAME, "table"))
         )
+        wait_for_rows_stable(driver, "tr", timeout=10)
         
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
+        soup = make_soup(driver.page_source)
         
         # Inspecte la structure
         logger.info("\n" + "="*60)
@@ -115,14 +117,15 @@ def inspect_footystats_structure():
         return None
     
     finally:
-        driver.quit()
+        if owns_driver:
+            driver.quit()
 
 
 def manual_html_inspection():
     """Permet une inspection manuelle du HTML sauvegardé"""
     try:
         with open("footystats_structure.html", "r", encoding="utf-8") as f:
-            soup = BeautifulSoup(f.read(), 'html.parser')
+            soup = make_soup(f.read())
         
         logger.info("\n📖 Inspection du fichier HTML sauvegardé")
         
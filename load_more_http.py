@@ -0,0 +1,241 @@
+"""
+"VOIR PLUS" EN HTTP - Rejeu de l'endpoint paginé
+================================================
+Au lieu de cliquer sur `div.load_more a` jusqu'à épuisement (un rendu DOM
+complet par page), on:
+1. intercepte dans le navigateur la requête XHR/fetch déclenchée par deux clics,
+2. en déduit le paramètre de pagination (page ou offset) et son pas,
+3. copie les cookies de la session navigateur dans la session HTTP,
+4. télécharge les pages suivantes en parallèle (fragments seulement) et les fusionne.
+"""
+
+import json
+import logging
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse, parse_qsl, urlencode, urlunparse
+
+from botola_scraper_http import BotolaScraper
+from html_parsing import parse_match_rows, MATCHES_TABLE_CLASS
+from http_cache import season_ttl
+from selenium_waits import MATCH_ROWS_SELECTOR, count_elements, find_load_more, wait_for_more_rows
+
+logger = logging.getLogger(__name__)
+
+# Enregistre les URLs des requêtes XHR et fetch émises par la page
+XHR_HOOK_JS = """
+if (!window.__botolaRequests) {
+    window.__botolaRequests = [];
+    var open = XMLHttpRequest.prototype.open;
+    XMLHttpRequest.prototype.open = function(method, url) {
+        window.__botolaRequests.push(String(url));
+        return open.apply(this, arguments);
+    };
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function(input) {
+            window.__botolaRequests.push(typeof input === 'string' ? input : input.url);
+            return fetch.apply(this, arguments);
+        };
+    }
+}
+"""
+
+# Anti-cache ajouté par jQuery: ignoré pour la pagination et retiré des URLs rejouées
+CACHE_BUSTER_PARAMS = {'_'}
+
+XHR_HEADERS = {
+    'X-Requested-With': 'XMLHttpRequest',
+    'Accept': 'text/html, */*; q=0.01',
+    'Sec-Fetch-Dest': 'empty',
+    'Sec-Fetch-Mode': 'cors',
+    'Sec-Fetch-Site': 'same-origin',
+}
+
+
+def infer_pagination(first_url: str, second_url: str) -> Optional[Tuple[str, int, int]]:
+    """
+    Déduit le paramètre de pagination à partir de deux requêtes consécutives
+
+    Returns:
+        Optional[Tuple[str, int, int]]: (paramètre, valeur de la 2e requête, pas), ou None
+    """
+    first = _query(first_url)
+    second = _query(second_url)
+    if urlparse(first_url).path != urlparse(second_url).path:
+        return None
+
+    changed = [key for key in second if first.get(key) != second[key]]
+    if len(changed) != 1:
+        return None
+    param = changed[0]
+    try:
+        start, value = int(first[param]), int(second[param])
+    except (KeyError, ValueError):
+        return None
+    step = value - start
+    return (param, value, step) if step > 0 else None
+
+
+def _query(url: str) -> Dict[str, str]:
+    return {k: v for k, v in parse_qsl(urlparse(url).query) if k not in CACHE_BUSTER_PARAMS}
+
+
+def find_pagination(urls: List[str]) -> Optional[Tuple[str, str, int, int]]:
+    """
+    Cherche, en partant des plus récentes, deux requêtes qui ne diffèrent que par
+    un compteur (les requêtes d'analytics éventuelles sont ignorées)
+
+    Returns:
+        Optional[Tuple[str, str, int, int]]: (url modèle, paramètre, valeur, pas)
+    """
+    for j in range(len(urls) - 1, 0, -1):
+        for i in range(j - 1, -1, -1):
+            pagination = infer_pagination(urls[i], urls[j])
+            if pagination:
+                return (urls[j],) + pagination
+    return None
+
+
+def with_query_param(url: str, param: str, value) -> str:
+    """Remplace (ou ajoute) un paramètre de query string"""
+    parts = urlparse(url)
+    query = _query(url)
+    query[param] = str(value)
+    return urlunparse(parts._replace(query=urlencode(query)))
+
+
+def fragment_rows(body: str) -> List[Dict]:
+    """
+    Extrait les matchs d'un fragment "Voir plus" (HTML brut ou JSON contenant du HTML)
+    """
+    html = body
+    stripped = body.lstrip()
+    if stripped.startswith('{') or stripped.startswith('['):
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            payload = None
+        if payload is not None:
+            html = ''.join(_html_strings(payload))
+    if MATCHES_TABLE_CLASS not in html:
+        # Fragment de lignes seules: on le replace dans une table pour les sélecteurs
+        html = f'<table class="{MATCHES_TABLE_CLASS}"><tbody>{html}</tbody></table>'
+    return parse_match_rows(html)
+
+
+def _html_strings(payload) -> List[str]:
+    # Chaînes contenant des lignes de table, dans l'ordre du document JSON
+    if isinstance(payload, str):
+        return [payload] if '<tr' in payload else []
+    if isinstance(payload, dict):
+        payload = list(payload.values())
+    if isinstance(payload, list):
+        return [html for item in payload for html in _html_strings(item)]
+    return []
+
+
+class LoadMoreReplayer:
+    """Charge toutes les pages "Voir plus" d'une saison via HTTP plutôt que par clics"""
+
+    def __init__(self, http_scraper: BotolaScraper = None, max_pages: int = 200):
+        """
+        Args:
+            http_scraper (BotolaScraper): Scraper HTTP (session, pool, cache, rate limit)
+            max_pages (int): Garde-fou sur le nombre de pages demandées
+        """
+        self.http = http_scraper or BotolaScraper()
+        self.max_pages = max_pages
+
+    def _capture_requests(self, driver, clicks: int = 2) -> Tuple[List[str], int]:
+        """Clique sur "Voir plus" et retourne les URLs XHR émises et le nombre de clics"""
+        driver.execute_script(XHR_HOOK_JS)
+        done = 0
+        for _ in range(clicks):
+            button = find_load_more(driver)
+            if button is None:
+                break
+            before = count_elements(driver, MATCH_ROWS_SELECTOR)
+            driver.execute_script("arguments[0].scrollIntoView({block: 'center'}); arguments[0].click();", button)
+            wait_for_more_rows(driver, before)
+            done += 1
+        urls = driver.execute_script("return window.__botolaRequests || [];")
+        base = driver.current_url
+        return [urljoin(base, url) for url in urls], done
+
+    def _sync_session(self, driver):
+        """Copie cookies et User-Agent du navigateur dans la session HTTP"""
+        for cookie in driver.get_cookies():
+            self.http.session.cookies.set(cookie['name'], cookie['value'],
+                                          domain=cookie.get('domain'), path=cookie.get('path', '/'))
+        user_agent = driver.execute_script("return navigator.userAgent;")
+        return dict(XHR_HEADERS, **{'User-Agent': user_agent, 'Referer': driver.current_url})
+
+    def scrape(self, driver, season_name: str) -> Optional[List[Dict]]:
+        """
+        Récupère tous les matchs de la saison affichée dans le driver
+
+        Seul un fragment vide téléchargé avec succès termine la saison: une page
+        en échec (5xx, timeout) est redemandée une fois, puis la saison est
+        rendue à l'appelant plutôt que tronquée.
+
+        Returns:
+            Optional[List[Dict]]: Matchs fusionnés (sans doublons), ou None si
+            l'endpoint n'a pas pu être identifié ou si une page est restée en
+            échec (l'appelant revient aux clics)
+        """
+        requests_seen, clicks = self._capture_requests(driver)
+        dom_rows = parse_match_rows(driver.page_source)
+
+        if find_load_more(driver) is None:
+            # Moins de deux pages supplémentaires: tout est déjà dans le DOM
+            logger.info(f"Toutes les lignes chargées après {clicks} clic(s)")
+            return dom_rows
+
+        pagination = find_pagination(requests_seen)
+        if pagination is None:
+            logger.warning("Endpoint 'Voir plus' non identifié, retour au mode clics")
+            return None
+
+        template, param, value, step = pagination
+        headers = self._sync_session(driver)
+        ttl = season_ttl(season_name)
+        logger.info(f"Endpoint 'Voir plus': {urlparse(template).path} ({param} += {step})")
+
+        # Pages suivantes par lots parallèles, jusqu'à la première page vide
+        fetched_rows = []
+        pages = 0
+        done = False
+        while not done and pages < self.max_pages:
+            batch = [with_query_param(template, param, value + step * (pages + i + 1))
+                     for i in range(self.http.max_workers)]
+            bodies = self.http.fetch_html_pages(batch, ttl=ttl, headers=headers)
+            for url in batch:
+                body = bodies[url]
+                if body is None:
+                    # Échec de téléchargement: ce n'est pas la fin de la saison
+                    body = self.http.fetch_html(url, ttl=ttl, headers=headers)
+                    if body is None:
+                        logger.warning(f"Page 'Voir plus' en échec ({url}), retour au mode clics")
+                        return None
+                rows = fragment_rows(body)
+                if not rows:
+                    done = True
+                    break
+                fetched_rows.extend(rows)
+                pages += 1
+
+        logger.info(f"{len(dom_rows)} lignes du DOM + {len(fetched_rows)} lignes via HTTP ({pages} pages)")
+        return merge_rows(dom_rows, fetched_rows)
+
+
+def merge_rows(*row_lists: List[Dict]) -> List[Dict]:
+    """Concatène des listes de matchs en supprimant les doublons (date, domicile, extérieur)"""
+    seen = set()
+    merged = []
+    for rows in row_lists:
+        for row in rows:
+            key = (row['date'], row['home_team'], row['away_team'])
+            if key not in seen:
+                seen.add(key)
+                merged.append(row)
+    return merged
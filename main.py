@@ -39,6 +39,7 @@ def print_menu():
     print("│ [3] 📊 Analyser les données sauvegardées            │")
     print("│ [4] ⚙️  Configuration et dépendances                 │")
     print("│ [5] 🚀 Mode automatique (inspection + scraping)     │")
+    print("│ [6] 🔮 Prédire les prochains matchs                 │")
     print("│ [0] 🚪 Quitter                                       │")
     print("└" + "─" * 58 + "┘")
     print()
@@ -142,20 +143,26 @@ def analyze_data():
     
     import pandas as pd
     import glob
+    import storage
     
     # Cherche les fichiers CSV
     csv_files = glob.glob("botola_matches*.csv")
+    use_parquet = storage.HAS_PYARROW and storage.has_matches()
     
-    if not csv_files:
+    if not csv_files and not use_parquet:
         logger.warning("❌ Aucun fichier CSV trouvé")
         return False
     
-    # Utilise le plus récent
-    latest_file = max(csv_files, key=os.path.getctime)
-    logger.info(f"📖 Lecture de: {latest_file}")
-    
     try:
-        df = pd.read_csv(latest_file)
+        if use_parquet:
+            # Stockage typé (buts entiers, équipes catégorielles)
+            logger.info(f"📖 Lecture de: {storage.DEFAULT_ROOT}/ (Parquet)")
+            df = storage.load_matches()
+        else:
+            # Utilise le plus récent
+            latest_file = max(csv_files, key=os.path.getctime)
+            logger.info(f"📖 Lecture de: {latest_file}")
+            df = pd.read_csv(latest_file)
         
         logger.info(f"\n📈 STATISTIQUES:")
         logger.info(f"   Nombre de lignes: {len(df)}")
@@ -175,6 +182,15 @@ def analyze_data():
             logger.info(f"\n   Moyenne de buts domicile: {df['home_goals'].mean():.2f}")
             logger.info(f"   Moyenne de buts extérieur: {df['away_goals'].mean():.2f}")
         
+        # Classement de la dernière saison
+        if {'season', 'home_team', 'away_team'}.issubset(df.columns):
+            from standings import standings
+            latest_season = sorted(df['season'].astype(str).unique())[-1]
+            table = standings(df, season=latest_season)
+            if not table.empty:
+                logger.info(f"\n🏆 Classement {latest_season}:")
+                print(table.drop(columns='season').to_string(index=False))
+
         logger.info(f"\n✅ Aperçu des 5 premiers matchs:")
         print(df.head().to_string())
         
@@ -185,6 +201,33 @@ def analyze_data():
         return False
 
 
+def run_predictions():
+    """Prédit les matchs à venir (fichier de matchs ou matchs sans score de l'historique)"""
+    logger.info("\n" + "=" * 60)
+    logger.info("🔮 PRÉDICTIONS")
+    logger.info("=" * 60)
+
+    try:
+        import pandas as pd
+        from predict import get_predictor, predict_fixtures, print_predictions, unplayed_fixtures
+
+        path = input("Fichier de matchs (home_team, away_team) [Entrée = calendrier à venir]: ").strip()
+        fixtures = pd.read_csv(path) if path else unplayed_fixtures(get_predictor().history)
+        if fixtures.empty:
+            logger.warning("❌ Aucun match à prédire")
+            return False
+
+        predictions = predict_fixtures(fixtures)
+        print_predictions(predictions)
+        predictions.to_csv("predictions.csv", index=False, encoding='utf-8')
+        logger.info(f"\n✅ {len(predictions)} prédictions sauvegardées dans predictions.csv")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ Erreur lors de la prédiction: {e}")
+        return False
+
+
 def show_config():
     """Affiche la configuration du projet"""
     logger.info("\n" + "=" * 60)
@@ -235,7 +278,7 @@ def main_menu():
     
     while True:
         print_menu()
-        choice = input("Choisissez une option (0-5): ").strip()
+        choice = input("Choisissez une option (0-6): ").strip()
         
         print()
         
@@ -252,6 +295,8 @@ def main_menu():
             show_config()
         elif choice == '5':
             auto_mode()
+        elif choice == '6':
+            run_predictions()
         else:
             logger.warning("❌ Option invalide!")
         
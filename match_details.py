@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+DÉTAILS DES MATCHS - xG, tirs et possession
+===========================================
+Étape de détail après le scraping des pages de saison:
+- suit le lien `a.match-link` de chaque ligne (colonne match_url)
+- télécharge les pages de match en parallèle borné (pool du scraper HTTP,
+  cache disque, limiteur de débit adaptatif), parsées dès leur arrivée
+- lit le bloc de statistiques: xG, tirs (total), possession
+- remplit xg_home/xg_away, shots_home/shots_away, possession_home/possession_away
+Les pages des saisons terminées ne sont jamais re-téléchargées (cache sans
+expiration), seules les valeurs manquantes sont complétées.
+
+Usage:
+    python match_details.py [botola_matches_all_seasons.csv] [--workers 8]
+"""
+
+import re
+import sys
+import asyncio
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from urllib.parse import urljoin
+
+import numpy as np
+import pandas as pd
+
+import settings
+from html_parsing import make_soup
+from http_cache import season_ttl
+from metrics import timer, incr
+
+logger = logging.getLogger(__name__)
+
+# Colonnes (domicile, extérieur) remplies par statistique
+STAT_COLUMNS = {
+    'xg': ('xg_home', 'xg_away'),
+    'shots': ('shots_home', 'shots_away'),
+    'possession': ('possession_home', 'possession_away'),
+}
+
+# Libellés du bloc de statistiques ("Shots on Target", "Shots off Target"... exclus)
+STAT_LABELS = {
+    'xg': re.compile(r'\b(?:xG|Expected Goals)\b', re.IGNORECASE),
+    'shots': re.compile(r'\b(?:Total\s+)?Shots\b(?!\s+(?:on|off|blocked|inside|outside))', re.IGNORECASE),
+    'possession': re.compile(r'\b(?:Ball\s+)?Possession\b', re.IGNORECASE),
+}
+NUMBER_PATTERN = re.compile(r'(?<![\w.])(\d+(?:[.,]\d+)?)\s*%?')
+
+# Conteneurs possibles du bloc de statistiques (page entière à défaut)
+STAT_BLOCK_SELECTOR = "div.stat-group, div.match-stats, table.stats-table, div.stats-table"
+# Éléments candidats: une ligne de statistique ("55% Possession 45%")
+STAT_ELEMENTS = ['tr', 'li', 'div', 'p', 'dl']
+# Une ligne de statistique est courte: les conteneurs plus longs sont ignorés
+MAX_STAT_TEXT = 80
+
+
+def _convert(stat: str, value: str) -> Optional[float]:
+    number = float(value.replace(',', '.'))
+    if stat == 'possession' and not 0 <= number <= 100:
+        return None
+    return number if stat == 'xg' else round(number)
+
+
+def parse_match_stats(html: str) -> Dict[str, float]:
+    """
+    Extrait xG, tirs et possession d'une page de match
+
+    Une ligne de statistique est l'élément le plus haut du document dont le
+    texte court contient le libellé et exactement deux nombres (domicile,
+    puis extérieur), quelle que soit la position du libellé.
+
+    Returns:
+        Dict[str, float]: Colonnes trouvées parmi xg_home, xg_away, shots_home, ...
+    """
+    soup = make_soup(html)
+    blocks = soup.select(STAT_BLOCK_SELECTOR) or [soup]
+    found = {}
+    for block in blocks:
+        for element in block.find_all(STAT_ELEMENTS):
+            text = element.get_text(' ', strip=True)
+            if not text or len(text) > MAX_STAT_TEXT:
+                continue
+            for stat, label in STAT_LABELS.items():
+                if stat in found or not label.search(text):
+                    continue
+                numbers = NUMBER_PATTERN.findall(label.sub(' ', text))
+                if len(numbers) == 2:
+                    home, away = (_convert(stat, number) for number in numbers)
+                    if home is not None and away is not None:
+                        found[stat] = (home, away)
+            if len(found) == len(STAT_LABELS):
+                break
+
+    stats = {}
+    for stat, (home, away) in found.items():
+        home_col, away_col = STAT_COLUMNS[stat]
+        stats[home_col], stats[away_col] = home, away
+    return stats
+
+
+def _missing_rows(df: pd.DataFrame) -> pd.Series:
+    """Lignes avec un lien de match et au moins une statistique manquante"""
+    columns = [col for pair in STAT_COLUMNS.values() for col in pair]
+    values = df.reindex(columns=columns).replace('', np.nan)
+    return df['match_url'].notna() & (df['match_url'] != '') & values.isna().any(axis=1)
+
+
+def _prepare(df: pd.DataFrame, only_missing: bool, base_url: str):
+    """
+    Colonnes de statistiques numériques, lignes à visiter et URLs absolues uniques
+
+    Returns:
+        (df, targets, jobs): copie typée, masque des lignes, {url: ttl du cache}
+    """
+    df = df.copy()
+    for home_col, away_col in STAT_COLUMNS.values():
+        for col in (home_col, away_col):
+            if col not in df.columns:
+                df[col] = np.nan
+            df[col] = pd.to_numeric(df[col].replace('', np.nan), errors='coerce')
+    if 'match_url' not in df.columns:
+        logger.warning("⚠️ Pas de colonne match_url: détails des matchs ignorés")
+        return df, pd.Series(False, index=df.index), {}
+
+    targets = _missing_rows(df) if only_missing else df['match_url'].notna()
+    seasons = df['season'].astype(str) if 'season' in df.columns else pd.Series('', index=df.index)
+    # Une URL peut apparaître plusieurs fois (doublons de saisons): un seul téléchargement
+    jobs: Dict[str, Optional[float]] = {}
+    for index in df.index[targets]:
+        url = urljoin(base_url, str(df.at[index, 'match_url']))
+        jobs.setdefault(url, season_ttl(seasons.at[index]) if seasons.at[index] else None)
+    return df, targets, jobs
+
+
+def add_match_details(df: pd.DataFrame, scraper=None, base_url: str = None,
+                      max_workers: int = None, only_missing: bool = True) -> pd.DataFrame:
+    """
+    Complète les colonnes de statistiques à partir des pages de match, en un passage parallèle
+
+    Args:
+        df (pd.DataFrame): Matchs avec une colonne match_url (lien de `a.match-link`)
+        scraper: botola_scraper_http.BotolaScraper (session, cache, limiteur); créé si absent
+        base_url (str): Base des liens relatifs (racine de [SCRAPER] BASE_URL par défaut)
+        max_workers (int): Pages téléchargées simultanément (max_workers du scraper par défaut)
+        only_missing (bool): Ne visite que les matchs dont une statistique manque
+
+    Returns:
+        pd.DataFrame: Copie de df avec les colonnes de statistiques remplies
+    """
+    base_url = base_url or settings.site_root()
+    df, targets, jobs = _prepare(df, only_missing, base_url)
+    if not jobs:
+        return df
+
+    if scraper is None:
+        from botola_scraper_http import BotolaScraper
+        scraper = BotolaScraper()
+    workers = max_workers or scraper.max_workers
+
+    def fetch_and_parse(url: str) -> Dict[str, float]:
+        html = scraper.fetch_html(url, ttl=jobs[url])
+        if html is None:
+            return {}
+        with timer('parse'):
+            return parse_match_stats(html)
+
+    logger.info(f"🔎 Détails de {len(jobs)} match(s), {workers} téléchargements simultanés")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        details = dict(zip(jobs, executor.map(fetch_and_parse, jobs)))
+    if scraper.cache:
+        scraper.cache.flush()
+    return _fill(df, targets, base_url, details)
+
+
+def _fill(df: pd.DataFrame, targets: pd.Series, base_url: str, details: Dict[str, Dict]) -> pd.DataFrame:
+    """Reporte les statistiques parsées dans les cellules encore vides"""
+    urls = df.loc[targets, 'match_url'].astype(str).map(lambda link: urljoin(base_url, link))
+    parsed = pd.DataFrame.from_records([details.get(url, {}) for url in urls], index=urls.index)
+    filled = 0
+    for col in parsed.columns:
+        df[col] = df[col].fillna(parsed[col])
+        filled += int(parsed[col].notna().sum())
+    complete = int(parsed.notna().all(axis=1).sum()) if not parsed.empty else 0
+    incr('rows_detailed', complete)
+    logger.info(f"✅ Statistiques: {complete}/{len(urls)} matchs complets ({filled} valeurs)")
+    return df
+
+
+async def add_match_details_async(df: pd.DataFrame, scraper, base_url: str = None,
+                                  only_missing: bool = True) -> pd.DataFrame:
+    """
+    Variante asynchrone d'add_match_details pour botola_scraper_async.AsyncBotolaScraper
+    (client déjà ouvert): téléchargements sous le sémaphore du scraper, parsing dans son pool
+    """
+    base_url = base_url or settings.site_root()
+    df, targets, jobs = _prepare(df, only_missing, base_url)
+    if not jobs:
+        return df
+
+    async def fetch_and_parse(url: str) -> Dict[str, float]:
+        html = await scraper.fetch_html(url, ttl=jobs[url])
+        return await scraper.parse(parse_match_stats, html) if html is not None else {}
+
+    logger.info(f"🔎 Détails de {len(jobs)} match(s) (asynchrone)")
+    results = await asyncio.gather(*(fetch_and_parse(url) for url in jobs))
+    return _fill(df, targets, base_url, dict(zip(jobs, results)))
+
+
+def details_enabled() -> bool:
+    """True si les scrapers HTTP complètent les statistiques ([SCRAPER] MATCH_DETAILS)"""
+    return settings.get_bool('SCRAPER', 'MATCH_DETAILS', False)
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Complète xG, tirs et possession depuis les pages de match")
+    parser.add_argument('csv', nargs='?', default='botola_matches_all_seasons.csv')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--all', action='store_true', help="Revisite aussi les matchs déjà complets")
+    args = parser.parse_args(argv)
+
+    from storage import export_csv, parquet_enabled
+    from match_store import sync_csv
+
+    df = pd.read_csv(args.csv)
+    enriched = add_match_details(df, max_workers=args.workers, only_missing=not args.all)
+    with timer('save'):
+        enriched.to_csv(args.csv, index=False, encoding='utf-8')
+        if parquet_enabled():
+            export_csv(args.csv)
+        sync_csv(args.csv)
+    logger.info(f"✅ {args.csv} mis à jour")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,245 @@
+"""
+BASE DE MATCHS SQLITE
+=====================
+Stockage indexé des matchs pour les requêtes par équipe / saison / date:
+- clé naturelle (season, date, home_team, away_team)
+- index sur les équipes, la saison et la date (recherches par index, pas de scan)
+- upsert depuis n'importe quel scraper (les colonnes absentes ne sont pas effacées)
+- requêtes retournant des DataFrames
+"""
+
+import sys
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = Path(settings.get_str('DATA', 'OUTPUT_DIR', fallback='data')) / 'matches.db'
+
+MATCH_KEY = ['season', 'date', 'home_team', 'away_team']
+# Colonnes stockées et leur type SQLite
+COLUMNS = {
+    'season': 'TEXT NOT NULL',
+    'date': 'TEXT NOT NULL',
+    'time': 'TEXT',
+    'home_team': 'TEXT NOT NULL',
+    'away_team': 'TEXT NOT NULL',
+    'score': 'TEXT',
+    'home_goals': 'INTEGER',
+    'away_goals': 'INTEGER',
+    'xg_home': 'REAL',
+    'xg_away': 'REAL',
+    'shots_home': 'INTEGER',
+    'shots_away': 'INTEGER',
+    'possession_home': 'INTEGER',
+    'possession_away': 'INTEGER',
+    'match_url': 'TEXT',
+}
+VALUE_COLUMNS = [col for col in COLUMNS if col not in MATCH_KEY]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS matches (
+    {', '.join(f'{col} {sql_type}' for col, sql_type in COLUMNS.items())},
+    PRIMARY KEY ({', '.join(MATCH_KEY)})
+);
+CREATE INDEX IF NOT EXISTS idx_matches_home ON matches (home_team, date);
+CREATE INDEX IF NOT EXISTS idx_matches_away ON matches (away_team, date);
+CREATE INDEX IF NOT EXISTS idx_matches_date ON matches (date);
+"""
+
+# Upsert: une valeur NULL (colonne absente ou vide côté scraper) conserve la valeur stockée
+UPSERT_SQL = f"""
+INSERT INTO matches ({', '.join(COLUMNS)})
+VALUES ({', '.join('?' for _ in COLUMNS)})
+ON CONFLICT ({', '.join(MATCH_KEY)}) DO UPDATE SET
+    {', '.join(f'{col} = COALESCE(excluded.{col}, {col})' for col in VALUE_COLUMNS)}
+"""
+
+SCORE_PATTERN = r'^\s*(\d+)\s*-\s*(\d+)\s*$'
+
+
+def _to_records(df: pd.DataFrame) -> List[tuple]:
+    """Convertit un DataFrame de scraper en tuples SQLite (None pour les valeurs absentes)"""
+    df = df.copy()
+    for col in COLUMNS:
+        if col not in df.columns:
+            df[col] = None
+    df = df.replace('', np.nan)
+
+    # Dates ISO pour que l'ordre lexicographique de l'index soit chronologique
+    dates = pd.to_datetime(df['date'], errors='coerce')
+    df['date'] = dates.dt.strftime('%Y-%m-%d').where(dates.notna(), df['date'].astype(str))
+
+    goals = df['score'].astype('string').str.extract(SCORE_PATTERN)
+    df['home_goals'] = df['home_goals'].fillna(goals[0])
+    df['away_goals'] = df['away_goals'].fillna(goals[1])
+    for col, sql_type in COLUMNS.items():
+        if sql_type in ('INTEGER', 'REAL'):
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+            if sql_type == 'INTEGER':
+                df[col] = df[col].round().astype('Int64')
+
+    df = df.dropna(subset=MATCH_KEY)
+    values = df[list(COLUMNS)].astype(object).where(df[list(COLUMNS)].notna(), None)
+    return [tuple(row) for row in values.itertuples(index=False, name=None)]
+
+
+class MatchStore:
+    """Matchs dans une base SQLite indexée"""
+
+    def __init__(self, path: str = None):
+        """
+        Args:
+            path (str): Fichier SQLite (':memory:' pour une base temporaire)
+        """
+        self.path = str(path or DEFAULT_PATH)
+        if self.path != ':memory:':
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._add_missing_columns()
+        self._lock = threading.Lock()
+
+    def _add_missing_columns(self):
+        """Ajoute aux bases existantes les colonnes apparues depuis leur création (ex: match_url)"""
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(matches)")}
+        for col in VALUE_COLUMNS:
+            if col not in existing:
+                self._conn.execute(f"ALTER TABLE matches ADD COLUMN {col} {COLUMNS[col]}")
+                logger.info(f"🔧 Colonne {col} ajoutée à {self.path}")
+        self._conn.commit()
+
+    def upsert(self, df: pd.DataFrame) -> int:
+        """
+        Insère ou met à jour des matchs (DataFrame de n'importe quel scraper)
+
+        Returns:
+            int: Nombre de lignes écrites
+        """
+        records = _to_records(df)
+        with self._lock, self._conn:
+            self._conn.executemany(UPSERT_SQL, records)
+        logger.info(f"✅ {len(records)} match(s) enregistrés dans {self.path}")
+        return len(records)
+
+    def import_csv(self, csv_path: str) -> int:
+        """Importe un CSV de scraping"""
+        return self.upsert(pd.read_csv(csv_path, dtype=str, keep_default_na=False))
+
+    def query(self, where: str = '', params: tuple = (), columns: List[str] = None) -> pd.DataFrame:
+        """
+        Requête libre sur la table matches
+
+        Args:
+            where (str): Clause WHERE/ORDER BY (paramètres '?')
+            params (tuple): Valeurs des paramètres
+            columns (List[str]): Colonnes à lire (toutes par défaut)
+        """
+        sql = f"SELECT {', '.join(columns or COLUMNS)} FROM matches {where}"
+        with self._lock:
+            df = pd.read_sql_query(sql, self._conn, params=params)
+        if 'date' in df.columns:
+            df['date'] = pd.to_datetime(df['date'], errors='coerce')
+        return df
+
+    def team_matches(self, team: str, season: str = None, venue: str = None) -> pd.DataFrame:
+        """
+        Matchs d'une équipe (deux recherches par index réunies)
+
+        Args:
+            team (str): Nom de l'équipe
+            season (str): Saison (toutes par défaut)
+            venue (str): 'home', 'away' ou None pour les deux
+        """
+        parts, params = [], []
+        for side in ('home', 'away'):
+            if venue in (None, side):
+                clause = f"SELECT * FROM matches WHERE {side}_team = ?"
+                params.append(team)
+                if season:
+                    clause += " AND season = ?"
+                    params.append(season)
+                parts.append(clause)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM ({' UNION ALL '.join(parts)}) ORDER BY date"
+        with self._lock:
+            df = pd.read_sql_query(sql, self._conn, params=params)
+        df['date'] = pd.to_datetime(df['date'], errors='coerce')
+        return df
+
+    def head_to_head(self, team_a: str, team_b: str) -> pd.DataFrame:
+        """Confrontations directes entre deux équipes (les deux sens)"""
+        return self.query(
+            "WHERE (home_team = ? AND away_team = ?) OR (home_team = ? AND away_team = ?) ORDER BY date",
+            (team_a, team_b, team_b, team_a),
+        )
+
+    def season(self, season: str) -> pd.DataFrame:
+        """Matchs d'une saison"""
+        return self.query("WHERE season = ? ORDER BY date", (season,))
+
+    def between(self, start: str, end: str) -> pd.DataFrame:
+        """Matchs joués entre deux dates incluses (YYYY-MM-DD)"""
+        return self.query("WHERE date BETWEEN ? AND ? ORDER BY date", (start, end))
+
+    def teams(self, season: str = None) -> List[str]:
+        """Liste des équipes (lue depuis les index)"""
+        sql = "SELECT home_team FROM matches {w} UNION SELECT away_team FROM matches {w} ORDER BY 1"
+        where = "WHERE season = ?" if season else ""
+        params = (season, season) if season else ()
+        with self._lock:
+            return [row[0] for row in self._conn.execute(sql.format(w=where), params)]
+
+    def seasons(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT DISTINCT season FROM matches ORDER BY 1")]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
+
+    def explain(self, where: str, params: tuple = ()) -> List[str]:
+        """Plan d'exécution SQLite d'une requête (vérifie l'usage des index)"""
+        with self._lock:
+            rows = self._conn.execute(f"EXPLAIN QUERY PLAN SELECT * FROM matches {where}", params)
+            return [row[-1] for row in rows]
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def store_path() -> Optional[str]:
+    """Base SQLite configurée ([DATA] SQLITE_DB), ou None si désactivée"""
+    path = settings.get_str('DATA', 'SQLITE_DB', fallback='').strip()
+    return path or None
+
+
+def sync_csv(csv_path: str) -> Optional[int]:
+    """Importe un CSV dans la base configurée (rien si [DATA] SQLITE_DB est vide)"""
+    path = store_path()
+    if not path:
+        return None
+    with MatchStore(path) as store:
+        return store.import_csv(csv_path)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    csv_file = sys.argv[1] if len(sys.argv) > 1 else 'botola_matches.csv'
+    with MatchStore(store_path()) as store:
+        store.import_csv(csv_file)
+        logger.info(f"📊 {store.count()} matchs, saisons: {store.seasons()}")
@@ -0,0 +1,175 @@
+"""
+MÉTRIQUES DU SCRAPING - Chronomètres et compteurs par étape
+===========================================================
+Instrumentation légère du pipeline (fetch, wait, parse, extract, save):
+- with timer('fetch'): ...      temps cumulé, nombre d'appels, maximum par étape
+- incr('bytes_downloaded', n)  compteurs (requêtes, octets, lignes, reprises, ...)
+- @reported('http')            remet à zéro au début d'une exécution et écrit
+                               le rapport à la fin (même en cas d'erreur)
+Le rapport est écrit dans [METRICS] DIR (logs/ par défaut):
+    metrics_<run>.json   (durées, parts du temps total, lignes/s, octets/s)
+    metrics_<run>.prom   (format texte Prometheus, collecteur textfile)
+Les étapes exécutées dans des threads se cumulent: leur total peut dépasser
+la durée de l'exécution.
+"""
+
+import os
+import json
+import time
+import functools
+import threading
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import settings
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('fetch', 'wait', 'parse', 'extract', 'save')
+COUNTERS = ('requests', 'bytes_downloaded', 'rows', 'retries', 'cache_hits', 'http_errors')
+PROMETHEUS_PREFIX = 'botola_scrape'
+
+
+class Metrics:
+    """Chronomètres et compteurs partagés entre les threads d'une exécution"""
+
+    def __init__(self, run: str = 'scrape'):
+        self._lock = threading.Lock()
+        self.reset(run)
+
+    def reset(self, run: str = None):
+        """Remet tout à zéro (début d'une exécution)"""
+        with self._lock:
+            self.run = run or getattr(self, 'run', 'scrape')
+            self.started_at = datetime.now()
+            self._start = time.perf_counter()
+            self.stages: Dict[str, Dict[str, float]] = {}
+            self.counters: Dict[str, float] = dict.fromkeys(COUNTERS, 0)
+
+    def observe(self, stage: str, seconds: float):
+        """Ajoute une durée à une étape"""
+        with self._lock:
+            stats = self.stages.setdefault(stage, {'count': 0, 'seconds': 0.0, 'max_seconds': 0.0})
+            stats['count'] += 1
+            stats['seconds'] += seconds
+            stats['max_seconds'] = max(stats['max_seconds'], seconds)
+
+    @contextmanager
+    def timer(self, stage: str):
+        """Chronomètre le bloc et l'ajoute à l'étape (aussi en cas d'exception)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def incr(self, name: str, value: float = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def report(self) -> Dict:
+        """
+        Rapport de l'exécution
+
+        Returns:
+            Dict: run, started_at, wall_seconds, stages (count, seconds, max_seconds,
+            share), counters, rows_per_s, bytes_per_s
+        """
+        with self._lock:
+            wall = time.perf_counter() - self._start
+            stages = {name: dict(stats, share=stats['seconds'] / wall if wall else 0.0)
+                      for name, stats in self.stages.items()}
+            counters = dict(self.counters)
+        return {
+            'run': self.run,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'wall_seconds': wall,
+            'stages': stages,
+            'counters': counters,
+            'rows_per_s': counters.get('rows', 0) / wall if wall else 0.0,
+            'bytes_per_s': counters.get('bytes_downloaded', 0) / wall if wall else 0.0,
+        }
+
+    def to_prometheus(self, report: Dict = None) -> str:
+        """Rapport au format texte Prometheus"""
+        report = report or self.report()
+        label = f'run="{report["run"]}"'
+        lines = [
+            f"# HELP {PROMETHEUS_PREFIX}_stage_seconds_total Temps cumulé par étape",
+            f"# TYPE {PROMETHEUS_PREFIX}_stage_seconds_total counter",
+        ]
+        lines += [f'{PROMETHEUS_PREFIX}_stage_seconds_total{{{label},stage="{name}"}} {stats["seconds"]:.6f}'
+                  for name, stats in report['stages'].items()]
+        lines += [f"# HELP {PROMETHEUS_PREFIX}_stage_calls_total Nombre de passages par étape",
+                  f"# TYPE {PROMETHEUS_PREFIX}_stage_calls_total counter"]
+        lines += [f'{PROMETHEUS_PREFIX}_stage_calls_total{{{label},stage="{name}"}} {stats["count"]}'
+                  for name, stats in report['stages'].items()]
+        for name, value in report['counters'].items():
+            lines += [f"# TYPE {PROMETHEUS_PREFIX}_{name}_total counter",
+                      f"{PROMETHEUS_PREFIX}_{name}_total{{{label}}} {value:g}"]
+        for name in ('wall_seconds', 'rows_per_s', 'bytes_per_s'):
+            lines += [f"# TYPE {PROMETHEUS_PREFIX}_{name} gauge",
+                      f"{PROMETHEUS_PREFIX}_{name}{{{label}}} {report[name]:.6f}"]
+        return '\n'.join(lines) + '\n'
+
+    def write(self, directory: str = None) -> Optional[Tuple[str, str]]:
+        """
+        Écrit le rapport JSON et Prometheus (erreurs journalisées, jamais levées)
+
+        Returns:
+            Optional[Tuple[str, str]]: (fichier JSON, fichier .prom), None si désactivé ou en échec
+        """
+        if not settings.get_bool('METRICS', 'ENABLED', True):
+            return None
+        directory = directory or settings.get_str('METRICS', 'DIR', 'logs')
+        report = self.report()
+        json_path = os.path.join(directory, f"metrics_{self.run}.json")
+        prom_path = os.path.join(directory, f"metrics_{self.run}.prom")
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            with open(prom_path, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus(report))
+        except OSError as e:
+            logger.warning(f"⚠️ Métriques non sauvegardées: {e}")
+            return None
+
+        summary = ', '.join(f"{name} {stats['seconds']:.1f}s" for name, stats in report['stages'].items())
+        logger.info(f"⏱️  {report['wall_seconds']:.1f}s au total ({summary}), "
+                    f"{report['counters'].get('rows', 0):g} lignes, {report['rows_per_s']:.1f} lignes/s")
+        logger.info(f"📈 Métriques sauvegardées dans {json_path}")
+        return json_path, prom_path
+
+
+# Registre partagé par tous les modules du scraping
+METRICS = Metrics()
+
+
+def timer(stage: str):
+    """Chronomètre un bloc dans le registre partagé (voir Metrics.timer)"""
+    return METRICS.timer(stage)
+
+
+def incr(name: str, value: float = 1):
+    METRICS.incr(name, value)
+
+
+def write_report(directory: str = None):
+    return METRICS.write(directory)
+
+
+def reported(run: str):
+    """Décorateur d'un point d'entrée: métriques remises à zéro au début, rapport écrit à la fin"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            METRICS.reset(run)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                write_report()
+        return wrapper
+    return decorator
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+SERVEUR FOOTYSTATS LOCAL - Tests de débit hors ligne
+====================================================
+Remplaçant HTTP local de footystats.org pour mesurer concurrence, cache et
+reprises des scrapers de façon déterministe:
+- /<ligue>/matches?season_id=N : page de saison (fichier enregistré
+  benchmarks/fixtures/season_<N>.html s'il existe, sinon page synthétique)
+- /ajax/load_more_matches?season_id=N&page=P : fragments "Voir plus"
+  (lignes <tr> seules, vide après la dernière page); le bouton de la page
+  synthétique émet ces requêtes XHR comme le site réel
+- latence, délai de type Cloudflare à la première visite (cookie
+  cf_clearance), réponses 429 avec Retry-After (aléatoires et/ou au-delà
+  d'un débit maximal), ETag / If-None-Match -> 304
+- /morocco/match-<season_id>-<i> : page de match avec bloc de statistiques
+  (xG, tirs, tirs cadrés, possession) pour match_details.py
+- /__stats : compteurs de requêtes (JSON)
+Toutes les décisions aléatoires viennent d'une graine: deux exécutions avec
+les mêmes paramètres et la même suite de requêtes se comportent pareil.
+
+Pour y diriger les scrapers, dans config.ini:
+    [SCRAPER]
+    BASE_URL = http://127.0.0.1:8765/morocco/botola-pro
+
+Usage:
+    python mock_server.py [--port 8765] [--rows 240] [--page-size 50] [--latency 0.05]
+                          [--p429 0.05] [--max-rps 20] [--challenge-delay 2] [--seed 0]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import zlib
+import hashlib
+import logging
+import argparse
+import threading
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+
+from benchmark_parsing import build_match_rows, wrap_matches_page
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8765
+LEAGUE_PATH = '/morocco/botola-pro'
+LOAD_MORE_PATH = '/ajax/load_more_matches'
+STATS_PATH = '/__stats'
+MATCH_PATH_PREFIX = '/morocco/match-'
+DEFAULT_FIXTURES_DIR = os.path.join('benchmarks', 'fixtures')
+CLEARANCE_COOKIE = 'cf_clearance'
+
+# Bouton "Voir plus" de la page synthétique: même mécanique XHR que le site réel
+LOAD_MORE_JS = """<script>
+document.addEventListener('click', function(event) {
+    var link = event.target.closest('div.load_more a');
+    if (!link) return;
+    event.preventDefault();
+    window.__page = (window.__page || 1) + 1;
+    var xhr = new XMLHttpRequest();
+    xhr.open('GET', '%(path)s?season_id=%(season_id)s&page=' + window.__page);
+    xhr.onload = function() {
+        if (!xhr.responseText.trim()) { document.querySelector('div.load_more').remove(); return; }
+        document.querySelector('table.matches-table tbody').insertAdjacentHTML('beforeend', xhr.responseText);
+    };
+    xhr.send();
+});
+</script>"""
+
+
+class MockFootyStats(ThreadingHTTPServer):
+    """Serveur HTTP multi-thread qui sert les pages de saison et les fragments "Voir plus" """
+
+    daemon_threads = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = DEFAULT_PORT, rows: int = 240,
+                 page_size: int = 50, latency: float = 0.0, jitter: float = 0.0, p429: float = 0.0,
+                 max_rps: float = None, retry_after: float = 1.0, challenge_delay: float = 0.0,
+                 fixtures_dir: str = DEFAULT_FIXTURES_DIR, seed: int = 0):
+        """
+        Args:
+            rows (int): Lignes d'une saison synthétique
+            page_size (int): Lignes de la page initiale et de chaque fragment "Voir plus"
+            latency (float): Latence ajoutée à chaque réponse (secondes)
+            jitter (float): Variation aléatoire de la latence (+/- secondes)
+            p429 (float): Probabilité de répondre 429 à une requête
+            max_rps (float): Débit maximal (requêtes/s sur une fenêtre d'une seconde), None = illimité
+            retry_after (float): Valeur de l'en-tête Retry-After des réponses 429
+            challenge_delay (float): Délai de la première visite sans cookie cf_clearance
+            fixtures_dir (str): Répertoire des pages enregistrées (season_<id>.html, season_<id>_page_<n>.html)
+            seed (int): Graine des décisions aléatoires et des saisons synthétiques
+        """
+        super().__init__((host, port), MockHandler)
+        self.rows = rows
+        self.page_size = page_size
+        self.latency = latency
+        self.jitter = jitter
+        self.p429 = p429
+        self.max_rps = max_rps
+        self.retry_after = retry_after
+        self.challenge_delay = challenge_delay
+        self.fixtures_dir = fixtures_dir
+        self.seed = seed
+        self.stats = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._recent = deque()
+        self._seasons: Dict[str, List[str]] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Valeur de [SCRAPER] BASE_URL pointant vers ce serveur"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{LEAGUE_PATH}"
+
+    def season_rows(self, season_id: str) -> List[str]:
+        """Lignes synthétiques d'une saison (générées une fois, reproductibles par season_id)"""
+        with self._lock:
+            if season_id not in self._seasons:
+                seed = self.seed * 100003 + zlib.crc32(season_id.encode('utf-8'))
+                self._seasons[season_id] = build_match_rows(self.rows, seed=seed,
+                                                            link_prefix=f'match-{season_id}')
+            return self._seasons[season_id]
+
+    def match_page(self, path: str) -> str:
+        """Page de match synthétique, reproductible par chemin"""
+        rng = random.Random(self.seed * 100003 + zlib.crc32(path.encode('utf-8')))
+        shots = (rng.randint(4, 22), rng.randint(4, 22))
+        on_target = tuple(rng.randint(1, total) for total in shots)
+        possession = rng.randint(30, 70)
+        stats = [
+            ('xG', f"{rng.uniform(0.2, 3.0):.2f}", f"{rng.uniform(0.2, 3.0):.2f}"),
+            ('Shots', shots[0], shots[1]),
+            ('Shots on Target', on_target[0], on_target[1]),
+            ('Possession', f"{possession}%", f"{100 - possession}%"),
+        ]
+        rows = ''.join(f'<div class="stat-row"><span class="home">{home}</span>'
+                       f'<span class="label">{label}</span><span class="away">{away}</span></div>'
+                       for label, home, away in stats)
+        return (f'<html><head><title>Match (local)</title></head><body>'
+                f'<div class="match-header">{path}</div>'
+                f'<div class="stat-group">{rows}</div></body></html>')
+
+    def recorded(self, name: str) -> Optional[str]:
+        """Contenu d'une page enregistrée du répertoire de fixtures, ou None"""
+        path = os.path.join(self.fixtures_dir, name)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        """Copie des compteurs de requêtes"""
+        with self._lock:
+            return dict(self.stats)
+
+    def decide(self) -> Dict:
+        """Délai et éventuelle réponse 429 de la requête suivante (tirés sous verrou, dans l'ordre d'arrivée)"""
+        with self._lock:
+            now = time.monotonic()
+            self._recent.append(now)
+            while self._recent and self._recent[0] <= now - 1.0:
+                self._recent.popleft()
+            throttled = self.max_rps is not None and len(self._recent) > self.max_rps
+            throttled = self._rng.random() < self.p429 or throttled
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+        return {'throttled': throttled, 'delay': delay}
+
+    def start(self) -> 'MockFootyStats':
+        """Démarre le serveur dans un thread d'arrière-plan"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"🧪 Serveur FootyStats local: {self.base_url}")
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """Routage des requêtes du serveur MockFootyStats"""
+
+    server: MockFootyStats
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        server.count('requests')
+
+        if url.path == STATS_PATH:
+            return self._send(200, json.dumps(server.snapshot()), 'application/json')
+
+        decision = server.decide()
+        if decision['throttled']:
+            server.count('429')
+            return self._send(429, 'Too Many Requests', headers={'Retry-After': f"{server.retry_after:g}"})
+
+        delay = decision['delay']
+        cookie_header = self.headers.get('Cookie') or ''
+        set_cookie = None
+        if server.challenge_delay and CLEARANCE_COOKIE not in cookie_header:
+            # Première visite: attente de type "Checking your browser", puis cookie de passage
+            server.count('challenges')
+            delay += server.challenge_delay
+            set_cookie = f"{CLEARANCE_COOKIE}=mock-{server.seed}; Path=/"
+        if delay:
+            time.sleep(delay)
+
+        body = self._route(url.path, query)
+        if body is None:
+            server.count('404')
+            return self._send(404, 'Not Found')
+
+        etag = '"' + hashlib.sha1(body.encode('utf-8')).hexdigest() + '"'
+        headers = {'ETag': etag}
+        if set_cookie:
+            headers['Set-Cookie'] = set_cookie
+        if self.headers.get('If-None-Match') == etag:
+            server.count('304')
+            return self._send(304, '', headers=headers)
+        server.count('200')
+        return self._send(200, body, headers=headers)
+
+    def _route(self, path: str, query: Dict[str, str]) -> Optional[str]:
+        server = self.server
+        season_id = query.get('season_id', '0')
+        if path in ('/', LEAGUE_PATH, LEAGUE_PATH + '/'):
+            return '<html><head><title>FootyStats (local)</title></head><body>OK</body></html>'
+
+        if path.rstrip('/') == LEAGUE_PATH + '/matches':
+            recorded = server.recorded(f'season_{season_id}.html')
+            if recorded is not None:
+                return recorded
+            rows = server.season_rows(season_id)
+            head = LOAD_MORE_JS % {'path': LOAD_MORE_PATH, 'season_id': season_id}
+            return wrap_matches_page(rows[:server.page_size], padding=50, head=head,
+                                     load_more=len(rows) > server.page_size)
+
+        if path == LOAD_MORE_PATH:
+            try:
+                page = int(query.get('page', '2'))
+            except ValueError:
+                return None
+            recorded = server.recorded(f'season_{season_id}_page_{page}.html')
+            if recorded is not None:
+                return recorded
+            if server.recorded(f'season_{season_id}.html') is not None:
+                # Saison enregistrée sans fragments: tout est dans la page
+                return ''
+            rows = server.season_rows(season_id)
+            start = (page - 1) * server.page_size
+            return ''.join(rows[start:start + server.page_size]) if page > 1 else ''
+
+        if path.startswith(MATCH_PATH_PREFIX):
+            return server.match_page(path)
+        return None
+
+    def _send(self, status: int, body: str, content_type: str = 'text/html; charset=utf-8',
+              headers: Dict[str, str] = None):
+        payload = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD' and status != 304:
+            self.wfile.write(payload)
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Serveur FootyStats local pour les tests de débit")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--rows', type=int, default=240, help="Lignes par saison synthétique")
+    parser.add_argument('--page-size', type=int, default=50, help="Lignes par page / fragment")
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--p429', type=float, default=0.0, help="Probabilité de réponse 429")
+    parser.add_argument('--max-rps', type=float, default=None, help="Débit max avant 429")
+    parser.add_argument('--retry-after', type=float, default=1.0)
+    parser.add_argument('--challenge-delay', type=float, default=0.0, help="Délai de première visite")
+    parser.add_argument('--fixtures-dir', default=DEFAULT_FIXTURES_DIR)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = MockFootyStats(args.host, args.port, rows=args.rows, page_size=args.page_size,
+                            latency=args.latency, jitter=args.jitter, p429=args.p429,
+                            max_rps=args.max_rps, retry_after=args.retry_after,
+                            challenge_delay=args.challenge_delay, fixtures_dir=args.fixtures_dir,
+                            seed=args.seed)
+    logger.info(f"🧪 Serveur FootyStats local: {server.base_url}")
+    logger.info(f"   config.ini -> [SCRAPER] BASE_URL = {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info(f"Arrêt. Statistiques: {server.snapshot()}")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    sys.exit(main(sys.argv[1:]))
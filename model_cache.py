@@ -0,0 +1,183 @@
+"""
+CACHE DES MODÈLES AJUSTÉS
+=========================
+Les modèles sont sauvegardés sous une empreinte (SHA-256) des données
+d'entraînement et des hyperparamètres:
+    cache/models/<type>/<empreinte>/meta.json   (scalaires, équipes)
+    cache/models/<type>/<empreinte>/*.npy       (paramètres NumPy)
+Tant que les matchs joués et les hyperparamètres ne changent pas, le modèle
+est rechargé au lieu d'être réajusté; les paramètres NumPy sont ouverts en
+mémoire mappée (lecture à la demande). Les autres objets (estimateurs
+scikit-learn, ...) sont sérialisés avec joblib s'il est installé, sinon pickle.
+"""
+
+import os
+import json
+import pickle
+import shutil
+import hashlib
+import logging
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from storage import normalize_matches
+from models import DixonColes, EloModel
+
+logger = logging.getLogger(__name__)
+
+try:
+    import joblib
+    HAS_JOBLIB = True
+except ImportError:
+    HAS_JOBLIB = False
+
+# Colonnes qui déterminent l'ajustement (les autres n'invalident pas le cache)
+TRAINING_COLUMNS = ['date', 'home_team', 'away_team', 'home_goals', 'away_goals']
+# Incrémenter si le format des artefacts change
+CACHE_VERSION = 1
+
+
+def data_fingerprint(df: pd.DataFrame, columns=TRAINING_COLUMNS) -> str:
+    """Empreinte des matchs joués (ordre des lignes sans importance)"""
+    typed = normalize_matches(df)
+    played = typed.loc[typed['home_goals'].notna() & typed['away_goals'].notna(), columns]
+    played = played.astype(str).sort_values(columns).reset_index(drop=True)
+    row_hashes = pd.util.hash_pandas_object(played, index=False).to_numpy()
+    return hashlib.sha256(row_hashes.tobytes()).hexdigest()
+
+
+def model_params(model) -> Dict:
+    """Hyperparamètres d'un modèle (get_params() pour scikit-learn)"""
+    if isinstance(model, DixonColes):
+        return {'xi': model.xi, 'dixon_coles': model.dixon_coles, 'max_goals': model.max_goals}
+    if isinstance(model, EloModel):
+        return {'k': model.k, 'home_advantage': model.home_advantage, 'initial': model.initial}
+    if hasattr(model, 'get_params'):
+        return model.get_params()
+    return {}
+
+
+def fingerprint(data_hash: str, kind: str, params: Dict) -> str:
+    """Empreinte (données, type de modèle, hyperparamètres)"""
+    payload = json.dumps({'data': data_hash, 'kind': kind, 'params': params, 'version': CACHE_VERSION},
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+# Sérialisation par type: état -> (meta JSON, tableaux NumPy)
+def _dump_dixon_coles(model: DixonColes):
+    meta = dict(model_params(model), teams=list(model.teams), home_advantage=float(model.home_advantage),
+                rho=float(model.rho), n_matches=int(model.n_matches))
+    return meta, {'attack': model.attack, 'defence': model.defence}
+
+
+def _load_dixon_coles(meta: Dict, arrays: Dict) -> DixonColes:
+    model = DixonColes(xi=meta['xi'], dixon_coles=meta['dixon_coles'], max_goals=meta['max_goals'])
+    model.teams = {team: i for i, team in enumerate(meta['teams'])}
+    model.attack, model.defence = arrays['attack'], arrays['defence']
+    model.home_advantage, model.rho, model.n_matches = meta['home_advantage'], meta['rho'], meta['n_matches']
+    return model
+
+
+def _dump_elo(model: EloModel):
+    return dict(model_params(model), teams=list(model.teams)), {'ratings': model.ratings_}
+
+
+def _load_elo(meta: Dict, arrays: Dict) -> EloModel:
+    model = EloModel(k=meta['k'], home_advantage=meta['home_advantage'], initial=meta['initial'])
+    model.teams = {team: i for i, team in enumerate(meta['teams'])}
+    model.ratings_ = arrays['ratings']
+    return model
+
+
+CODECS = {
+    'DixonColes': (_dump_dixon_coles, _load_dixon_coles),
+    'EloModel': (_dump_elo, _load_elo),
+}
+
+
+class ModelCache:
+    """Artefacts de modèles indexés par empreinte des données et hyperparamètres"""
+
+    def __init__(self, cache_dir: str = 'cache'):
+        """
+        Args:
+            cache_dir (str): Répertoire racine (créé par main.setup_directories)
+        """
+        self.root = Path(cache_dir) / 'models'
+
+    def _dir(self, kind: str, key: str) -> Path:
+        return self.root / kind / key
+
+    def get(self, kind: str, key: str):
+        """Recharge un modèle (paramètres NumPy en mémoire mappée), ou None"""
+        directory = self._dir(kind, key)
+        if not (directory / 'meta.json').exists():
+            return None
+        with open(directory / 'meta.json', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        if kind in CODECS:
+            arrays = {path.stem: np.load(path, mmap_mode='r') for path in directory.glob('*.npy')}
+            return CODECS[kind][1](meta, arrays)
+        if meta.get('joblib') and HAS_JOBLIB:
+            return joblib.load(directory / 'model.pkl', mmap_mode='r')
+        with open(directory / 'model.pkl', 'rb') as f:
+            return pickle.load(f)
+
+    def put(self, kind: str, key: str, model) -> Path:
+        """Sauvegarde un modèle ajusté (écriture dans un répertoire temporaire puis renommage)"""
+        directory = self._dir(kind, key)
+        tmp_dir = directory.with_name(directory.name + '.tmp')
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+
+        if kind in CODECS:
+            meta, arrays = CODECS[kind][0](model)
+            for name, values in arrays.items():
+                np.save(tmp_dir / f'{name}.npy', np.ascontiguousarray(values))
+        else:
+            meta = {'joblib': HAS_JOBLIB}
+            if HAS_JOBLIB:
+                joblib.dump(model, tmp_dir / 'model.pkl')
+            else:
+                with open(tmp_dir / 'model.pkl', 'wb') as f:
+                    pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(tmp_dir / 'meta.json', 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+        shutil.rmtree(directory, ignore_errors=True)
+        os.replace(tmp_dir, directory)
+        return directory
+
+    def get_or_fit(self, model, df: pd.DataFrame, fit: Callable = None, params: Dict = None,
+                   data_hash: str = None):
+        """
+        Retourne le modèle en cache pour (df, hyperparamètres), sinon l'ajuste et le sauvegarde
+
+        Args:
+            model: Modèle non ajusté (porte les hyperparamètres)
+            df (pd.DataFrame): Données d'entraînement
+            fit (Callable): fit(model, df) -> modèle ajusté (model.fit(df) par défaut)
+            params (Dict): Hyperparamètres de l'empreinte (model_params(model) par défaut)
+            data_hash (str): Empreinte des données déjà calculée (évite de la recalculer)
+        """
+        kind = type(model).__name__
+        key = fingerprint(data_hash or data_fingerprint(df), kind, params if params is not None else model_params(model))
+        cached = self.get(kind, key)
+        if cached is not None:
+            logger.info(f"⚡ {kind} chargé depuis le cache ({key[:12]})")
+            return cached
+
+        fitted = fit(model, df) if fit else model.fit(df)
+        fitted = fitted if fitted is not None else model
+        self.put(kind, key, fitted)
+        logger.info(f"💾 {kind} ajusté et mis en cache ({key[:12]})")
+        return fitted
+
+    def clear(self, kind: Optional[str] = None):
+        """Supprime les artefacts (d'un type ou tous)"""
+        shutil.rmtree(self.root / kind if kind else self.root, ignore_errors=True)
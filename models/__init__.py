@@ -0,0 +1,11 @@
+"""
+MODÈLES DE PRÉDICTION
+=====================
+- poisson: modèle de buts Poisson / Dixon-Coles (matrices de scores)
+- elo: classement Elo (avantage du terrain, écart de buts)
+"""
+
+from models.poisson import DixonColes, outcome_probabilities
+from models.elo import EloModel
+
+__all__ = ['DixonColes', 'outcome_probabilities', 'EloModel']
@@ -0,0 +1,185 @@
+"""
+CLASSEMENT ELO
+==============
+Elo avec avantage du terrain et multiplicateur d'écart de buts:
+- les matchs sont rejoués dans l'ordre chronologique (colonne date des scrapers)
+  en un seul passage linéaire
+- les classements sont un tableau NumPy indexé par identifiant d'équipe
+- l'Elo avant-match est émis pour chaque match (y compris à venir, sans mise à jour)
+- l'optimisation de K et de l'avantage du terrain rejoue toute une grille de
+  configurations en même temps (une ligne du tableau par configuration)
+"""
+
+import logging
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from storage import normalize_matches
+
+logger = logging.getLogger(__name__)
+
+INITIAL_RATING = 1500.0
+DEFAULT_K = 20.0
+DEFAULT_HOME_ADVANTAGE = 60.0
+SCALE = 400.0
+
+
+def goal_diff_multiplier(goal_diff: np.ndarray) -> np.ndarray:
+    """Multiplicateur de K selon l'écart de buts (World Football Elo: 1, 1.5, (11 + N) / 8)"""
+    gd = np.abs(goal_diff)
+    return np.where(gd <= 1, 1.0, np.where(gd == 2, 1.5, (11.0 + gd) / 8.0))
+
+
+def encode_matches(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Encode les matchs en tableaux triés par date (tri stable)
+
+    Returns:
+        Dict[str, np.ndarray]: teams, order (positions dans df), home, away,
+        result (1 / 0.5 / 0 du point de vue du domicile, NaN si non joué), multiplier
+    """
+    typed = normalize_matches(df).reset_index(drop=True)
+    order = np.argsort(typed['date'].to_numpy(), kind='mergesort')
+    typed = typed.iloc[order]
+
+    codes, teams = pd.factorize(pd.concat([typed['home_team'].astype(str), typed['away_team'].astype(str)]))
+    n = len(typed)
+    goal_diff = (typed['home_goals'].astype('float64') - typed['away_goals'].astype('float64')).to_numpy()
+    return {
+        'teams': np.asarray(teams),
+        'order': order,
+        'home': codes[:n],
+        'away': codes[n:],
+        'result': np.sign(goal_diff) / 2 + 0.5,
+        'multiplier': goal_diff_multiplier(np.nan_to_num(goal_diff)),
+    }
+
+
+def replay(home: np.ndarray, away: np.ndarray, result: np.ndarray, multiplier: np.ndarray,
+           n_teams: int, k: np.ndarray, home_advantage: np.ndarray,
+           initial: float = INITIAL_RATING) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Rejoue les matchs pour C configurations (K, avantage) simultanément
+
+    Args:
+        home, away (np.ndarray): Indices d'équipes, dans l'ordre chronologique
+        result (np.ndarray): Résultat domicile (NaN = match à venir, pas de mise à jour)
+        multiplier (np.ndarray): Multiplicateur d'écart de buts
+        k, home_advantage (np.ndarray): Paramètres, shape (C,)
+
+    Returns:
+        Tuple: (Elo domicile avant-match (C, N), Elo extérieur avant-match (C, N),
+                espérance domicile (C, N), classements finaux (C, n_teams))
+    """
+    k = np.asarray(k, dtype='float64')
+    home_advantage = np.asarray(home_advantage, dtype='float64')
+    ratings = np.full((len(k), n_teams), initial)
+    pre_home = np.empty((len(k), len(home)))
+    pre_away = np.empty_like(pre_home)
+    expected = np.empty_like(pre_home)
+
+    played = ~np.isnan(result)
+    for i in range(len(home)):
+        h, a = home[i], away[i]
+        r_home, r_away = ratings[:, h], ratings[:, a]
+        e_home = 1.0 / (1.0 + 10.0 ** ((r_away - r_home - home_advantage) / SCALE))
+        pre_home[:, i], pre_away[:, i], expected[:, i] = r_home, r_away, e_home
+        if played[i]:
+            delta = k * multiplier[i] * (result[i] - e_home)
+            ratings[:, h] = r_home + delta
+            ratings[:, a] = r_away - delta
+    return pre_home, pre_away, expected, ratings
+
+
+class EloModel:
+    """Classement Elo des équipes"""
+
+    def __init__(self, k: float = DEFAULT_K, home_advantage: float = DEFAULT_HOME_ADVANTAGE,
+                 initial: float = INITIAL_RATING):
+        """
+        Args:
+            k (float): Facteur K (amplitude des mises à jour)
+            home_advantage (float): Points Elo ajoutés à l'équipe à domicile
+            initial (float): Classement d'une nouvelle équipe
+        """
+        self.k = k
+        self.home_advantage = home_advantage
+        self.initial = initial
+        self.teams: Dict[str, int] = {}
+        self.ratings_ = np.zeros(0)
+
+    def pre_match_ratings(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Rejoue l'historique et retourne l'Elo avant chaque match (même index que df)
+
+        Les classements finaux sont conservés pour les matchs à venir.
+
+        Returns:
+            pd.DataFrame: home_elo, away_elo, elo_diff, elo_expected
+        """
+        encoded = encode_matches(df)
+        pre_home, pre_away, expected, final = replay(
+            encoded['home'], encoded['away'], encoded['result'], encoded['multiplier'],
+            len(encoded['teams']), [self.k], [self.home_advantage], self.initial,
+        )
+        self.teams = {team: i for i, team in enumerate(encoded['teams'])}
+        self.ratings_ = final[0]
+
+        # Retour à l'ordre d'origine de df
+        frame = pd.DataFrame(index=df.index[encoded['order']])
+        frame['home_elo'] = pre_home[0]
+        frame['away_elo'] = pre_away[0]
+        frame['elo_diff'] = frame['home_elo'] - frame['away_elo']
+        frame['elo_expected'] = expected[0]
+        return frame.reindex(df.index)
+
+    def fit(self, df: pd.DataFrame) -> 'EloModel':
+        """Rejoue l'historique complet (classements finaux dans ratings())"""
+        self.pre_match_ratings(df)
+        logger.info(f"✅ Elo: {len(self.teams)} équipes (K={self.k}, avantage={self.home_advantage})")
+        return self
+
+    def ratings(self) -> pd.Series:
+        """Classements actuels, du meilleur au moins bon"""
+        return pd.Series(self.ratings_, index=list(self.teams), name='elo').sort_values(ascending=False)
+
+    def expected(self, home_teams: Sequence[str], away_teams: Sequence[str]) -> np.ndarray:
+        """Espérance de score domicile de matchs à venir (classement initial si équipe inconnue)"""
+        index = pd.Index(list(self.teams))
+
+        def lookup(teams):
+            positions = index.get_indexer(pd.Index(teams).astype(str))
+            return np.where(positions >= 0, self.ratings_[np.maximum(positions, 0)], self.initial)
+        diff = lookup(away_teams) - lookup(home_teams) - self.home_advantage
+        return 1.0 / (1.0 + 10.0 ** (diff / SCALE))
+
+
+def tune(df: pd.DataFrame, k_values: List[float] = None, home_advantages: List[float] = None,
+         burn_in: float = 0.25) -> pd.DataFrame:
+    """
+    Évalue une grille (K, avantage du terrain) en un seul rejeu vectorisé
+
+    Le critère est l'erreur quadratique entre espérance et résultat (1 / 0.5 / 0)
+    sur les matchs joués après la période de chauffe.
+
+    Args:
+        burn_in (float): Fraction initiale des matchs exclue de l'évaluation
+
+    Returns:
+        pd.DataFrame: k, home_advantage, brier, trié du meilleur au moins bon
+    """
+    k_values = k_values or [10, 15, 20, 25, 30, 40]
+    home_advantages = home_advantages or [0, 30, 60, 90, 120]
+    grid_k, grid_ha = (a.ravel() for a in np.meshgrid(k_values, home_advantages, indexing='ij'))
+
+    encoded = encode_matches(df)
+    _, _, expected, _ = replay(encoded['home'], encoded['away'], encoded['result'], encoded['multiplier'],
+                               len(encoded['teams']), grid_k, grid_ha)
+
+    played = ~np.isnan(encoded['result'])
+    evaluated = played & (np.arange(len(played)) >= int(burn_in * len(played)))
+    errors = (expected[:, evaluated] - encoded['result'][evaluated]) ** 2
+    scores = pd.DataFrame({'k': grid_k, 'home_advantage': grid_ha, 'brier': errors.mean(axis=1)})
+    return scores.sort_values('brier').reset_index(drop=True)
@@ -0,0 +1,234 @@
+"""
+MODÈLE DE BUTS POISSON / DIXON-COLES
+====================================
+Buts domicile ~ Poisson(λ), buts extérieur ~ Poisson(μ) avec
+    log λ = attaque[domicile] + défense[extérieur] + avantage_domicile
+    log μ = attaque[extérieur] + défense[domicile]
+- correction Dixon-Coles τ(x, y, λ, μ, ρ) des scores 0-0, 1-0, 0-1, 1-1
+- poids de décroissance temporelle exp(-ξ · jours écoulés)
+- log-vraisemblance et gradient analytique entièrement vectorisés (NumPy),
+  optimisation L-BFGS-B (SciPy)
+- matrices de probabilités des scores pour un lot de matchs en une opération
+"""
+
+import logging
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize
+from scipy.special import gammaln
+
+from storage import normalize_matches
+
+logger = logging.getLogger(__name__)
+
+# Décroissance temporelle par jour (0.0065 par demi-semaine dans Dixon & Coles, 1997)
+DEFAULT_XI = 0.0019
+MAX_GOALS = 10
+RHO_BOUNDS = (-0.2, 0.2)
+# Pénalité fixant la somme des attaques à 0 (identifiabilité; ne change pas l'optimum)
+SUM_PENALTY = 10.0
+TAU_FLOOR = 1e-10
+
+
+def time_weights(dates: pd.Series, as_of=None, xi: float = DEFAULT_XI) -> np.ndarray:
+    """Poids exp(-ξ · jours avant as_of) (1 pour le match le plus récent si as_of est None)"""
+    dates = pd.to_datetime(dates)
+    reference = pd.Timestamp(as_of) if as_of is not None else dates.max()
+    days = (reference - dates).dt.days.to_numpy(dtype='float64')
+    return np.exp(-xi * np.clip(days, 0, None))
+
+
+def _tau(x: np.ndarray, y: np.ndarray, lam: np.ndarray, mu: np.ndarray, rho: float):
+    """Correction Dixon-Coles et ses dérivées partielles (λ, μ, ρ) pour chaque match"""
+    tau = np.ones_like(lam)
+    d_lam = np.zeros_like(lam)
+    d_mu = np.zeros_like(lam)
+    d_rho = np.zeros_like(lam)
+
+    m00 = (x == 0) & (y == 0)
+    m01 = (x == 0) & (y == 1)
+    m10 = (x == 1) & (y == 0)
+    m11 = (x == 1) & (y == 1)
+    tau[m00] = 1 - lam[m00] * mu[m00] * rho
+    d_lam[m00], d_mu[m00], d_rho[m00] = -mu[m00] * rho, -lam[m00] * rho, -lam[m00] * mu[m00]
+    tau[m01] = 1 + lam[m01] * rho
+    d_lam[m01], d_rho[m01] = rho, lam[m01]
+    tau[m10] = 1 + mu[m10] * rho
+    d_mu[m10], d_rho[m10] = rho, mu[m10]
+    tau[m11] = 1 - rho
+    d_rho[m11] = -1.0
+    return np.maximum(tau, TAU_FLOOR), d_lam, d_mu, d_rho
+
+
+def poisson_pmf(rates: np.ndarray, max_goals: int = MAX_GOALS) -> np.ndarray:
+    """P(k buts) pour k = 0..max_goals, shape (n, max_goals + 1)"""
+    goals = np.arange(max_goals + 1)
+    rates = np.asarray(rates, dtype='float64')[:, None]
+    return np.exp(goals * np.log(rates) - rates - gammaln(goals + 1))
+
+
+def outcome_probabilities(matrices: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Probabilités 1X2 et buts attendus à partir des matrices de scores
+
+    Args:
+        matrices (np.ndarray): shape (n, G, G), [i, x, y] = P(domicile x, extérieur y)
+    """
+    goals = np.arange(matrices.shape[1])
+    return {
+        'home_win': np.tril(matrices, -1).sum(axis=(1, 2)),
+        'draw': np.trace(matrices, axis1=1, axis2=2),
+        'away_win': np.triu(matrices, 1).sum(axis=(1, 2)),
+        'home_xg': (matrices.sum(axis=2) * goals).sum(axis=1),
+        'away_xg': (matrices.sum(axis=1) * goals).sum(axis=1),
+    }
+
+
+class DixonColes:
+    """Modèle de Dixon-Coles (attaque / défense / avantage du terrain / ρ)"""
+
+    def __init__(self, xi: float = DEFAULT_XI, dixon_coles: bool = True, max_goals: int = MAX_GOALS):
+        """
+        Args:
+            xi (float): Décroissance temporelle par jour (0 = tous les matchs pèsent autant)
+            dixon_coles (bool): Correction des scores faibles (sinon Poisson indépendant, ρ = 0)
+            max_goals (int): Taille des matrices de scores (0..max_goals)
+        """
+        self.xi = xi
+        self.dixon_coles = dixon_coles
+        self.max_goals = max_goals
+        self.teams: Dict[str, int] = {}
+        self.attack = np.zeros(0)
+        self.defence = np.zeros(0)
+        self.home_advantage = 0.0
+        self.rho = 0.0
+        self.n_matches = 0
+
+    def _unpack(self, theta: np.ndarray) -> Tuple[np.ndarray, np.ndarray, float, float]:
+        n = len(self.teams)
+        return theta[:n], theta[n:2 * n], theta[2 * n], theta[2 * n + 1]
+
+    def _objective(self, theta, home, away, x, y, weights) -> Tuple[float, np.ndarray]:
+        """Log-vraisemblance pondérée négative et son gradient"""
+        n = len(self.teams)
+        attack, defence, home_adv, rho = self._unpack(theta)
+        log_lam = attack[home] + defence[away] + home_adv
+        log_mu = attack[away] + defence[home]
+        lam, mu = np.exp(log_lam), np.exp(log_mu)
+        tau, d_lam, d_mu, d_rho = _tau(x, y, lam, mu, rho)
+
+        # x! et y! constants: omis
+        loglik = weights * (np.log(tau) + x * log_lam - lam + y * log_mu - mu)
+        # Dérivées par rapport à log λ et log μ (d/dlogλ = λ · d/dλ)
+        g_lam = weights * (x - lam + lam * d_lam / tau)
+        g_mu = weights * (y - mu + mu * d_mu / tau)
+
+        grad = np.empty_like(theta)
+        grad[:n] = np.bincount(home, g_lam, n) + np.bincount(away, g_mu, n)
+        grad[n:2 * n] = np.bincount(away, g_lam, n) + np.bincount(home, g_mu, n)
+        grad[2 * n] = g_lam.sum()
+        grad[2 * n + 1] = (weights * d_rho / tau).sum() if self.dixon_coles else 0.0
+
+        total = attack.sum()
+        value = -loglik.sum() + SUM_PENALTY * total ** 2
+        grad = -grad
+        grad[:n] += 2 * SUM_PENALTY * total
+        return value, grad
+
+    def fit(self, df: pd.DataFrame, as_of=None) -> 'DixonColes':
+        """
+        Ajuste le modèle sur les matchs joués de df (matchs postérieurs à as_of exclus)
+
+        Args:
+            df (pd.DataFrame): Matchs (home_team, away_team, score ou home_goals/away_goals, date)
+            as_of: Date de référence de la décroissance temporelle (dernier match par défaut)
+        """
+        typed = normalize_matches(df)
+        played = typed[typed['home_goals'].notna() & typed['away_goals'].notna() & typed['date'].notna()]
+        if as_of is not None:
+            played = played[played['date'] < pd.Timestamp(as_of)]
+        if played.empty:
+            raise ValueError("Aucun match joué pour ajuster le modèle")
+
+        teams = sorted(set(played['home_team'].astype(str)) | set(played['away_team'].astype(str)))
+        index = {team: i for i, team in enumerate(teams)}
+        return self.fit_arrays(
+            teams,
+            played['home_team'].astype(str).map(index).to_numpy(),
+            played['away_team'].astype(str).map(index).to_numpy(),
+            played['home_goals'].to_numpy(dtype='float64'),
+            played['away_goals'].to_numpy(dtype='float64'),
+            time_weights(played['date'], as_of, self.xi),
+        )
+
+    def fit_arrays(self, teams: Sequence[str], home: np.ndarray, away: np.ndarray,
+                   x: np.ndarray, y: np.ndarray, weights: np.ndarray = None) -> 'DixonColes':
+        """
+        Ajuste le modèle sur des tableaux déjà encodés (sans passer par pandas)
+
+        Args:
+            teams (Sequence[str]): Noms des équipes (position = indice)
+            home, away (np.ndarray): Indices des équipes de chaque match
+            x, y (np.ndarray): Buts domicile / extérieur
+            weights (np.ndarray): Poids des matchs (1 par défaut)
+        """
+        self.teams = {team: i for i, team in enumerate(teams)}
+        if weights is None:
+            weights = np.ones(len(x))
+
+        n = len(teams)
+        theta0 = np.zeros(2 * n + 2)
+        theta0[2 * n] = 0.2
+        bounds = [(None, None)] * (2 * n + 1) + [RHO_BOUNDS if self.dixon_coles else (0.0, 0.0)]
+        result = minimize(self._objective, theta0, args=(home, away, x, y, weights),
+                          jac=True, method='L-BFGS-B', bounds=bounds)
+        if not result.success:
+            logger.warning(f"⚠️ Optimisation Dixon-Coles: {result.message}")
+
+        self.attack, self.defence, self.home_advantage, self.rho = self._unpack(result.x)
+        self.n_matches = len(x)
+        logger.info(f"✅ Dixon-Coles ajusté sur {self.n_matches} matchs, {n} équipes "
+                    f"(avantage domicile {np.exp(self.home_advantage):.2f}, ρ={self.rho:.3f})")
+        return self
+
+    def _team_params(self, teams: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Attaque/défense des équipes (0 = moyenne de la ligue pour une équipe inconnue)"""
+        index = pd.Index(list(self.teams)).get_indexer(pd.Index(teams).astype(str))
+        known = index >= 0
+        attack = np.where(known, self.attack[np.where(known, index, 0)], 0.0)
+        defence = np.where(known, self.defence[np.where(known, index, 0)], 0.0)
+        return attack, defence
+
+    def expected_goals(self, home_teams: Sequence[str], away_teams: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """(λ, μ) de chaque match"""
+        home_attack, home_defence = self._team_params(home_teams)
+        away_attack, away_defence = self._team_params(away_teams)
+        lam = np.exp(home_attack + away_defence + self.home_advantage)
+        mu = np.exp(away_attack + home_defence)
+        return lam, mu
+
+    def score_matrices(self, home_teams: Sequence[str], away_teams: Sequence[str]) -> np.ndarray:
+        """
+        Matrices de probabilités des scores d'un lot de matchs
+
+        Returns:
+            np.ndarray: shape (n, max_goals + 1, max_goals + 1), [i, x, y] = P(x - y)
+        """
+        return self.matrices_from_rates(*self.expected_goals(home_teams, away_teams))
+
+    def matrices_from_rates(self, lam: np.ndarray, mu: np.ndarray) -> np.ndarray:
+        """Matrices de scores à partir des buts attendus (λ, μ) de chaque match"""
+        matrices = poisson_pmf(lam, self.max_goals)[:, :, None] * poisson_pmf(mu, self.max_goals)[:, None, :]
+        rho = self.rho
+        matrices[:, 0, 0] *= 1 - lam * mu * rho
+        matrices[:, 0, 1] *= 1 + lam * rho
+        matrices[:, 1, 0] *= 1 + mu * rho
+        matrices[:, 1, 1] *= 1 - rho
+        return matrices
+
+    def ratings(self) -> pd.DataFrame:
+        """Paramètres par équipe (attaque élevée = marque plus, défense élevée = encaisse plus)"""
+        return pd.DataFrame({'attack': self.attack, 'defence': self.defence},
+                            index=list(self.teams)).sort_values('attack', ascending=False)
@@ -0,0 +1,204 @@
+"""
+PRÉDICTIONS - Journée complète en un appel
+==========================================
+predict_fixtures(fixtures_df) retourne, pour tous les matchs d'un coup:
+- probabilités 1X2
+- buts attendus (λ, μ) et score le plus probable
+- over/under (1.5, 2.5, 3.5) et les deux équipes marquent
+- Elo avant-match
+- features de forme de chaque équipe (home_*, away_*, diff_*), construites
+  pour tout le lot par le feature store
+Les modèles sont ajustés une seule fois sur l'historique puis réutilisés;
+tout le calcul est vectorisé (matrices de scores du lot entier). Les
+probabilités viennent des paramètres Dixon-Coles; les features de forme sont
+jointes au résultat (entrées d'un modèle basé sur les features, comparaison
+avec la forme récente), elles ne modifient pas les probabilités.
+
+Usage:
+    python predict.py                      # matchs sans score de l'historique
+    python predict.py fixtures.csv [out]   # fichier home_team, away_team[, date]
+    python predict.py "Raja Casablanca" "Wydad Casablanca"
+"""
+
+import os
+import sys
+import glob
+import logging
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+import storage
+from feature_store import FeatureStore
+from models import DixonColes, EloModel, outcome_probabilities
+
+logger = logging.getLogger(__name__)
+
+OVER_UNDER_LINES = (1.5, 2.5, 3.5)
+
+
+def load_history() -> pd.DataFrame:
+    """Historique des matchs: stockage Parquet s'il existe, sinon le CSV le plus récent"""
+    if storage.HAS_PYARROW and storage.has_matches():
+        return storage.load_matches()
+    csv_files = glob.glob("botola_matches*.csv")
+    if not csv_files:
+        raise FileNotFoundError("Aucun historique de matchs (botola_matches*.csv ou data/matches/)")
+    return pd.read_csv(max(csv_files, key=os.path.getctime))
+
+
+def unplayed_fixtures(history: pd.DataFrame) -> pd.DataFrame:
+    """Matchs de l'historique sans score (calendrier à venir)"""
+    goals = storage.normalize_matches(history)[['home_goals', 'away_goals']]
+    return history.loc[goals.isna().any(axis=1), ['date', 'home_team', 'away_team']]
+
+
+def market_probabilities(matrices: np.ndarray, lines: Sequence[float] = OVER_UNDER_LINES) -> dict:
+    """Over/under, BTTS et score le plus probable à partir des matrices (n, G, G)"""
+    goals = np.arange(matrices.shape[1])
+    totals = goals[:, None] + goals[None, :]
+    markets = {}
+    for line in lines:
+        over = (matrices * (totals > line)).sum(axis=(1, 2))
+        markets[f'over_{line}'] = over
+        markets[f'under_{line}'] = 1.0 - over
+    markets['btts'] = 1.0 - matrices[:, 0, :].sum(axis=1) - matrices[:, :, 0].sum(axis=1) + matrices[:, 0, 0]
+
+    best = matrices.reshape(len(matrices), -1).argmax(axis=1)
+    home_goals, away_goals = np.divmod(best, matrices.shape[2])
+    markets['likely_score'] = [f"{h}-{a}" for h, a in zip(home_goals, away_goals)]
+    markets['likely_score_prob'] = matrices.reshape(len(matrices), -1).max(axis=1)
+    return markets
+
+
+class MatchPredictor:
+    """Modèles ajustés une fois sur l'historique (Dixon-Coles + Elo + état de forme)"""
+
+    def __init__(self, history: pd.DataFrame, poisson: DixonColes = None, elo: EloModel = None,
+                 features: FeatureStore = None):
+        """
+        Args:
+            history (pd.DataFrame): Matchs joués (les matchs sans score sont ignorés par l'ajustement)
+            poisson (DixonColes): Modèle déjà ajusté (ajusté sur history sinon)
+            elo (EloModel): Modèle Elo déjà ajusté (ajusté sur history sinon)
+            features (FeatureStore): État de forme des équipes (reconstruit depuis history sinon)
+        """
+        self.history = history
+        self.poisson = poisson or DixonColes().fit(history)
+        self.elo = elo or EloModel().fit(history)
+        self.features = features or FeatureStore.rebuild(history)
+
+    def predict(self, fixtures: pd.DataFrame, with_features: bool = True) -> pd.DataFrame:
+        """
+        Prédit tous les matchs du DataFrame en une opération
+
+        Args:
+            fixtures (pd.DataFrame): Colonnes home_team, away_team (date optionnelle)
+            with_features (bool): Joint les features de forme du lot (FeatureStore.snapshot)
+
+        Returns:
+            pd.DataFrame: fixtures + p_home, p_draw, p_away, home_xg, away_xg,
+            over_*/under_*, btts, likely_score, home_elo, away_elo, et les
+            features home_*/away_*/diff_* de features.feature_columns
+        """
+        home = fixtures['home_team'].astype(str).to_numpy()
+        away = fixtures['away_team'].astype(str).to_numpy()
+        matrices = self.poisson.score_matrices(home, away)
+        outcomes = outcome_probabilities(matrices)
+
+        result = fixtures.reset_index(drop=True).copy()
+        result['p_home'] = outcomes['home_win']
+        result['p_draw'] = outcomes['draw']
+        result['p_away'] = outcomes['away_win']
+        result['home_xg'] = outcomes['home_xg']
+        result['away_xg'] = outcomes['away_xg']
+        for name, values in market_probabilities(matrices).items():
+            result[name] = values
+
+        ratings = self.elo.ratings()
+        result['home_elo'] = ratings.reindex(home, fill_value=self.elo.initial).to_numpy()
+        result['away_elo'] = ratings.reindex(away, fill_value=self.elo.initial).to_numpy()
+        result['elo_expected'] = self.elo.expected(home, away)
+        if with_features:
+            # Colonnes des fixtures déjà présentes dans result
+            form = self.features.snapshot(fixtures).iloc[:, len(fixtures.columns):]
+            result = pd.concat([result, form], axis=1)
+        return result
+
+
+_predictor = None
+
+
+def get_predictor(reload: bool = False, use_cache: bool = True) -> MatchPredictor:
+    """
+    Prédicteur partagé (ajusté une seule fois par processus)
+
+    Avec use_cache, les modèles déjà ajustés sur les mêmes matchs sont rechargés
+    depuis cache/models/ au lieu d'être réajustés.
+    """
+    global _predictor
+    if _predictor is None or reload:
+        history = load_history()
+        if use_cache:
+            from model_cache import ModelCache, data_fingerprint
+            cache, data_hash = ModelCache(), data_fingerprint(history)
+            _predictor = MatchPredictor(
+                history,
+                poisson=cache.get_or_fit(DixonColes(), history, data_hash=data_hash),
+                elo=cache.get_or_fit(EloModel(), history, data_hash=data_hash),
+            )
+        else:
+            _predictor = MatchPredictor(history)
+    return _predictor
+
+
+def predict_fixtures(fixtures_df: pd.DataFrame, predictor: MatchPredictor = None,
+                     with_features: bool = True) -> pd.DataFrame:
+    """
+    Prédictions 1X2, buts attendus et over/under pour un lot de matchs,
+    avec les features de forme du lot construites en une fois
+
+    Args:
+        fixtures_df (pd.DataFrame): Colonnes home_team, away_team (date optionnelle)
+        predictor (MatchPredictor): Modèles à utiliser (prédicteur partagé par défaut)
+        with_features (bool): Joint les features home_*/away_*/diff_* au résultat
+    """
+    return (predictor or get_predictor()).predict(fixtures_df, with_features)
+
+
+def print_predictions(predictions: pd.DataFrame):
+    """Affiche les prédictions sous forme de tableau"""
+    columns = ['home_team', 'away_team', 'p_home', 'p_draw', 'p_away', 'home_xg', 'away_xg',
+               'over_2.5', 'btts', 'likely_score']
+    if 'date' in predictions.columns:
+        columns.insert(0, 'date')
+    print(predictions[columns].to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+
+
+def main(argv: Sequence[str] = None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    output = None
+    if len(argv) == 2 and not argv[0].endswith('.csv'):
+        fixtures = pd.DataFrame({'home_team': [argv[0]], 'away_team': [argv[1]]})
+    elif argv:
+        fixtures = pd.read_csv(argv[0])
+        output = argv[1] if len(argv) > 1 else None
+    else:
+        fixtures = unplayed_fixtures(get_predictor().history)
+
+    if fixtures.empty:
+        logger.warning("❌ Aucun match à prédire")
+        return None
+
+    predictions = predict_fixtures(fixtures)
+    print_predictions(predictions)
+    if output:
+        predictions.to_csv(output, index=False, encoding='utf-8')
+        logger.info(f"✅ {len(predictions)} prédictions sauvegardées dans {output}")
+    return predictions
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
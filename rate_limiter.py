@@ -0,0 +1,199 @@
+"""
+LIMITEUR DE DÉBIT ADAPTATIF - Seau à jetons AIMD par hôte
+=========================================================
+Partagé par tous les chemins de téléchargement (HTTP, "Voir plus" rejoué,
+navigateurs Selenium):
+- seau à jetons par hôte (débit en requêtes/s, rafale limitée)
+- AIMD: +INCREASE req/s après chaque réponse rapide et réussie, débit
+  multiplié par DECREASE sur 429 / 503
+- attente exponentielle (avec gigue) après chaque échec consécutif, jamais
+  plus courte que l'en-tête Retry-After (secondes ou date HTTP)
+Le débit converge ainsi vers le plus haut rythme soutenu toléré par le site.
+Paramètres: section [RATE_LIMIT] de config.ini.
+"""
+
+import time
+import random
+import threading
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import settings
+from metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+# Réponses qui signalent une surcharge: réduction du débit et attente
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Délai (secondes) d'un en-tête Retry-After: nombre de secondes ou date HTTP"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+@dataclass
+class _HostState:
+    rate: float
+    tokens: float
+    updated: float
+    blocked_until: float = 0.0
+    failures: int = 0
+
+
+class AdaptiveRateLimiter:
+    """Seau à jetons par hôte dont le débit s'adapte aux réponses du serveur"""
+
+    def __init__(self, rate: float = 0.5, min_rate: float = 0.05, max_rate: float = 5.0, burst: float = 1.0,
+                 increase: float = 0.05, decrease: float = 0.5, slow_response: float = 5.0,
+                 backoff_base: float = 2.0, max_backoff: float = 120.0, seed: int = None):
+        """
+        Args:
+            rate (float): Débit initial (requêtes/s par hôte)
+            min_rate / max_rate (float): Bornes du débit
+            burst (float): Jetons maximum (requêtes immédiates après une pause)
+            increase (float): Hausse additive après une réponse rapide et réussie
+            decrease (float): Facteur multiplicatif sur 429 / 503
+            slow_response (float): Au-delà (secondes), une réponse réussie n'augmente pas le débit
+            backoff_base (float): Première attente après un échec (doublée à chaque échec consécutif)
+            max_backoff (float): Attente maximale (hors Retry-After)
+            seed (int): Graine de la gigue (tests déterministes)
+        """
+        self.initial_rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.decrease = decrease
+        self.slow_response = slow_response
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, _HostState] = {}
+
+    @classmethod
+    def from_config(cls) -> 'AdaptiveRateLimiter':
+        """Limiteur configuré par la section [RATE_LIMIT] de config.ini"""
+        return cls(
+            rate=settings.get_float('RATE_LIMIT', 'INITIAL_RATE', 0.5),
+            min_rate=settings.get_float('RATE_LIMIT', 'MIN_RATE', 0.05),
+            max_rate=settings.get_float('RATE_LIMIT', 'MAX_RATE', 5.0),
+            burst=settings.get_float('RATE_LIMIT', 'BURST', 1.0),
+            increase=settings.get_float('RATE_LIMIT', 'INCREASE', 0.05),
+            decrease=settings.get_float('RATE_LIMIT', 'DECREASE', 0.5),
+            slow_response=settings.get_float('RATE_LIMIT', 'SLOW_RESPONSE', 5.0),
+            backoff_base=settings.get_float('RATE_LIMIT', 'BACKOFF_BASE', 2.0),
+            max_backoff=settings.get_float('RATE_LIMIT', 'MAX_BACKOFF', 120.0),
+        )
+
+    def _state(self, host: str, now: float) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(rate=self.initial_rate, tokens=self.burst, updated=now)
+        # Recharge du seau depuis la dernière mise à jour
+        state.tokens = min(self.burst, state.tokens + (now - state.updated) * state.rate)
+        state.updated = now
+        return state
+
+    def acquire(self, url: str) -> float:
+        """
+        Bloque jusqu'à ce qu'une requête vers l'hôte de l'URL soit autorisée
+
+        Returns:
+            float: Temps d'attente (secondes)
+        """
+        host = urlparse(url).netloc
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                state = self._state(host, now)
+                if now < state.blocked_until:
+                    delay = state.blocked_until - now
+                elif state.tokens >= 1:
+                    state.tokens -= 1
+                    break
+                else:
+                    delay = (1 - state.tokens) / state.rate
+            time.sleep(delay)
+            waited += delay
+        if waited:
+            METRICS.observe('wait', waited)
+        return waited
+
+    def feedback(self, url: str, status: int = None, elapsed: float = None,
+                 retry_after: Optional[str] = None, error: bool = False) -> float:
+        """
+        Ajuste le débit de l'hôte d'après une réponse (ou une erreur réseau)
+
+        Args:
+            status (int): Code HTTP (None si pas de réponse)
+            elapsed (float): Durée de la requête (secondes)
+            retry_after (str): En-tête Retry-After de la réponse
+            error (bool): Erreur réseau / timeout
+
+        Returns:
+            float: Attente imposée avant la prochaine requête vers l'hôte (0 si succès)
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            state = self._state(host, now)
+            if not error and status is not None and status < 400:
+                state.failures = 0
+                if elapsed is None or elapsed < self.slow_response:
+                    state.rate = min(self.max_rate, state.rate + self.increase)
+                return 0.0
+
+            throttled = status in THROTTLE_STATUSES
+            if throttled:
+                state.rate = max(self.min_rate, state.rate * self.decrease)
+                state.tokens = min(state.tokens, 0.0)
+            state.failures += 1
+            backoff = min(self.max_backoff, self.backoff_base * 2 ** (state.failures - 1))
+            delay = backoff * self._rng.uniform(0.5, 1.0)
+            server_delay = parse_retry_after(retry_after)
+            if server_delay is not None:
+                delay = max(delay, server_delay)
+            state.blocked_until = max(state.blocked_until, now + delay)
+            rate = state.rate
+
+        logger.warning(f"⏳ {host}: {'HTTP ' + str(status) if status else 'erreur réseau'}, "
+                       f"pause {delay:.1f}s, débit {rate:.2f} req/s")
+        return delay
+
+    def rate(self, url: str) -> float:
+        """Débit courant (requêtes/s) de l'hôte de l'URL"""
+        with self._lock:
+            return self._state(urlparse(url).netloc, time.monotonic()).rate
+
+
+_SHARED: Optional[AdaptiveRateLimiter] = None
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_limiter() -> AdaptiveRateLimiter:
+    """Limiteur unique du processus (tous les scrapers et threads partagent le débit par hôte)"""
+    global _SHARED
+    with _SHARED_LOCK:
+        if _SHARED is None:
+            _SHARED = AdaptiveRateLimiter.from_config()
+        return _SHARED
@@ -7,15 +7,25 @@ protections anti-bot (CAPTCHA/Cloudflare) avant de procéder au scraping.
 """
 
 import pandas as pd
+import sys
 import time
 import logging
-from typing import Dict
+from typing import Dict, List
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-from bs4 import BeautifulSoup
+from html_parsing import parse_match_rows
+from driver_pool import DriverPool, profile_dir
+from load_more_http import LoadMoreReplayer
+from incremental import IncrementalFilter, append_matches, date_order, NEWEST_FIRST
+from storage import export_csv, parquet_enabled
+from match_store import sync_csv
+import settings
+from metrics import METRICS, timer, incr, reported
+from rate_limiter import shared_limiter
+from selenium_waits import MATCH_ROWS_SELECTOR, count_elements, find_load_more, wait_for_more_rows
 
 # --- Configuration du Logging ---
 logging.basicConfig(
@@ -25,102 +35,217 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Ancienne attente fixe par clic "Voir plus" (1s + 3s) et délai final de détection (5s)
+FIXED_WAIT_PER_CLICK = 4
+FIXED_WAIT_FINAL = 5
+
+OUTPUT_FILE = "botola_matches_all_seasons.csv"
+
+# Date et équipes de la dernière ligne affichée (mode incrémental)
+LAST_ROW_JS = """
+var rows = document.querySelectorAll(arguments[0]);
+if (!rows.length) return null;
+var first = rows[0].querySelector('td');
+var cells = rows[rows.length - 1].querySelectorAll('td');
+if (!first || cells.length < 4) return null;
+var team = function(cell) { var a = cell.querySelector('a.team-name'); return a ? a.textContent.trim() : ''; };
+return [first.textContent.trim(), cells[0].textContent.trim(), team(cells[1]), team(cells[3])];
+"""
+
 # --- URLs des saisons ---
-SEASONS_URLS = {
-    "2023/2024": "https://footystats.org/morocco/botola-pro/matches?season_id=9102",
-    "2022/2023": "https://footystats.org/morocco/botola-pro/matches?season_id=8223",
-    "2021/2022": "https://footystats.org/morocco/botola-pro/matches?season_id=7235"
-}
+# (construites à partir de [SCRAPER] BASE_URL de config.ini)
+SEASONS_URLS = settings.season_urls()
+
+def create_uc_driver(user_data_dir: str = None) -> uc.Chrome:
+    """Lance undetected-chromedriver avec un profil persistant (cookies Cloudflare conservés)."""
+    options = uc.ChromeOptions()
+    return uc.Chrome(options=options, user_data_dir=user_data_dir)
 
 def initialize_driver() -> uc.Chrome:
     """Initialise le WebDriver pour Chrome avec undetected-chromedriver."""
     logger.info("Initialisation du driver Chrome avec undetected-chromedriver...")
     try:
-        options = uc.ChromeOptions()
-        driver = uc.Chrome(options=options)
+        # Même profil que le premier slot du pool: les cookies sont partagés entre les modes
+        driver = create_uc_driver(profile_dir("footystats_0"))
         logger.info("Driver Chrome initialisé avec succès.")
         return driver
     except Exception as e:
         logger.error(f"Erreur critique: Impossible de lancer le navigateur. {e}")
         return None
 
-def scrape_all_seasons(driver: uc.Chrome, seasons: Dict[str, str]) -> pd.DataFrame:
-    """Scrape toutes les saisons en tentant de contourner les protections anti-bot."""
-    all_matches = []
-    
-    for season_name, url in seasons.items():
-        logger.info(f"\n--- Démarrage du scraping pour la saison {season_name} ---")
+def last_row_is_known(driver: uc.Chrome, season_name: str, incremental: IncrementalFilter) -> bool:
+    """
+    True si la table va du plus récent au plus ancien et que sa dernière ligne est
+    déjà stockée et antérieure au high-water mark (les pages suivantes ne
+    contiennent que des matchs connus). Dans une table chronologique, les
+    nouveaux matchs sont sur les dernières pages: toujours False.
+    """
+    rows = driver.execute_script(LAST_ROW_JS, MATCH_ROWS_SELECTOR)
+    if not rows:
+        return False
+    first_date, last_row = rows[0], rows[1:]
+    return (date_order(first_date, last_row[0]) == NEWEST_FIRST
+            and incremental.is_settled(season_name, *last_row))
+
+def scrape_season(driver: uc.Chrome, season_name: str, url: str,
+                  replayer: LoadMoreReplayer = None, incremental: IncrementalFilter = None) -> List[Dict]:
+    """
+    Scrape une saison avec le driver fourni (liste vide en cas d'échec).
+
+    Args:
+        replayer (LoadMoreReplayer): Si fourni, les pages "Voir plus" sont
+            récupérées en HTTP au lieu de cliquer jusqu'au bout
+        incremental (IncrementalFilter): Si fourni, le chargement s'arrête dès
+            les lignes déjà connues et seuls les matchs nouveaux/modifiés sont retournés
+    """
+    logger.info(f"\n--- Démarrage du scraping pour la saison {season_name} ---")
+    # Débit partagé avec les autres navigateurs du pool et les pages "Voir plus" en HTTP
+    shared_limiter().acquire(url)
+    start = time.perf_counter()
+    with timer('fetch'):
         driver.get(url)
+    incr('requests')
 
-        # --- ATTENTE DU CHARGEMENT DE LA PAGE ---
-        logger.info("Tentative de contournement de la protection anti-bot...")
-        logger.info("Attente du chargement de la table des matchs (max 2 minutes)...")
-        
-        try:
+    # --- ATTENTE DU CHARGEMENT DE LA PAGE ---
+    logger.info("Tentative de contournement de la protection anti-bot...")
+    logger.info("Attente du chargement de la table des matchs (max 2 minutes)...")
+    
+    try:
+        with timer('wait'):
             WebDriverWait(driver, 120).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "table.matches-table tbody tr"))
             )
-            logger.info("Table des matchs détectée. Poursuite du scraping.")
-        except TimeoutException:
-            logger.error(f"Timeout : La table des matchs ne s'est pas chargée après 2 minutes pour la saison {season_name}.")
-            logger.error("La protection anti-bot a peut-être bloqué l'accès. Passage à la saison suivante.")
-            continue
-
-        # --- Clic sur "Voir plus" ---
-        while True:
-            try:
-                load_more_button = WebDriverWait(driver, 5).until(EC.element_to_be_clickable((By.CSS_SELECTOR, "div.load_more a")))
-                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", load_more_button)
-                time.sleep(1)
-                driver.execute_script("arguments[0].click();", load_more_button)
-                logger.info("Bouton 'Voir plus' cliqué. Attente du chargement...")
-                time.sleep(3)
-            except TimeoutException:
+        logger.info("Table des matchs détectée. Poursuite du scraping.")
+        shared_limiter().feedback(url, 200, time.perf_counter() - start)
+    except TimeoutException:
+        # Page de vérification anti-bot toujours affichée: traité comme une surcharge
+        shared_limiter().feedback(url, 429)
+        logger.error(f"Timeout : La table des matchs ne s'est pas chargée après 2 minutes pour la saison {season_name}.")
+        logger.error("La protection anti-bot a peut-être bloqué l'accès. Passage à la saison suivante.")
+        return []
+
+    # --- "Voir plus" rejoué en HTTP ---
+    if replayer is not None:
+        season_matches = replayer.scrape(driver, season_name)
+        if season_matches is not None:
+            incr('rows', len(season_matches))
+            logger.info(f"{len(season_matches)} matchs trouvés pour la saison {season_name}.")
+            return tag_season(season_matches, season_name, incremental)
+
+    # --- Clic sur "Voir plus" ---
+    # Attente conditionnelle: nouvelles lignes affichées ou bouton disparu
+    load_start = time.perf_counter()
+    clicks = 0
+    while True:
+        try:
+            load_more_button = find_load_more(driver)
+            if load_more_button is None:
                 logger.info(f"Tous les matchs pour {season_name} sont chargés.")
                 break
-            except Exception as e:
-                logger.error(f"Erreur en cliquant sur 'Voir plus': {e}. Arrêt pour cette saison.")
+            if incremental is not None and last_row_is_known(driver, season_name, incremental):
+                logger.info(f"Lignes déjà connues atteintes pour {season_name}, arrêt du chargement.")
+                break
+            row_count = count_elements(driver, MATCH_ROWS_SELECTOR)
+            driver.execute_script("arguments[0].scrollIntoView({block: 'center'}); arguments[0].click();", load_more_button)
+            clicks += 1
+            logger.info("Bouton 'Voir plus' cliqué. Attente du chargement...")
+            if wait_for_more_rows(driver, row_count) == row_count and find_load_more(driver) is not None:
+                logger.warning("Le bouton 'Voir plus' ne charge plus de lignes. Arrêt pour cette saison.")
                 break
-        
-        # --- Extraction des données ---
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        match_rows = soup.select("table.matches-table tbody tr")
-        logger.info(f"{len(match_rows)} matchs trouvés pour la saison {season_name}.")
-
-        for row in match_rows:
-            cells = row.find_all('td')
-            if len(cells) > 3:
-                date = cells[0].get_text(strip=True)
-                home_team = cells[1].select_one("a.team-name").get_text(strip=True) if cells[1].select_one("a.team-name") else ""
-                score = cells[2].select_one("a").get_text(strip=True) if cells[2].select_one("a") else ""
-                away_team = cells[3].select_one("a.team-name").get_text(strip=True) if cells[3].select_one("a.team-name") else ""
-                
-                if home_team and away_team and score:
-                    all_matches.append({'season': season_name, 'date': date, 'home_team': home_team, 'away_team': away_team, 'score': score})
+        except Exception as e:
+            logger.error(f"Erreur en cliquant sur 'Voir plus': {e}. Arrêt pour cette saison.")
+            break
+
+    elapsed = time.perf_counter() - load_start
+    METRICS.observe('wait', elapsed)
+    fixed_wait = clicks * FIXED_WAIT_PER_CLICK + FIXED_WAIT_FINAL
+    logger.info(f"⏱️  Saison {season_name}: {clicks} clics en {elapsed:.1f}s "
+                f"(attentes fixes: {fixed_wait}s, gain: {fixed_wait - elapsed:.1f}s)")
+    
+    # --- Extraction des données ---
+    html = driver.page_source
+    incr('bytes_downloaded', len(html.encode('utf-8')))
+    # parse_match_rows parse et extrait en un appel: compté dans 'parse'
+    with timer('parse'):
+        season_matches = parse_match_rows(html)
+    incr('rows', len(season_matches))
+    logger.info(f"{len(season_matches)} matchs trouvés pour la saison {season_name}.")
+
+    return tag_season(season_matches, season_name, incremental)
+
+def tag_season(season_matches: List[Dict], season_name: str, incremental: IncrementalFilter = None) -> List[Dict]:
+    """Ajoute la saison aux matchs et, en mode incrémental, ne garde que les nouveaux/modifiés."""
+    if incremental is not None:
+        season_matches = list(incremental.filter(season_matches, season_name))
+        logger.info(f"{len(season_matches)} matchs nouveaux ou modifiés pour la saison {season_name}.")
+    return [{'season': season_name, **match} for match in season_matches]
+
+def scrape_all_seasons(driver: uc.Chrome, seasons: Dict[str, str],
+                       replayer: LoadMoreReplayer = None, incremental: IncrementalFilter = None) -> pd.DataFrame:
+    """Scrape toutes les saisons en tentant de contourner les protections anti-bot."""
+    all_matches = []
+    
+    for season_name, url in seasons.items():
+        all_matches.extend(scrape_season(driver, season_name, url, replayer, incremental))
 
     return pd.DataFrame(all_matches)
 
-def run_footystats_scraper():
-    """Point d'entrée pour le scraping avec FootyStats."""
+def scrape_all_seasons_pooled(pool: DriverPool, seasons: Dict[str, str],
+                              replayer: LoadMoreReplayer = None, incremental: IncrementalFilter = None) -> pd.DataFrame:
+    """Répartit les saisons en parallèle sur les navigateurs libres du pool."""
+    results = pool.map(lambda driver, item: scrape_season(driver, *item, replayer, incremental), seasons.items())
+    return pd.DataFrame([match for season_matches in results for match in season_matches])
+
+def save_matches(final_df: pd.DataFrame, output_file: str = OUTPUT_FILE, incremental: bool = False):
+    """Sauvegarde les matchs scrapés en CSV (None si aucun match)."""
+    with timer('save'):
+        if incremental:
+            append_matches(output_file, final_df)
+        elif final_df.empty:
+            logger.warning("Aucun match n'a été scrapé.")
+            return None
+        else:
+            final_df.to_csv(output_file, index=False, encoding='utf-8')
+            logger.info(f"\n✅ Scraping terminé avec succès!")
+            logger.info(f"Total de {len(final_df)} matchs sauvegardés dans '{output_file}'.")
+        if parquet_enabled():
+            export_csv(output_file)
+        sync_csv(output_file)
+    return output_file
+
+@reported('footystats')
+def run_footystats_scraper(pool_size: int = 1, replay_load_more: bool = False, incremental: bool = False):
+    """
+    Point d'entrée pour le scraping avec FootyStats.
+
+    Args:
+        pool_size (int): Nombre de navigateurs en parallèle (1 = un seul driver)
+        replay_load_more (bool): Récupère les pages "Voir plus" en HTTP (cookies du navigateur)
+        incremental (bool): N'ajoute que les matchs nouveaux/modifiés au CSV existant
+    """
     logger.info("="*50)
     logger.info("Lancement du Scraper Botola Pro (Mode Automatisé)")
     logger.info("="*50)
 
+    replayer = LoadMoreReplayer() if replay_load_more else None
+    incremental_filter = IncrementalFilter.from_csv(OUTPUT_FILE) if incremental else None
+
+    if pool_size > 1:
+        try:
+            with DriverPool(size=pool_size, factory=create_uc_driver, name="footystats") as pool:
+                return save_matches(scrape_all_seasons_pooled(pool, SEASONS_URLS, replayer, incremental_filter),
+                                    incremental=incremental)
+        except Exception as e:
+            logger.error(f"Erreur inattendue: {e}", exc_info=True)
+            return None
+
     driver = initialize_driver()
     if driver is None:
         return None
 
     try:
-        final_df = scrape_all_seasons(driver, SEASONS_URLS)
-        if not final_df.empty:
-            output_file = "botola_matches_all_seasons.csv"
-            final_df.to_csv(output_file, index=False, encoding='utf-8')
-            logger.info(f"\n✅ Scraping terminé avec succès!")
-            logger.info(f"Total de {len(final_df)} matchs sauvegardés dans '{output_file}'.")
-            return output_file
-        else:
-            logger.warning("Aucun match n'a été scrapé.")
-            return None
+        return save_matches(scrape_all_seasons(driver, SEASONS_URLS, replayer, incremental_filter),
+                            incremental=incremental)
     except Exception as e:
         logger.error(f"Erreur inattendue: {e}", exc_info=True)
         return None
@@ -130,7 +255,7 @@ def run_footystats_scraper():
             driver.quit()
 
 def main():
-    run_footystats_scraper()
+    run_footystats_scraper(incremental='--incremental' in sys.argv)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,96 @@
+"""
+ATTENTES SELENIUM CONDITIONNELLES
+=================================
+Remplace les time.sleep() fixes par des attentes sur l'état réel de la page:
+- document prêt et nombre de lignes stable
+- nombre de lignes augmenté / bouton "Voir plus" disparu après un clic
+L'intervalle de sondage est configurable ([SELENIUM] POLL_INTERVAL).
+"""
+
+import logging
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+import settings
+
+logger = logging.getLogger(__name__)
+
+LOAD_MORE_SELECTOR = "div.load_more a"
+MATCH_ROWS_SELECTOR = "table.matches-table tbody tr"
+
+
+def poll_interval() -> float:
+    """Intervalle de sondage configuré (secondes)"""
+    return settings.get_float('SELENIUM', 'POLL_INTERVAL', fallback=0.25)
+
+
+def count_elements(driver, selector: str) -> int:
+    """Compte les éléments côté navigateur (un seul aller-retour)"""
+    return driver.execute_script("return document.querySelectorAll(arguments[0]).length;", selector)
+
+
+def find_load_more(driver, selector: str = LOAD_MORE_SELECTOR):
+    """Retourne le bouton "Voir plus" s'il est visible, sinon None"""
+    try:
+        for element in driver.find_elements("css selector", selector):
+            if element.is_displayed():
+                return element
+    except WebDriverException:
+        pass
+    return None
+
+
+def wait_for_rows_stable(driver, selector: str = "tr", timeout: float = 10,
+                         interval: float = None) -> bool:
+    """
+    Attend que le document soit chargé et que le nombre de lignes ne change plus
+    entre deux sondages consécutifs
+
+    Returns:
+        bool: True si la page est stable, False si le délai est dépassé
+    """
+    last_count = [-1]
+
+    def rows_stable(d):
+        if d.execute_script("return document.readyState;") != "complete":
+            return False
+        count = count_elements(d, selector)
+        stable = count > 0 and count == last_count[0]
+        last_count[0] = count
+        return stable
+
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=interval or poll_interval()).until(rows_stable)
+        return True
+    except TimeoutException:
+        return False
+
+
+def wait_for_more_rows(driver, previous_count: int, selector: str = MATCH_ROWS_SELECTOR,
+                       timeout: float = None, interval: float = None) -> int:
+    """
+    Attend, après un clic sur "Voir plus", que de nouvelles lignes apparaissent
+    ou que le bouton disparaisse
+
+    Args:
+        previous_count (int): Nombre de lignes avant le clic
+
+    Returns:
+        int: Nouveau nombre de lignes (égal à previous_count si rien n'a changé)
+    """
+    if timeout is None:
+        timeout = settings.get_float('SELENIUM', 'LOAD_MORE_TIMEOUT', fallback=15)
+
+    def loaded(d):
+        count = count_elements(d, selector)
+        if count > previous_count or find_load_more(d) is None:
+            return (count,)  # tuple: toujours "vrai", même pour 0 ligne
+        return False
+
+    try:
+        (count,) = WebDriverWait(driver, timeout, poll_frequency=interval or poll_interval()).until(loaded)
+        return count
+    except TimeoutException:
+        logger.warning(f"Aucune nouvelle ligne après {timeout:.0f}s")
+        return previous_count
@@ -0,0 +1,62 @@
+"""
+CONFIGURATION - Lecture de config.ini
+=====================================
+Accès centralisé aux paramètres du projet, avec valeurs par défaut si la
+clé (ou le fichier) est absente.
+"""
+
+import configparser
+import functools
+from pathlib import Path
+from typing import Dict
+from urllib.parse import urlparse
+
+CONFIG_PATH = Path(__file__).with_name('config.ini')
+
+DEFAULT_BASE_URL = 'https://footystats.org/morocco/botola-pro'
+# Identifiants FootyStats des saisons (paramètre season_id de la page des matchs)
+SEASON_IDS = {
+    '2023/2024': 9102,
+    '2022/2023': 8223,
+    '2021/2022': 7235,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def load_config(path: str = None) -> configparser.ConfigParser:
+    """Charge config.ini une seule fois (sans interpolation: FORMAT contient des %)"""
+    config = configparser.ConfigParser(interpolation=None)
+    config.read(path or CONFIG_PATH, encoding='utf-8')
+    return config
+
+
+def get_str(section: str, key: str, fallback: str = None) -> str:
+    return load_config().get(section, key, fallback=fallback)
+
+
+def get_float(section: str, key: str, fallback: float = None) -> float:
+    return load_config().getfloat(section, key, fallback=fallback)
+
+
+def get_int(section: str, key: str, fallback: int = None) -> int:
+    return load_config().getint(section, key, fallback=fallback)
+
+
+def get_bool(section: str, key: str, fallback: bool = None) -> bool:
+    return load_config().getboolean(section, key, fallback=fallback)
+
+
+def base_url() -> str:
+    """URL de base de la ligue ([SCRAPER] BASE_URL), ex: serveur local de mock_server.py"""
+    return get_str('SCRAPER', 'BASE_URL', DEFAULT_BASE_URL).rstrip('/')
+
+
+def site_root() -> str:
+    """Racine du site de base_url() (requête de préchauffage des cookies)"""
+    parts = urlparse(base_url())
+    return f"{parts.scheme}://{parts.netloc}/"
+
+
+def season_urls() -> Dict[str, str]:
+    """{saison: URL de la page des matchs} construites à partir de base_url()"""
+    return {season: f"{base_url()}/matches?season_id={season_id}" for season, season_id in SEASON_IDS.items()}
@@ -0,0 +1,209 @@
+"""
+SIMULATION MONTE CARLO DE FIN DE SAISON
+=======================================
+À partir des matchs joués et des matrices de scores des matchs restants:
+- tous les scores de toutes les simulations sont tirés en un seul
+  np.searchsorted sur les distributions cumulées concaténées
+- points / différence de buts / buts marqués cumulés par np.bincount
+- classements triés par simulation (tableau (simulations, équipes)) avec le
+  départage de standings.py (confrontations directes des équipes à égalité
+  de points, sur les matchs joués et simulés), puis tirage au sort
+- simulations réparties en lots de taille fixe sur un pool de processus,
+  graines dérivées par SeedSequence (résultats identiques quel que soit le
+  nombre de processus)
+Sorties: points attendus, probabilités de titre, de relégation et de chaque place.
+
+Usage:
+    python simulator.py [saison] [--sims 20000] [--seed 42] [--workers 4]
+"""
+
+import os
+import sys
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from standings import head_to_head_totals, ranking_order
+from storage import normalize_matches
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIMULATIONS = 20000
+SHARD_SIZE = 5000
+TITLE_SPOTS = 1
+# Botola Pro: 16 clubs, deux relégués
+RELEGATION_SPOTS = 2
+
+
+def played_arrays(played: pd.DataFrame, teams: Sequence[str]) -> Tuple[np.ndarray, ...]:
+    """Matchs joués encodés: indices des équipes et buts (home, away, x, y)"""
+    typed = normalize_matches(played)
+    typed = typed[typed['home_goals'].notna() & typed['away_goals'].notna()]
+    index = pd.Index(teams)
+    return (index.get_indexer(typed['home_team'].astype(str)), index.get_indexer(typed['away_team'].astype(str)),
+            typed['home_goals'].to_numpy(dtype='int64'), typed['away_goals'].to_numpy(dtype='int64'))
+
+
+def current_table(played: pd.DataFrame, teams: Sequence[str]) -> np.ndarray:
+    """Points, différence de buts et buts marqués des matchs joués, shape (3, équipes)"""
+    home, away, x, y = played_arrays(played, teams)
+    n = len(teams)
+
+    home_points = np.where(x > y, 3, np.where(x == y, 1, 0))
+    away_points = np.where(y > x, 3, np.where(x == y, 1, 0))
+    points = np.bincount(home, home_points, n) + np.bincount(away, away_points, n)
+    goal_diff = np.bincount(home, x - y, n) + np.bincount(away, y - x, n)
+    goals_for = np.bincount(home, x, n) + np.bincount(away, y, n)
+    return np.vstack([points, goal_diff, goals_for])
+
+
+def _simulate_shard(args: tuple) -> Dict[str, np.ndarray]:
+    """Simule un lot de saisons; retourne les sommes (places, points) du lot"""
+    base, played, home, away, cumulative, n_goals, n_sims, seed = args
+    rng = np.random.default_rng(seed)
+    n_teams = base.shape[1]
+    n_matches, n_scores = cumulative.shape
+
+    # Tirage de tous les scores: les distributions cumulées de chaque match sont
+    # décalées de j (match j dans [j, j + 1]) et concaténées, un seul searchsorted
+    offsets = np.arange(n_matches)
+    flat = (cumulative + offsets[:, None]).ravel()
+    draws = np.searchsorted(flat, rng.random((n_sims, n_matches)) + offsets, side='right')
+    draws = np.minimum(draws - offsets * n_scores, n_scores - 1)
+    x, y = np.divmod(draws, n_goals)
+
+    home_points = np.where(x > y, 3, np.where(x == y, 1, 0))
+    away_points = np.where(y > x, 3, np.where(x == y, 1, 0))
+    sim_offset = (np.arange(n_sims) * n_teams)[:, None]
+    home_slot = (sim_offset + home).ravel()
+    away_slot = (sim_offset + away).ravel()
+    size = n_sims * n_teams
+
+    def accumulate(home_values, away_values):
+        return (np.bincount(home_slot, home_values.ravel(), size)
+                + np.bincount(away_slot, away_values.ravel(), size)).reshape(n_sims, n_teams)
+
+    points = base[0] + accumulate(home_points, away_points)
+    goal_diff = base[1] + accumulate(x - y, y - x)
+    goals_for = base[2] + accumulate(x, y)
+
+    # Classement (règle de standings.py): confrontations directes sur les matchs joués et simulés
+    played_home, played_away, played_x, played_y = played
+    all_home = np.concatenate([played_home, home])
+    all_away = np.concatenate([played_away, away])
+    all_x = np.hstack([np.broadcast_to(played_x, (n_sims, len(played_x))), x])
+    all_y = np.hstack([np.broadcast_to(played_y, (n_sims, len(played_y))), y])
+    h2h_points, h2h_goal_diff = head_to_head_totals(points, all_home, all_away, all_x, all_y)
+    key = ranking_order(points, h2h_points, h2h_goal_diff, goal_diff, goals_for, rng.random((n_sims, n_teams)))
+    positions = np.empty_like(key)
+    np.put_along_axis(positions, key, np.arange(n_teams)[None, :], axis=1)
+
+    position_counts = np.bincount((np.arange(n_teams)[None, :] * n_teams + positions).ravel(),
+                                  minlength=n_teams * n_teams).reshape(n_teams, n_teams)
+    return {'positions': position_counts, 'points': points.sum(axis=0), 'n': n_sims}
+
+
+def simulate_season(played: pd.DataFrame, fixtures: pd.DataFrame, matrices: np.ndarray,
+                    n_sims: int = DEFAULT_SIMULATIONS, seed: int = None, workers: int = None,
+                    title_spots: int = TITLE_SPOTS, relegation_spots: int = RELEGATION_SPOTS) -> pd.DataFrame:
+    """
+    Simule la fin de saison
+
+    Args:
+        played (pd.DataFrame): Matchs déjà joués de la saison
+        fixtures (pd.DataFrame): Matchs restants (home_team, away_team)
+        matrices (np.ndarray): Probabilités des scores des matchs restants, shape (n, G, G)
+        n_sims (int): Nombre de simulations
+        seed (int): Graine (reproductible pour une même graine, quel que soit workers)
+        workers (int): Processus (1 = processus courant)
+
+    Returns:
+        pd.DataFrame: Une ligne par équipe: current_points, expected_points,
+        p_title, p_relegation, pos_1..pos_N (trié par points attendus)
+    """
+    teams = sorted(set(played['home_team'].astype(str)) | set(played['away_team'].astype(str))
+                   | set(fixtures['home_team'].astype(str)) | set(fixtures['away_team'].astype(str)))
+    index = pd.Index(teams)
+    home = index.get_indexer(fixtures['home_team'].astype(str))
+    away = index.get_indexer(fixtures['away_team'].astype(str))
+    base = current_table(played, teams)
+    played_matches = played_arrays(played, teams)
+
+    n_goals = matrices.shape[1]
+    probs = matrices.reshape(len(matrices), -1)
+    cumulative = np.cumsum(probs / probs.sum(axis=1, keepdims=True), axis=1)
+
+    sizes = [SHARD_SIZE] * (n_sims // SHARD_SIZE) + ([n_sims % SHARD_SIZE] if n_sims % SHARD_SIZE else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    shards = [(base, played_matches, home, away, cumulative, n_goals, size, child)
+              for size, child in zip(sizes, seeds)]
+
+    workers = min(workers or os.cpu_count() or 1, len(shards))
+    logger.info(f"🎲 {n_sims} simulations de {len(fixtures)} matchs ({len(shards)} lots, {workers} processus)")
+    if workers == 1:
+        results = [_simulate_shard(shard) for shard in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_simulate_shard, shards))
+
+    positions = sum(result['positions'] for result in results) / n_sims
+    expected_points = sum(result['points'] for result in results) / n_sims
+    n_teams = len(teams)
+    table = pd.DataFrame({
+        'team': teams,
+        'current_points': base[0],
+        'expected_points': expected_points,
+        'p_title': positions[:, :title_spots].sum(axis=1),
+        'p_relegation': positions[:, n_teams - relegation_spots:].sum(axis=1),
+    })
+    for place in range(n_teams):
+        table[f'pos_{place + 1}'] = positions[:, place]
+    return table.sort_values('expected_points', ascending=False).reset_index(drop=True)
+
+
+def simulate_from_history(history: pd.DataFrame, season: str = None, predictor=None, **kwargs) -> pd.DataFrame:
+    """
+    Simule la fin d'une saison de l'historique (la plus récente par défaut)
+
+    Les matchs sans score de la saison sont les matchs restants; leurs matrices
+    de scores viennent du modèle Dixon-Coles du prédicteur partagé.
+    """
+    from predict import get_predictor
+
+    season = season or sorted(history['season'].astype(str).unique())[-1]
+    season_df = history[history['season'].astype(str) == season]
+    goals = normalize_matches(season_df)[['home_goals', 'away_goals']]
+    remaining = goals.isna().any(axis=1)
+    played, fixtures = season_df[~remaining], season_df[remaining]
+
+    predictor = predictor or get_predictor()
+    matrices = predictor.poisson.score_matrices(fixtures['home_team'].astype(str).to_numpy(),
+                                                fixtures['away_team'].astype(str).to_numpy())
+    logger.info(f"📅 Saison {season}: {len(played)} matchs joués, {len(fixtures)} restants")
+    return simulate_season(played, fixtures, matrices, **kwargs)
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Simulation Monte Carlo de fin de saison")
+    parser.add_argument('season', nargs='?', help="Saison (la plus récente par défaut)")
+    parser.add_argument('--sims', type=int, default=DEFAULT_SIMULATIONS)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    from predict import get_predictor
+    predictor = get_predictor()
+    table = simulate_from_history(predictor.history, args.season, predictor,
+                                  n_sims=args.sims, seed=args.seed, workers=args.workers)
+    columns = ['team', 'current_points', 'expected_points', 'p_title', 'p_relegation']
+    print(table[columns].to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    return table
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main(sys.argv[1:])
@@ -0,0 +1,242 @@
+"""
+CLASSEMENTS
+===========
+- standings(df, as_of): classement de chaque saison à une date donnée
+  (agrégation groupby), départage Botola: points, points en confrontations
+  directes, différence de buts particulière, différence de buts générale,
+  buts marqués
+- standings_by_matchday(df): classement après chaque journée, calculé en un
+  passage par sommes cumulées (pas de recalcul complet par date), avec le
+  même départage
+- head_to_head_totals() / ranking_order(): règle de classement vectorisée
+  partagée avec simulator.py (un classement par journée ou par simulation)
+"""
+
+import sys
+import logging
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from storage import normalize_matches
+
+logger = logging.getLogger(__name__)
+
+TABLE_COLUMNS = ['played', 'won', 'drawn', 'lost', 'goals_for', 'goals_against', 'goal_diff', 'points']
+# Jours sans match à partir desquels une nouvelle journée commence
+ROUND_GAP_DAYS = 3
+# Numéro de journée fourni par les données (prioritaire sur les écarts de dates)
+ROUND_COLUMN = 'round'
+
+
+def head_to_head_totals(points: np.ndarray, home: np.ndarray, away: np.ndarray, x: np.ndarray, y: np.ndarray,
+                        active: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Points et différence de buts des confrontations directes entre équipes à égalité de points
+
+    Un match compte quand ses deux équipes ont le même nombre de points: on
+    obtient le mini-classement de chaque groupe d'équipes à égalité, pour
+    plusieurs classements à la fois (axes de tête: journées, simulations).
+
+    Args:
+        points (np.ndarray): Points de chaque classement, shape (..., équipes)
+        home, away (np.ndarray): Indices des équipes de chaque match, shape (matchs,) ou (..., matchs)
+        x, y (np.ndarray): Buts domicile / extérieur, même forme que home
+        active (np.ndarray): Matchs pris en compte par classement (tous par défaut)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (points, différence de buts) particuliers, shape de points
+    """
+    points = np.asarray(points)
+    n_teams = points.shape[-1]
+    lead = points.shape[:-1]
+    n_matches = np.shape(home)[-1]
+    flat = points.reshape(-1, n_teams)
+    n_tables = len(flat)
+
+    def spread(values):
+        return np.broadcast_to(values, lead + (n_matches,)).reshape(n_tables, n_matches)
+
+    home, away, x, y = spread(home), spread(away), spread(x), spread(y)
+    tied = np.take_along_axis(flat, home, axis=1) == np.take_along_axis(flat, away, axis=1)
+    if active is not None:
+        tied &= spread(active)
+    home_points = np.where(x > y, 3, np.where(x == y, 1, 0)) * tied
+    away_points = np.where(y > x, 3, np.where(x == y, 1, 0)) * tied
+    goal_diff = (x - y) * tied
+
+    offset = (np.arange(n_tables) * n_teams)[:, None]
+    home_slot, away_slot = (offset + home).ravel(), (offset + away).ravel()
+    size = n_tables * n_teams
+    h2h_points = (np.bincount(home_slot, home_points.ravel(), size)
+                  + np.bincount(away_slot, away_points.ravel(), size))
+    h2h_goal_diff = (np.bincount(home_slot, goal_diff.ravel(), size)
+                     - np.bincount(away_slot, goal_diff.ravel(), size))
+    return h2h_points.reshape(points.shape), h2h_goal_diff.reshape(points.shape)
+
+
+def ranking_order(points, h2h_points, h2h_goal_diff, goal_diff, goals_for, last) -> np.ndarray:
+    """
+    Indices des équipes de la première à la dernière place (dernier axe), départage Botola:
+    points, points particuliers, différence de buts particulière, différence
+    de buts, buts marqués, puis `last` (ordre alphabétique, tirage au sort)
+    """
+    return np.lexsort((last, -np.asarray(goals_for), -np.asarray(goal_diff), -np.asarray(h2h_goal_diff),
+                       -np.asarray(h2h_points), -np.asarray(points)), axis=-1)
+
+
+def _match_arrays(matches: pd.DataFrame, teams: pd.Index) -> Tuple[np.ndarray, ...]:
+    """Indices des équipes et buts des matchs (home, away, x, y)"""
+    return (teams.get_indexer(matches['home_team']), teams.get_indexer(matches['away_team']),
+            matches['home_goals'].to_numpy(dtype='int64'), matches['away_goals'].to_numpy(dtype='int64'))
+
+
+def assign_matchdays(df: pd.DataFrame) -> pd.Series:
+    """
+    Numéro de journée, à partir de 1 dans chaque saison
+
+    Colonne ROUND_COLUMN des données si elle est renseignée partout; sinon une
+    journée regroupe des dates proches et une nouvelle journée commence après
+    au moins ROUND_GAP_DAYS jours sans match (une journée du vendredi au lundi
+    reste une seule journée, le vendredi suivant en ouvre une nouvelle).
+    """
+    seasons = df['season'].astype(str)
+    if ROUND_COLUMN in df.columns:
+        rounds = pd.to_numeric(df[ROUND_COLUMN], errors='coerce')
+        if rounds.notna().all():
+            return rounds.groupby(seasons).rank(method='dense').astype('Int64')
+
+    days = pd.DataFrame({'season': seasons, 'day': pd.to_datetime(df['date'], errors='coerce').dt.normalize()})
+    calendar = days.dropna().drop_duplicates().sort_values(['season', 'day'])
+    gaps = calendar.groupby('season')['day'].diff()
+    # Écart de n jours entre deux dates = n - 1 jours sans match
+    new_round = gaps.isna() | (gaps > pd.Timedelta(days=ROUND_GAP_DAYS))
+    calendar['matchday'] = new_round.astype('int64').groupby(calendar['season']).cumsum()
+    matchdays = days.merge(calendar, on=['season', 'day'], how='left')['matchday']
+    return pd.Series(matchdays.to_numpy(), index=df.index, name='matchday').astype('Int64')
+
+
+def with_rounds(typed: pd.DataFrame, df: pd.DataFrame) -> pd.DataFrame:
+    """Reporte la colonne ROUND_COLUMN de df (absente du schéma) sur sa version typée"""
+    if ROUND_COLUMN in df.columns:
+        typed[ROUND_COLUMN] = df[ROUND_COLUMN].to_numpy()
+    return typed
+
+
+def _played_matches(df: pd.DataFrame, as_of=None) -> pd.DataFrame:
+    typed = with_rounds(normalize_matches(df), df)
+    typed = typed[typed['home_goals'].notna() & typed['away_goals'].notna()]
+    if as_of is not None:
+        typed = typed[typed['date'] <= pd.Timestamp(as_of)]
+    for col in ('season', 'home_team', 'away_team'):
+        typed[col] = typed[col].astype(str)
+    return typed
+
+
+def _team_rows(matches: pd.DataFrame) -> pd.DataFrame:
+    """Vue longue: une ligne par (match, équipe) avec les colonnes du classement"""
+    x = matches['home_goals'].astype('int64').to_numpy()
+    y = matches['away_goals'].astype('int64').to_numpy()
+    sides = []
+    for team_col, goals_for, goals_against in (('home_team', x, y), ('away_team', y, x)):
+        sides.append(pd.DataFrame({
+            'season': matches['season'].to_numpy(),
+            'team': matches[team_col].to_numpy(),
+            'date': matches['date'].to_numpy(),
+            'played': 1,
+            'won': (goals_for > goals_against).astype('int64'),
+            'drawn': (goals_for == goals_against).astype('int64'),
+            'lost': (goals_for < goals_against).astype('int64'),
+            'goals_for': goals_for,
+            'goals_against': goals_against,
+        }))
+    rows = pd.concat(sides, ignore_index=True)
+    rows['goal_diff'] = rows['goals_for'] - rows['goals_against']
+    rows['points'] = 3 * rows['won'] + rows['drawn']
+    return rows
+
+
+def standings(df: pd.DataFrame, as_of=None, season: str = None) -> pd.DataFrame:
+    """
+    Classement de chaque saison (ou d'une seule) avec les matchs joués jusqu'à as_of inclus
+
+    Returns:
+        pd.DataFrame: season, position, team, played, won, drawn, lost,
+        goals_for, goals_against, goal_diff, points
+    """
+    matches = _played_matches(df, as_of)
+    if season is not None:
+        matches = matches[matches['season'] == str(season)]
+    if matches.empty:
+        return pd.DataFrame(columns=['season', 'position', 'team'] + TABLE_COLUMNS)
+
+    tables = []
+    for season_name, season_matches in matches.groupby('season', sort=True):
+        table = _team_rows(season_matches).groupby('team')[TABLE_COLUMNS].sum()
+        h2h_points, h2h_goal_diff = head_to_head_totals(table['points'].to_numpy(),
+                                                        *_match_arrays(season_matches, table.index))
+        order = ranking_order(table['points'], h2h_points, h2h_goal_diff, table['goal_diff'],
+                              table['goals_for'], np.arange(len(table)))
+        table = table.iloc[order].reset_index()
+        table.insert(0, 'season', season_name)
+        table.insert(1, 'position', np.arange(1, len(table) + 1))
+        tables.append(table)
+    return pd.concat(tables, ignore_index=True)[['season', 'position', 'team'] + TABLE_COLUMNS]
+
+
+def standings_by_matchday(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Classement après chaque journée de chaque saison, en un seul passage
+
+    Les totaux par (équipe, journée) sont complétés à zéro pour les journées
+    sans match puis cumulés; toutes les journées d'une saison sont classées
+    ensemble avec le départage de standings (confrontations directes des
+    matchs joués jusqu'à la journée): la dernière journée donne le même
+    classement que standings().
+
+    Returns:
+        pd.DataFrame: season, matchday, position, team + colonnes du classement
+    """
+    matches = _played_matches(df)
+    if matches.empty:
+        return pd.DataFrame(columns=['season', 'matchday', 'position', 'team'] + TABLE_COLUMNS)
+    matches['matchday'] = assign_matchdays(matches).to_numpy()
+    rows = _team_rows(matches)
+    rows['matchday'] = np.concatenate([matches['matchday'].to_numpy()] * 2)
+
+    tables = []
+    for season, season_rows in rows.groupby('season', sort=True):
+        per_day = season_rows.groupby(['matchday', 'team'])[TABLE_COLUMNS].sum()
+        # Grille complète (journée, équipe) pour reporter les totaux des journées sans match
+        days = np.sort(season_rows['matchday'].unique())
+        teams = pd.Index(sorted(season_rows['team'].unique()))
+        grid = pd.MultiIndex.from_product([days, teams], names=['matchday', 'team'])
+        cumulative = per_day.reindex(grid, fill_value=0).groupby(level='team').cumsum()
+        wide = {col: cumulative[col].unstack('team').reindex(columns=teams).to_numpy() for col in TABLE_COLUMNS}
+
+        season_matches = matches[matches['season'] == season]
+        active = season_matches['matchday'].to_numpy()[None, :] <= days[:, None]
+        h2h_points, h2h_goal_diff = head_to_head_totals(wide['points'], *_match_arrays(season_matches, teams),
+                                                        active=active)
+        order = ranking_order(wide['points'], h2h_points, h2h_goal_diff, wide['goal_diff'], wide['goals_for'],
+                              np.broadcast_to(np.arange(len(teams)), wide['points'].shape))
+
+        table = pd.DataFrame({col: np.take_along_axis(values, order, axis=1).ravel()
+                              for col, values in wide.items()})
+        table.insert(0, 'season', season)
+        table.insert(1, 'matchday', np.repeat(days, len(teams)))
+        table.insert(2, 'position', np.tile(np.arange(1, len(teams) + 1), len(days)))
+        table.insert(3, 'team', teams.to_numpy()[order].ravel())
+        tables.append(table)
+    return pd.concat(tables, ignore_index=True)[['season', 'matchday', 'position', 'team'] + TABLE_COLUMNS]
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    # Usage: python standings.py [matches.csv] [date]
+    source = sys.argv[1] if len(sys.argv) > 1 else 'botola_matches.csv'
+    date = sys.argv[2] if len(sys.argv) > 2 else None
+    for season_name, season_table in standings(pd.read_csv(source), as_of=date).groupby('season'):
+        print(f"\n🏆 {season_name}")
+        print(season_table.drop(columns='season').to_string(index=False))
@@ -0,0 +1,184 @@
+"""
+STOCKAGE PARQUET - Matchs typés et partitionnés par saison
+==========================================================
+Alternative colonnaire au CSV:
+- schéma explicite (équipes catégorielles, buts int8, xG float32, date datetime64)
+- un fichier Parquet par saison sous data/matches/
+- projection (colonnes) et prédicats (filtres) appliqués à la lecture
+"""
+
+import re
+import logging
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+DEFAULT_ROOT = Path(settings.get_str('DATA', 'OUTPUT_DIR', fallback='data')) / 'matches'
+
+# Types pandas de chaque colonne (les entiers sont nullables: score absent = <NA>)
+COLUMN_DTYPES = {
+    'date': 'datetime64[ns]',
+    'time': 'string',
+    'home_team': 'category',
+    'away_team': 'category',
+    'score': 'string',
+    'home_goals': 'Int8',
+    'away_goals': 'Int8',
+    'xg_home': 'float32',
+    'xg_away': 'float32',
+    'shots_home': 'Int16',
+    'shots_away': 'Int16',
+    'possession_home': 'Int8',
+    'possession_away': 'Int8',
+    'match_url': 'string',
+    'season': 'category',
+}
+
+SCORE_PATTERN = r'^\s*(\d+)\s*-\s*(\d+)\s*$'
+
+
+def _require_pyarrow():
+    if not HAS_PYARROW:
+        raise ImportError("pyarrow est requis pour le stockage Parquet (pip install pyarrow)")
+
+
+def arrow_schema() -> 'pa.Schema':
+    """Schéma Arrow explicite des matchs"""
+    _require_pyarrow()
+    team = pa.dictionary(pa.int16(), pa.string())
+    return pa.schema([
+        ('date', pa.timestamp('ms')),
+        ('time', pa.string()),
+        ('home_team', team),
+        ('away_team', team),
+        ('score', pa.string()),
+        ('home_goals', pa.int8()),
+        ('away_goals', pa.int8()),
+        ('xg_home', pa.float32()),
+        ('xg_away', pa.float32()),
+        ('shots_home', pa.int16()),
+        ('shots_away', pa.int16()),
+        ('possession_home', pa.int8()),
+        ('possession_away', pa.int8()),
+        ('match_url', pa.string()),
+        ('season', pa.dictionary(pa.int8(), pa.string())),
+    ])
+
+
+def normalize_matches(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convertit un DataFrame de scraper (chaînes, '' pour les valeurs absentes) vers les types du schéma
+
+    Les colonnes absentes sont ajoutées vides; les buts manquants sont déduits
+    du score ("2-1") quand c'est possible.
+    """
+    df = df.copy()
+    for col in COLUMN_DTYPES:
+        if col not in df.columns:
+            df[col] = np.nan
+
+    if 'score' in df.columns:
+        goals = df['score'].astype('string').str.extract(SCORE_PATTERN)
+        for col, parsed in (('home_goals', goals[0]), ('away_goals', goals[1])):
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(pd.to_numeric(parsed, errors='coerce'))
+
+    df['date'] = pd.to_datetime(df['date'], errors='coerce').astype('datetime64[ns]')
+    for col, dtype in COLUMN_DTYPES.items():
+        if col == 'date':
+            continue
+        if dtype in ('Int8', 'Int16', 'float32'):
+            values = pd.to_numeric(df[col].replace('', np.nan), errors='coerce')
+            df[col] = values.round() if dtype != 'float32' else values
+        elif dtype == 'string':
+            df[col] = df[col].where(df[col].notna(), None)
+        df[col] = df[col].astype(dtype)
+
+    return df[list(COLUMN_DTYPES)]
+
+
+def season_slug(season: str) -> str:
+    """Nom de fichier d'une saison ("2023/2024" -> "2023-2024")"""
+    return re.sub(r'[^0-9A-Za-z_-]+', '-', str(season)).strip('-')
+
+
+def save_matches(df: pd.DataFrame, root: str = None) -> List[Path]:
+    """
+    Écrit un fichier Parquet par saison (les saisons présentes dans df sont remplacées)
+
+    Returns:
+        List[Path]: Fichiers écrits
+    """
+    _require_pyarrow()
+    root = Path(root or DEFAULT_ROOT)
+    root.mkdir(parents=True, exist_ok=True)
+    typed = normalize_matches(df)
+    schema = arrow_schema()
+
+    written = []
+    for season, season_df in typed.groupby('season', observed=True):
+        table = pa.Table.from_pandas(season_df.sort_values('date'), schema=schema, preserve_index=False)
+        path = root / f"season={season_slug(season)}.parquet"
+        pq.write_table(table, path, compression='zstd')
+        written.append(path)
+        logger.info(f"✅ {len(season_df)} matchs écrits dans {path}")
+    return written
+
+
+def load_matches(root: str = None, columns: List[str] = None, filters=None) -> pd.DataFrame:
+    """
+    Charge les matchs avec projection et prédicats poussés au lecteur Parquet
+
+    Args:
+        root (str): Répertoire des fichiers Parquet
+        columns (List[str]): Colonnes à lire (toutes par défaut)
+        filters: Filtres pyarrow, ex: [('season', '=', '2023/2024'), ('home_goals', '>=', 3)]
+
+    Returns:
+        pd.DataFrame: Matchs typés (équipes et saison catégorielles)
+    """
+    _require_pyarrow()
+    root = Path(root or DEFAULT_ROOT)
+    files = sorted(root.glob('season=*.parquet'))
+    if not files:
+        return normalize_matches(pd.DataFrame(columns=list(COLUMN_DTYPES)))[columns or list(COLUMN_DTYPES)]
+
+    schema = arrow_schema()
+    table = pq.read_table([str(path) for path in files], columns=columns, filters=filters, schema=schema)
+    # Entiers nullables côté pandas, comme normalize_matches
+    nullable = {pa.int8(): pd.Int8Dtype(), pa.int16(): pd.Int16Dtype()}
+    df = table.to_pandas(types_mapper=nullable.get)
+    if 'date' in df.columns:
+        df['date'] = df['date'].astype('datetime64[ns]')
+    return df
+
+
+def export_csv(csv_path: str, root: str = None) -> List[Path]:
+    """Convertit un CSV de scraping complet en stockage Parquet"""
+    df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    if df.empty or 'season' not in df.columns:
+        logger.warning(f"⚠️ {csv_path}: aucune donnée exploitable pour Parquet")
+        return []
+    return save_matches(df, root)
+
+
+def has_matches(root: str = None) -> bool:
+    """True si un stockage Parquet existe"""
+    return any(Path(root or DEFAULT_ROOT).glob('season=*.parquet'))
+
+
+def parquet_enabled() -> bool:
+    """True si config.ini demande le format Parquet ([DATA] OUTPUT_FORMAT = parquet)"""
+    return settings.get_str('DATA', 'OUTPUT_FORMAT', fallback='csv').strip().lower() == 'parquet'
@@ -0,0 +1,23 @@
+"""Les modules du projet sont à la racine du dépôt"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def mock_site():
+    """Serveur FootyStats local (port libre, sans latence ni 429)"""
+    from mock_server import MockFootyStats
+    with MockFootyStats(port=0, rows=60, fixtures_dir=os.devnull) as server:
+        yield server
+
+
+@pytest.fixture
+def fast_limiter():
+    """Limiteur de débit qui ne ralentit pas les tests"""
+    from rate_limiter import AdaptiveRateLimiter
+    return AdaptiveRateLimiter(rate=1000, max_rate=1000, burst=100, seed=0)
@@ -0,0 +1,79 @@
+"""Scraper asynchrone: mêmes lignes que le scraper HTTP, cache / 304 et erreurs comme fetch_html"""
+
+import asyncio
+
+import pandas as pd
+import pytest
+
+import settings
+
+pytest.importorskip('httpx')
+pytest.importorskip('requests')
+
+from botola_scraper_async import AsyncBotolaScraper  # noqa: E402
+from botola_scraper_http import BotolaScraper  # noqa: E402
+from match_details import add_match_details  # noqa: E402
+
+
+@pytest.fixture
+def local_site(mock_site, monkeypatch):
+    """Préchauffage et liens relatifs des pages de match vers le serveur local"""
+    root = mock_site.base_url.split('/morocco')[0] + '/'
+    monkeypatch.setattr(settings, 'site_root', lambda: root)
+    return mock_site
+
+
+def season_urls(site):
+    return {'2022/2023': site.base_url + '/matches?season_id=7001',
+            '2023/2024': site.base_url + '/matches?season_id=7002'}
+
+
+def sort_rows(df):
+    return df.sort_values(['season', 'date', 'home_team', 'away_team']).reset_index(drop=True)
+
+
+def test_same_rows_as_http_scraper(tmp_path, local_site, fast_limiter):
+    seasons = season_urls(local_site)
+    http = BotolaScraper(rate_limiter=fast_limiter, cache_dir=str(tmp_path / 'http'))
+    expected = http.scrape_multiple_seasons(seasons)
+    scraper = AsyncBotolaScraper(rate_limiter=fast_limiter, cache_dir=str(tmp_path / 'async'), http2=False)
+    actual = scraper.scrape_multiple_seasons(seasons)
+
+    assert len(actual) == len(expected) == 2 * local_site.page_size
+    assert set(actual.columns) == set(expected.columns)
+    pd.testing.assert_frame_equal(sort_rows(actual), sort_rows(expected[actual.columns]))
+
+
+def test_same_details_as_http_scraper(tmp_path, local_site, fast_limiter):
+    seasons = season_urls(local_site)
+    http = BotolaScraper(rate_limiter=fast_limiter, cache_dir=str(tmp_path / 'http'))
+    expected = add_match_details(http.scrape_multiple_seasons(seasons), http)
+    scraper = AsyncBotolaScraper(rate_limiter=fast_limiter, cache_dir=str(tmp_path / 'async'),
+                                 http2=False, details=True)
+    actual = scraper.scrape_multiple_seasons(seasons)
+
+    assert actual['xg_home'].notna().all()
+    assert set(actual.columns) == set(expected.columns)
+    pd.testing.assert_frame_equal(sort_rows(actual), sort_rows(expected[actual.columns]))
+
+
+async def fetch_twice(scraper, url):
+    async with scraper:
+        first = await scraper.fetch_html(url, ttl=0)
+        second = await scraper.fetch_html(url, ttl=None)
+        third = await scraper.fetch_html(url)
+        missing = await scraper.fetch_html(url.replace('/matches', '/nowhere'))
+    return first, second, third, missing
+
+
+def test_conditional_get_and_client_errors(tmp_path, local_site, fast_limiter):
+    scraper = AsyncBotolaScraper(rate_limiter=fast_limiter, cache_dir=str(tmp_path), http2=False)
+    url = local_site.base_url + '/matches?season_id=7003'
+    first, second, third, missing = asyncio.run(fetch_twice(scraper, url))
+
+    assert first and second == first and third == first
+    assert missing is None
+    stats = local_site.snapshot()
+    # 200, puis 304 servi depuis le cache, puis cache frais sans requête; 404 sans nouvelle tentative
+    assert (stats.get('200'), stats.get('304'), stats.get('404')) == (1, 1, 1)
+    assert stats['requests'] == 3
@@ -0,0 +1,58 @@
+"""Backtest walk-forward: aucun résultat de la journée testée (ou postérieur) n'influence ses prédictions"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import score_predictions, walk_forward
+from standings import assign_matchdays
+from test_feature_store import round_robin_history
+
+MODELS = ('dixon_coles', 'poisson', 'elo', 'base_rates')
+FOLD_DATE = '2023-10-27'
+
+
+@pytest.fixture
+def history():
+    df = round_robin_history(n_rounds=12, seed=4)
+    # Match en retard le lendemain: Raja et Wydad jouent deux fois dans le même pli
+    extra = df[df['date'] == FOLD_DATE].iloc[[0]].copy()
+    extra['date'] = '2023-10-28'
+    extra[['home_team', 'away_team', 'score']] = ['Raja', 'Wydad', '1 - 1']
+    return pd.concat([df, extra], ignore_index=True)
+
+
+def fold_probabilities(predictions, matchday):
+    fold = predictions[predictions['matchday'] == matchday]
+    return fold.sort_values(['model', 'home_team', 'away_team']).reset_index(drop=True)[
+        ['model', 'home_team', 'away_team', 'p_home', 'p_draw', 'p_away']]
+
+
+def test_fold_predictions_ignore_results_from_the_fold_onwards(history):
+    matchdays = assign_matchdays(history)
+    matchday = matchdays[history['date'] == FOLD_DATE].iloc[0]
+    assert (matchdays == matchday).sum() == 5
+
+    predictions = walk_forward(history, MODELS, workers=1, min_train=20)
+    # Résultats du pli et des journées suivantes changés: les prédictions du pli ne bougent pas
+    changed = history.copy()
+    changed.loc[changed['date'] >= FOLD_DATE, 'score'] = '5 - 0'
+    changed_predictions = walk_forward(changed, MODELS, workers=1, min_train=20)
+
+    expected = fold_probabilities(predictions, matchday)
+    assert len(expected) == 5 * len(MODELS)
+    pd.testing.assert_frame_equal(fold_probabilities(changed_predictions, matchday), expected)
+
+
+def test_predictions_and_metrics_are_in_range(history):
+    predictions = walk_forward(history, MODELS, workers=1, min_train=20)
+    probs = predictions[['p_home', 'p_draw', 'p_away']].to_numpy()
+    assert ((probs >= 0) & (probs <= 1)).all()
+    np.testing.assert_allclose(probs.sum(axis=1), 1.0)
+    assert set(predictions['model']) == set(MODELS)
+
+    summary = score_predictions(predictions)
+    assert (summary['matches'] == len(predictions) // len(MODELS)).all()
+    assert np.isfinite(summary['log_loss']).all() and (summary['log_loss'] > 0).all()
+    assert summary['brier'].between(0, 2).all()
+    assert summary['rps'].between(0, 1).all()
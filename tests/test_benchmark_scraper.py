@@ -0,0 +1,29 @@
+"""Benchmark du scraper: l'étape de sauvegarde écrit bien CSV et Parquet"""
+
+import os
+
+import pandas as pd
+import pytest
+
+import storage
+from benchmark_parsing import build_matches_page
+from benchmark_scraper import BENCHMARK_SEASON, _dataframe, _save, benchmark_page
+from html_parsing import parse_match_rows
+
+
+@pytest.mark.skipif(not storage.HAS_PYARROW, reason="pyarrow requis")
+def test_save_stage_writes_parquet(tmp_path):
+    df = _dataframe(parse_match_rows(build_matches_page(50, seed=1)))
+    assert (df['season'] == BENCHMARK_SEASON).all()
+
+    written = _save(df, str(tmp_path))
+    parquet = list((tmp_path / 'parquet').glob('*.parquet'))
+    assert len(parquet) == 1
+    assert written > os.path.getsize(tmp_path / 'matches.csv')
+    assert len(pd.read_parquet(parquet[0])) == 50
+
+
+def test_benchmark_page_counts_rows():
+    results = benchmark_page(build_matches_page(30, seed=2), repeat=1)
+    assert results
+    assert all(stats['rows'] == 30 and stats['bytes_written'] > 0 for stats in results.values())
@@ -0,0 +1,80 @@
+"""Elo vectorisé: mêmes classements qu'une boucle séquentielle, configuration par configuration"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.elo import EloModel, INITIAL_RATING, SCALE, encode_matches, replay, tune
+from storage import normalize_matches
+from test_h2h_index import random_matches
+
+K_VALUES = [10.0, 20.0, 40.0]
+HOME_ADVANTAGES = [0.0, 60.0, 120.0]
+
+
+def sequential_elo(df: pd.DataFrame, k: float, home_advantage: float):
+    """Référence: un match après l'autre, classements dans un dict"""
+    typed = normalize_matches(df).reset_index(drop=True)
+    typed = typed.iloc[np.argsort(typed['date'].to_numpy(), kind='mergesort')]
+    ratings, rows = {}, {}
+    for position, match in typed.iterrows():
+        home, away = str(match['home_team']), str(match['away_team'])
+        r_home, r_away = ratings.get(home, INITIAL_RATING), ratings.get(away, INITIAL_RATING)
+        e_home = 1.0 / (1.0 + 10.0 ** ((r_away - r_home - home_advantage) / SCALE))
+        rows[position] = (r_home, r_away, e_home)
+        if pd.notna(match['home_goals']) and pd.notna(match['away_goals']):
+            diff = int(match['home_goals']) - int(match['away_goals'])
+            result = 1.0 if diff > 0 else 0.5 if diff == 0 else 0.0
+            multiplier = 1.0 if abs(diff) <= 1 else 1.5 if abs(diff) == 2 else (11.0 + abs(diff)) / 8.0
+            delta = k * multiplier * (result - e_home)
+            ratings[home], ratings[away] = r_home + delta, r_away - delta
+    pre = pd.DataFrame.from_dict(rows, orient='index', columns=['home_elo', 'away_elo', 'elo_expected'])
+    return pre.sort_index(), ratings
+
+
+@pytest.fixture
+def history():
+    frames = [random_matches(120, seed=3, start='2023-08-01'),
+              random_matches(120, seed=4, start='2024-08-01', season='2024/2025')]
+    return pd.concat(frames, ignore_index=True).sample(frac=1.0, random_state=0).reset_index(drop=True)
+
+
+def test_grid_replay_matches_sequential_loop(history):
+    encoded = encode_matches(history)
+    grid_k, grid_ha = (a.ravel() for a in np.meshgrid(K_VALUES, HOME_ADVANTAGES, indexing='ij'))
+    pre_home, pre_away, expected, final = replay(encoded['home'], encoded['away'], encoded['result'],
+                                                 encoded['multiplier'], len(encoded['teams']), grid_k, grid_ha)
+
+    for c, (k, ha) in enumerate(zip(grid_k, grid_ha)):
+        reference, ratings = sequential_elo(history, k, ha)
+        reference = reference.loc[encoded['order']]
+        np.testing.assert_allclose(pre_home[c], reference['home_elo'])
+        np.testing.assert_allclose(pre_away[c], reference['away_elo'])
+        np.testing.assert_allclose(expected[c], reference['elo_expected'])
+        np.testing.assert_allclose(final[c], [ratings[team] for team in encoded['teams']])
+
+
+def test_model_and_tune_match_sequential_loop(history):
+    model = EloModel(k=25.0, home_advantage=45.0)
+    frame = model.pre_match_ratings(history)
+    reference, ratings = sequential_elo(history, 25.0, 45.0)
+
+    assert frame.index.equals(history.index)
+    np.testing.assert_allclose(frame['home_elo'], reference['home_elo'])
+    np.testing.assert_allclose(frame['away_elo'], reference['away_elo'])
+    np.testing.assert_allclose(frame['elo_expected'], reference['elo_expected'])
+    np.testing.assert_allclose(model.ratings().sort_index(), pd.Series(ratings).sort_index())
+
+    # Critère de tune(): Brier après chauffe, recalculé configuration par configuration
+    scores = tune(history, K_VALUES, HOME_ADVANTAGES, burn_in=0.25)
+    typed = normalize_matches(history).reset_index(drop=True)
+    ordered = typed.iloc[np.argsort(typed['date'].to_numpy(), kind='mergesort')]
+    evaluated = ordered.index[int(0.25 * len(ordered)):]
+    evaluated = evaluated[ordered.loc[evaluated, 'home_goals'].notna().to_numpy()]
+    result = np.sign(ordered.loc[evaluated, 'home_goals'].astype(float)
+                     - ordered.loc[evaluated, 'away_goals'].astype(float)) / 2 + 0.5
+    for row in scores.itertuples():
+        reference, _ = sequential_elo(history, row.k, row.home_advantage)
+        brier = ((reference.loc[evaluated, 'elo_expected'] - result) ** 2).mean()
+        assert row.brier == pytest.approx(brier)
+    assert scores['brier'].is_monotonic_increasing
@@ -0,0 +1,82 @@
+"""Feature store incrémental: mêmes features que features.build_features"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from feature_store import FeatureStore
+from features import build_features, feature_columns
+
+TEAMS = ['Raja', 'Wydad', 'FAR', 'RSB', 'FUS', 'MAT', 'HUSA', 'OCS']
+
+
+def round_robin_history(n_rounds: int = 14, seed: int = 0) -> pd.DataFrame:
+    """Journées complètes (chaque équipe joue une fois par date), statistiques parfois manquantes"""
+    rng = np.random.default_rng(seed)
+    teams = list(TEAMS)
+    rows = []
+    for matchday in range(n_rounds):
+        date = pd.Timestamp('2023-09-01') + pd.Timedelta(days=7 * matchday)
+        for i in range(len(teams) // 2):
+            home, away = teams[i], teams[-1 - i]
+            if matchday % 2:
+                home, away = away, home
+            hg, ag = rng.poisson(1.4), rng.poisson(1.1)
+            rows.append({
+                'season': '2023/2024', 'date': date.strftime('%Y-%m-%d'), 'home_team': home,
+                'away_team': away, 'score': f"{hg} - {ag}",
+                'xg_home': round(rng.uniform(0.2, 2.5), 2) if rng.random() > 0.2 else np.nan,
+                'xg_away': round(rng.uniform(0.2, 2.5), 2) if rng.random() > 0.2 else np.nan,
+                'shots_home': rng.integers(3, 20), 'shots_away': rng.integers(3, 20),
+                'possession_home': rng.integers(35, 65), 'possession_away': np.nan,
+            })
+        # Rotation du tableau de Berger
+        teams = [teams[0]] + [teams[-1]] + teams[1:-1]
+    return pd.DataFrame(rows)
+
+
+def expected_vectors(features: pd.DataFrame) -> pd.DataFrame:
+    columns = [f'{side}_{col}' for side in ('home', 'away') for col in feature_columns()]
+    return features[columns].astype('float64')
+
+
+def test_incremental_snapshots_match_build_features():
+    history = round_robin_history()
+    expected = expected_vectors(build_features(history))
+    store = FeatureStore()
+    for date, day in history.groupby('date', sort=True):
+        snapshot = store.snapshot(day[['home_team', 'away_team', 'date']])
+        snapshot.index = day.index
+        pd.testing.assert_frame_equal(snapshot[expected.columns].astype('float64'), expected.loc[day.index],
+                                      check_exact=False, rtol=1e-9)
+        # Historique complet à chaque appel: seules les lignes du high-water mark ou après sont lues
+        store.update(history[history['date'] <= date])
+    assert len(store.seen) == len(history)
+
+
+def test_update_adds_nothing_twice():
+    history = round_robin_history(4)
+    store = FeatureStore.rebuild(history)
+    assert store.update(history) == 0
+    assert store.played.sum() == 2 * len(history)
+
+
+def test_out_of_order_match_is_skipped_for_both_teams():
+    history = round_robin_history(4)
+    store = FeatureStore.rebuild(history)
+    played = store.played.copy()
+    late = pd.DataFrame([{'season': '2023/2024', 'date': history['date'].max(), 'home_team': 'Raja',
+                          'away_team': 'Nouvelle équipe', 'score': '1 - 0'}])
+    assert store.update(late) == 0
+    assert 'Nouvelle équipe' not in store.teams
+    np.testing.assert_array_equal(store.played[:len(played)], played)
+
+
+def test_save_and_load_roundtrip(tmp_path):
+    history = round_robin_history(6)
+    store = FeatureStore.rebuild(history)
+    path = store.save(str(tmp_path / 'state.npz'))
+    loaded = FeatureStore.load(str(path))
+    assert loaded.high_water_mark == store.high_water_mark
+    assert loaded.fixture_features('Raja', 'Wydad') == pytest.approx(store.fixture_features('Raja', 'Wydad'),
+                                                                       nan_ok=True)
@@ -0,0 +1,119 @@
+"""Index confrontations / équipes: mêmes résultats qu'un filtrage du DataFrame complet"""
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from h2h_index import MatchIndex
+from storage import normalize_matches
+
+TEAMS = ['Raja', 'Wydad', 'FAR', 'RSB', 'FUS', 'MAT']
+
+
+def random_matches(n: int, seed: int, start: str, teams=TEAMS, season='2023/2024') -> pd.DataFrame:
+    """Matchs aléatoires, plusieurs par date (égalités de dates), quelques scores absents"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(n):
+        home, away = rng.choice(teams, size=2, replace=False)
+        hg, ag = rng.poisson(1.3), rng.poisson(1.1)
+        rows.append({'season': season, 'date': (pd.Timestamp(start) + pd.Timedelta(days=int(i // 3))).isoformat(),
+                     'home_team': home, 'away_team': away, 'score': f"{hg} - {ag}" if i % 7 else ''})
+    return pd.DataFrame(rows)
+
+
+def plain(frames) -> pd.DataFrame:
+    df = normalize_matches(pd.concat(frames, ignore_index=True))
+    return df[df['date'].notna()].reset_index(drop=True)
+
+
+def as_plain_values(df: pd.DataFrame) -> pd.DataFrame:
+    return df.astype({col: str for col in ('home_team', 'away_team', 'season')})
+
+
+def plain_head_to_head(df, team_a, team_b, k=None):
+    pair = (((df['home_team'] == team_a) & (df['away_team'] == team_b))
+            | ((df['home_team'] == team_b) & (df['away_team'] == team_a)))
+    found = df[pair].sort_values('date', kind='stable')
+    return found.tail(k) if k else found
+
+
+def plain_team_history(df, team, k=None):
+    found = df[(df['home_team'] == team) | (df['away_team'] == team)].sort_values('date', kind='stable')
+    return found.tail(k) if k else found
+
+
+def assert_same(actual, expected):
+    pdt.assert_frame_equal(as_plain_values(actual), as_plain_values(expected), check_index_type=False)
+
+
+@pytest.fixture
+def chunks():
+    return [
+        random_matches(60, seed=1, start='2023-09-01'),
+        # Nouvelle équipe et nouvelle saison
+        random_matches(30, seed=2, start='2024-08-20', teams=TEAMS + ['CODM'], season='2024/2025'),
+        # Matchs plus anciens que ceux déjà indexés (insertion au milieu des index)
+        random_matches(20, seed=3, start='2023-10-01'),
+    ]
+
+
+def check_queries(index, df):
+    teams = sorted(set(df['home_team'].astype(str)) | set(df['away_team'].astype(str)))
+    for i, team_a in enumerate(teams):
+        for k in (None, 3):
+            assert_same(index.team_history(team_a, k), plain_team_history(df, team_a, k))
+        for team_b in teams[i + 1:]:
+            assert_same(index.head_to_head(team_a, team_b), plain_head_to_head(df, team_a, team_b))
+            expected = plain_head_to_head(df, team_a, team_b, 3)
+            assert index.head_to_head_positions(team_b, team_a, 3) == list(expected.index)
+
+
+def test_queries_match_dataframe_filters_before_and_after_append(chunks):
+    index = MatchIndex(chunks[0])
+    check_queries(index, plain(chunks[:1]))
+
+    for n in range(2, len(chunks) + 1):
+        assert index.append(chunks[n - 1]) == len(chunks[n - 1])
+        check_queries(index, plain(chunks[:n]))
+    assert len(index) == sum(len(chunk) for chunk in chunks)
+
+
+def test_h2h_features_match_dataframe_summary(chunks):
+    index = MatchIndex(chunks[0])
+    for chunk in chunks[1:]:
+        index.append(chunk)
+    df = plain(chunks)
+    before = pd.Timestamp('2023-10-05')
+
+    for team_a, team_b in (('Raja', 'Wydad'), ('FAR', 'MAT'), ('CODM', 'RSB')):
+        recent = plain_head_to_head(df[df['date'] < before], team_a, team_b, 5)
+        played = recent.dropna(subset=['home_goals', 'away_goals'])
+        is_home = (played['home_team'] == team_a).to_numpy()
+        goals_for = np.where(is_home, played['home_goals'], played['away_goals']).astype(float)
+        goals_against = np.where(is_home, played['away_goals'], played['home_goals']).astype(float)
+
+        features = index.h2h_features(team_a, team_b, k=5, before=before)
+        assert features['h2h_matches'] == len(played)
+        assert features['h2h_wins'] == (goals_for > goals_against).sum()
+        assert features['h2h_losses'] == (goals_for < goals_against).sum()
+        if len(played):
+            assert features['h2h_goals_for'] == pytest.approx(goals_for.mean())
+
+
+def test_team_columns_keep_one_categorical_dtype(chunks):
+    index = MatchIndex(chunks[0])
+    first = index.head_to_head('Raja', 'Wydad')['home_team'].cat.categories.tolist()
+    for chunk in chunks[1:]:
+        index.append(chunk)
+
+    matches = index.matches
+    assert isinstance(matches['home_team'].dtype, pd.CategoricalDtype)
+    assert matches['home_team'].dtype == matches['away_team'].dtype
+    assert matches['season'].dtype.name == 'category'
+    # Les codes déjà attribués ne changent pas, les nouvelles équipes sont ajoutées à la fin
+    categories = matches['home_team'].cat.categories.tolist()
+    assert categories[:len(first)] == first and categories[-1] == 'CODM'
+    assert index.team_history('CODM', 2)['home_team'].dtype == matches['home_team'].dtype
+    assert_same(matches, plain(chunks))
@@ -0,0 +1,76 @@
+"""Cache HTTP disque: revalidation ETag / 304 et éviction LRU"""
+
+import itertools
+
+import pytest
+
+import http_cache
+from http_cache import HttpCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Horloge du cache qui avance d'une seconde à chaque lecture"""
+    ticks = itertools.count(1_000_000)
+    monkeypatch.setattr(http_cache.time, 'time', lambda: float(next(ticks)))
+
+
+def test_store_and_read(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    cache.store('http://x/a', 'body', etag='"e1"', ttl=None)
+    assert cache.read('http://x/a') == 'body'
+    entry = cache.lookup('http://x/a')
+    assert cache.is_fresh(entry)
+    assert cache.conditional_headers(entry) == {'If-None-Match': '"e1"'}
+    # Index persisté sur disque
+    assert HttpCache(str(tmp_path)).read('http://x/a') == 'body'
+
+
+def test_expired_entry_is_not_fresh(tmp_path):
+    cache = HttpCache(str(tmp_path))
+    cache.store('http://x/a', 'body', ttl=0)
+    assert not cache.is_fresh(cache.lookup('http://x/a'))
+
+
+def test_lru_eviction_keeps_recently_read_entries(tmp_path, clock):
+    cache = HttpCache(str(tmp_path), max_bytes=250)
+    cache.store('http://x/a', 'a' * 100)
+    cache.store('http://x/b', 'b' * 100)
+    assert cache.read('http://x/a') is not None
+    cache.store('http://x/c', 'c' * 100)
+
+    assert cache.lookup('http://x/b') is None
+    assert cache.read('http://x/a') == 'a' * 100
+    assert cache.read('http://x/c') == 'c' * 100
+    objects = [path for path in (tmp_path / 'http' / 'objects').rglob('*') if path.is_file()]
+    assert len(objects) == 2
+
+
+def test_identical_bodies_are_stored_once(tmp_path, clock):
+    cache = HttpCache(str(tmp_path), max_bytes=150)
+    cache.store('http://x/a', 'same' * 25)
+    cache.store('http://x/b', 'same' * 25)
+    # Même contenu: un seul objet, compté une fois dans la taille du cache
+    assert cache.read('http://x/a') == cache.read('http://x/b') == 'same' * 25
+    assert len([path for path in (tmp_path / 'http' / 'objects').rglob('*') if path.is_file()]) == 1
+
+
+def test_conditional_get_served_from_cache_on_304(tmp_path, mock_site, fast_limiter):
+    pytest.importorskip('requests')
+    from botola_scraper_http import BotolaScraper
+
+    scraper = BotolaScraper(rate_limiter=fast_limiter, cache_dir=str(tmp_path))
+    url = mock_site.base_url + '/matches?season_id=9102'
+    first = scraper.fetch_html(url, ttl=0)
+    assert first and mock_site.snapshot().get('200') == 1
+    assert scraper.cache.lookup(url)['etag']
+
+    # Entrée expirée: GET conditionnel, 304, corps servi depuis le cache
+    second = scraper.fetch_html(url, ttl=None)
+    assert second == first
+    assert mock_site.snapshot().get('304') == 1
+    assert scraper.cache.is_fresh(scraper.cache.lookup(url))
+
+    # Entrée désormais sans expiration: aucune requête
+    assert scraper.fetch_html(url) == first
+    assert mock_site.snapshot()['requests'] == 2
@@ -0,0 +1,91 @@
+"""Mode incrémental: filtre des lignes connues (deux ordres de table) et fusion"""
+
+import pandas as pd
+
+from benchmark_parsing import build_match_rows, wrap_matches_page
+from html_parsing import parse_match_rows
+from incremental import (IncrementalFilter, MATCH_KEY, NEWEST_FIRST, OLDEST_FIRST,
+                         date_order, merge_matches)
+
+SEASON = '2023/2024'
+
+
+def season_rows(n_rows: int = 60):
+    """Lignes parsées d'une page synthétique (du plus ancien au plus récent)"""
+    return parse_match_rows(wrap_matches_page(build_match_rows(n_rows, seed=3)))
+
+
+def stored(rows):
+    return pd.DataFrame([{'season': SEASON, **row} for row in rows]).astype(str)
+
+
+class Counting:
+    """Itérable qui compte les lignes réellement lues"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.read = 0
+
+    def __iter__(self):
+        for row in self.rows:
+            self.read += 1
+            yield row
+
+
+def test_date_order():
+    assert date_order('2023-05-02', '2023-05-01') == NEWEST_FIRST
+    assert date_order('2023-05-01', '2023-05-02') == OLDEST_FIRST
+    assert date_order('2023-05-01', '2023-05-01') is None
+    assert date_order('', '2023-05-01') is None
+
+
+def test_oldest_first_table_keeps_new_matches():
+    rows = season_rows()
+    flt = IncrementalFilter(stored(rows[:50]))
+    source = Counting(rows)
+    new = list(flt.filter(source, SEASON))
+    assert new == rows[50:]
+    assert source.read == len(rows)
+
+
+def test_newest_first_table_stops_after_known_rows():
+    rows = season_rows()
+    flt = IncrementalFilter(stored(rows[:50]), stop_after=5)
+    source = Counting(rows[::-1])
+    new = list(flt.filter(source, SEASON))
+    assert new == rows[50:][::-1]
+    # 10 nouvelles lignes, la ligne du high-water mark (non décisive), puis 5 lignes connues
+    assert source.read == 10 + 1 + 5
+
+
+def test_changed_score_is_yielded():
+    rows = season_rows(20)
+    existing = stored(rows)
+    existing.loc[3, 'score'] = '9 - 9'
+    new = list(IncrementalFilter(existing).filter(rows, SEASON))
+    assert new == [rows[3]]
+
+
+def test_merge_appends_new_and_updates_known_rows():
+    existing = stored(season_rows(10))
+    existing['xg_home'] = '1.2'
+    new = stored(season_rows(12)[8:])
+    new['xg_home'] = ''
+    new.loc[0, 'score'] = '4 - 4'
+
+    merged, changed = merge_matches(existing, new)
+
+    assert changed == 4
+    assert len(merged) == 12
+    assert list(merged.columns[:len(existing.columns)]) == list(existing.columns)
+    updated = merged.set_index(MATCH_KEY).loc[tuple(new.loc[0, MATCH_KEY])]
+    assert updated['score'] == '4 - 4'
+    # Une valeur vide du scraper n'efface pas la valeur stockée
+    assert updated['xg_home'] == '1.2'
+    assert (merged.iloc[10:]['xg_home'] == '').all()
+
+
+def test_merge_is_idempotent():
+    existing = stored(season_rows(10))
+    merged, _ = merge_matches(existing, existing.copy())
+    pd.testing.assert_frame_equal(merged.reset_index(drop=True), existing.reset_index(drop=True))
@@ -0,0 +1,76 @@
+"""Rejeu HTTP de "Voir plus": fin de saison sur fragment vide, jamais sur un échec"""
+
+import pytest
+
+import load_more_http
+from benchmark_parsing import build_match_rows, wrap_matches_page
+from load_more_http import LoadMoreReplayer, fragment_rows, with_query_param
+
+TEMPLATE = 'http://example.test/morocco/botola-pro/matches/more?season_id=1&page=2'
+ROWS_PER_PAGE = 5
+
+
+class FakeDriver:
+    page_source = wrap_matches_page(build_match_rows(ROWS_PER_PAGE, seed=1, start=0))
+
+
+class FakeHttp:
+    """Pages 3..6 de l'endpoint; `failures` = nombre d'échecs (None) avant succès, par page"""
+
+    max_workers = 2
+
+    def __init__(self, failures=None, last_page=6):
+        self.failures = dict(failures or {})
+        self.last_page = last_page
+        self.calls = []
+
+    def fragment(self, page):
+        return ''.join(build_match_rows(ROWS_PER_PAGE, seed=page, start=page * 100)) if page <= self.last_page else ''
+
+    def fetch_html(self, url, ttl=None, headers=None):
+        page = int(url.rsplit('page=', 1)[1])
+        self.calls.append(page)
+        if self.failures.get(page, 0) > 0:
+            self.failures[page] -= 1
+            return None
+        return self.fragment(page)
+
+    def fetch_html_pages(self, urls, ttl=None, headers=None):
+        return {url: self.fetch_html(url, ttl, headers) for url in urls}
+
+
+@pytest.fixture
+def replayer_for(monkeypatch):
+    monkeypatch.setattr(load_more_http, 'find_load_more', lambda driver: object())
+
+    def make(http):
+        replayer = LoadMoreReplayer(http)
+        monkeypatch.setattr(replayer, '_capture_requests',
+                            lambda driver: ([with_query_param(TEMPLATE, 'page', 1), TEMPLATE], 2))
+        monkeypatch.setattr(replayer, '_sync_session', lambda driver: {})
+        return replayer
+    return make
+
+
+def expected_rows(http, pages):
+    return [row for page in pages for row in fragment_rows(http.fragment(page))]
+
+
+def test_empty_fragment_ends_the_season(replayer_for):
+    http = FakeHttp()
+    rows = replayer_for(http).scrape(FakeDriver(), '2023/2024')
+    assert len(rows) == ROWS_PER_PAGE * 5
+    assert rows[ROWS_PER_PAGE:] == expected_rows(http, range(3, 7))
+
+
+def test_transient_failure_in_the_middle_is_retried(replayer_for):
+    http = FakeHttp(failures={4: 1})
+    rows = replayer_for(http).scrape(FakeDriver(), '2023/2024')
+    assert rows[ROWS_PER_PAGE:] == expected_rows(http, range(3, 7))
+    assert http.calls.count(4) == 2
+
+
+def test_persistent_failure_in_the_middle_falls_back_to_clicks(replayer_for):
+    http = FakeHttp(failures={4: 2})
+    # Saison partielle jamais renvoyée comme complète: l'appelant revient aux clics
+    assert replayer_for(http).scrape(FakeDriver(), '2023/2024') is None
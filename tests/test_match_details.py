@@ -0,0 +1,124 @@
+"""Pages de match: lecture du bloc de statistiques et report dans les cellules vides"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from match_details import _fill, _prepare, add_match_details, parse_match_stats
+
+BASE = 'https://footystats.org/'
+
+STAT_GROUP_PAGE = """
+<html><body>
+<div class="match-header">Raja vs Wydad - Possession stats and more, 2023/2024</div>
+<div class="stat-group">
+  <div class="stat-row"><span class="home">1.84</span><span class="label">xG</span><span class="away">0.62</span></div>
+  <div class="stat-row"><span class="home">6</span><span class="label">Shots on Target</span><span class="away">2</span></div>
+  <div class="stat-row"><span class="home">15</span><span class="label">Shots</span><span class="away">7</span></div>
+  <div class="stat-row"><span class="home">58%</span><span class="label">Possession</span><span class="away">42%</span></div>
+</div>
+</body></html>
+"""
+
+STATS_TABLE_PAGE = """
+<html><body>
+<table class="stats-table">
+  <tr><th>Raja</th><th></th><th>Wydad</th></tr>
+  <tr><td>1,20</td><td>Expected Goals</td><td>0,95</td></tr>
+  <tr><td>9</td><td>Shots off Target</td><td>4</td></tr>
+  <tr><td>17</td><td>Total Shots</td><td>11</td></tr>
+  <tr><td>47 %</td><td>Ball Possession</td><td>53 %</td></tr>
+</table>
+</body></html>
+"""
+
+
+def test_parse_stat_group_block():
+    assert parse_match_stats(STAT_GROUP_PAGE) == {
+        'xg_home': 1.84, 'xg_away': 0.62,
+        'shots_home': 15, 'shots_away': 7,
+        'possession_home': 58, 'possession_away': 42,
+    }
+
+
+def test_parse_stats_table_block():
+    assert parse_match_stats(STATS_TABLE_PAGE) == {
+        'xg_home': 1.2, 'xg_away': 0.95,
+        'shots_home': 17, 'shots_away': 11,
+        'possession_home': 47, 'possession_away': 53,
+    }
+
+
+def test_parse_ignores_ambiguous_and_long_texts():
+    page = """
+    <html><body>
+    <p>Raja dominated possession with 61 percent against 39 percent for Wydad in a derby watched by 45000</p>
+    <div class="stat-row">Shots 12 (5) 8</div>
+    <div class="stat-row">Possession 150 20</div>
+    <div class="stat-row">xG 1.1 0.7</div>
+    </body></html>
+    """
+    # Texte trop long, trois nombres, possession hors bornes: seul le xG est lu
+    assert parse_match_stats(page) == {'xg_home': 1.1, 'xg_away': 0.7}
+
+
+def test_parse_page_without_stats():
+    assert parse_match_stats('<html><body><div class="stat-group"></div></body></html>') == {}
+
+
+def matches():
+    return pd.DataFrame({
+        'season': ['2023/2024'] * 3,
+        'home_team': ['Raja', 'FAR', 'RSB'],
+        'away_team': ['Wydad', 'FUS', 'MAT'],
+        'match_url': ['/morocco/raja-vs-wydad', '/morocco/far-vs-fus', ''],
+        'xg_home': ['1.5', '', ''],
+        'xg_away': ['', '', ''],
+        'shots_home': ['', 10, ''],
+        'shots_away': ['', '', ''],
+        'possession_home': ['', '', ''],
+        'possession_away': ['', '', ''],
+    })
+
+
+def test_prepare_targets_rows_with_a_link_and_missing_stats():
+    df, targets, jobs = _prepare(matches(), only_missing=True, base_url=BASE)
+    assert targets.tolist() == [True, True, False]
+    assert set(jobs) == {BASE + 'morocco/raja-vs-wydad', BASE + 'morocco/far-vs-fus'}
+    assert df['xg_home'].dtype == 'float64' and df.at[0, 'xg_home'] == 1.5
+
+
+def test_fill_only_empty_cells():
+    df, targets, jobs = _prepare(matches(), only_missing=True, base_url=BASE)
+    parsed = {'xg_home': 9.9, 'xg_away': 0.4, 'shots_home': 99, 'shots_away': 3,
+              'possession_home': 60, 'possession_away': 40}
+    filled = _fill(df, targets, BASE, {url: parsed for url in jobs})
+
+    # Valeurs déjà présentes conservées
+    assert filled.at[0, 'xg_home'] == 1.5
+    assert filled.at[1, 'shots_home'] == 10
+    # Cellules vides remplies
+    assert filled.at[0, 'xg_away'] == 0.4 and filled.at[1, 'xg_home'] == 9.9
+    assert filled.loc[[0, 1], 'possession_home'].tolist() == [60, 60]
+    # Ligne sans lien inchangée
+    assert filled.loc[2, ['xg_home', 'shots_home', 'possession_home']].isna().all()
+
+
+def test_add_match_details_from_mock_site(tmp_path, mock_site, fast_limiter):
+    pytest.importorskip('requests')
+    from botola_scraper_http import BotolaScraper
+
+    scraper = BotolaScraper(rate_limiter=fast_limiter, cache_dir=str(tmp_path))
+    root = mock_site.base_url.split('/morocco')[0] + '/'
+    paths = ['/morocco/match-1-0', '/morocco/match-1-1']
+    df = pd.DataFrame({'season': '2023/2024', 'match_url': paths, 'xg_home': [np.nan, 2.5]})
+
+    enriched = add_match_details(df, scraper, base_url=root)
+    for i, path in enumerate(paths):
+        expected = parse_match_stats(mock_site.match_page(path))
+        assert set(expected) == {'xg_home', 'xg_away', 'shots_home', 'shots_away',
+                                 'possession_home', 'possession_away'}
+        for col, value in expected.items():
+            if (i, col) != (1, 'xg_home'):
+                assert enriched.at[i, col] == pytest.approx(value)
+    assert enriched.at[1, 'xg_home'] == 2.5
@@ -0,0 +1,70 @@
+"""Base SQLite des matchs: upsert sur la clé naturelle et requêtes indexées"""
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import match_store
+from match_store import MatchStore
+
+
+def scraped(**overrides):
+    row = {'season': '2023/2024', 'date': '2023-09-01', 'home_team': 'Raja', 'away_team': 'Wydad',
+           'score': '2 - 1', 'xg_home': '1.4', 'xg_away': '0.9'}
+    row.update(overrides)
+    return row
+
+
+@pytest.fixture
+def store():
+    with MatchStore(':memory:') as store:
+        yield store
+
+
+def test_upsert_derives_goals_and_types(store):
+    store.upsert(pd.DataFrame([scraped()]))
+    row = store.season('2023/2024').iloc[0]
+    assert (row['home_goals'], row['away_goals']) == (2, 1)
+    assert row['xg_home'] == pytest.approx(1.4)
+    assert row['date'] == pd.Timestamp('2023-09-01')
+
+
+def test_upsert_updates_on_natural_key_without_erasing(store):
+    store.upsert(pd.DataFrame([scraped()]))
+    # Scraper sans xG, score corrigé
+    store.upsert(pd.DataFrame([scraped(date='2023-09-01 00:00', score='3 - 1', xg_home='', xg_away='')]))
+
+    assert store.count() == 1
+    row = store.season('2023/2024').iloc[0]
+    assert row['score'] == '3 - 1'
+    assert (row['home_goals'], row['away_goals']) == (3, 1)
+    assert row['xg_home'] == pytest.approx(1.4)
+
+
+def test_upsert_inserts_other_keys(store):
+    store.upsert(pd.DataFrame([scraped(), scraped(home_team='Wydad', away_team='Raja', date='2024-02-01')]))
+    store.upsert(pd.DataFrame([scraped()]))
+    assert store.count() == 2
+    assert len(store.head_to_head('Wydad', 'Raja')) == 2
+    assert store.teams() == ['Raja', 'Wydad']
+
+
+def test_team_queries_use_indexes(store):
+    plan = ' '.join(store.explain("WHERE home_team = ?", ('Raja',)))
+    assert 'idx_matches_home' in plan
+
+
+def test_match_url_is_stored_and_added_to_old_databases(tmp_path):
+    path = tmp_path / 'old.db'
+    # Base créée avant la colonne match_url
+    columns = {col: sql_type for col, sql_type in match_store.COLUMNS.items() if col != 'match_url'}
+    with sqlite3.connect(path) as conn:
+        conn.execute(f"CREATE TABLE matches ({', '.join(f'{c} {t}' for c, t in columns.items())}, "
+                     f"PRIMARY KEY ({', '.join(match_store.MATCH_KEY)}))")
+
+    url = 'https://footystats.org/morocco/raja-vs-wydad-h2h-stats'
+    with MatchStore(str(path)) as store:
+        store.upsert(pd.DataFrame([scraped(match_url=url)]))
+        store.upsert(pd.DataFrame([scraped(match_url='')]))
+        assert store.season('2023/2024').iloc[0]['match_url'] == url
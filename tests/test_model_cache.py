@@ -0,0 +1,72 @@
+"""Cache des modèles: réutilisé pour la même empreinte, réajusté si les données ou paramètres changent"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from model_cache import ModelCache, data_fingerprint
+from models import EloModel
+from test_h2h_index import random_matches
+
+
+@pytest.fixture
+def history():
+    return random_matches(90, seed=5, start='2023-08-01')
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ModelCache(cache_dir=str(tmp_path))
+
+
+class CountingFit:
+    """fit(model, df) qui compte les ajustements réels"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, model, df):
+        self.calls += 1
+        return model.fit(df)
+
+
+def test_same_fingerprint_reuses_model(cache, history):
+    fit = CountingFit()
+    fitted = cache.get_or_fit(EloModel(k=20.0, home_advantage=60.0), history, fit=fit)
+
+    # Ordre des lignes et colonnes hors entraînement sans effet sur l'empreinte
+    reordered = history.sample(frac=1.0, random_state=1).assign(xg='1.2 - 0.8')
+    assert data_fingerprint(reordered) == data_fingerprint(history)
+    reloaded = cache.get_or_fit(EloModel(k=20.0, home_advantage=60.0), reordered, fit=fit)
+
+    assert fit.calls == 1
+    assert reloaded is not fitted
+    assert isinstance(reloaded.ratings_, np.memmap)
+    pd.testing.assert_series_equal(reloaded.ratings(), fitted.ratings())
+    np.testing.assert_allclose(reloaded.expected(['Raja', 'Nouveau'], ['Wydad', 'FAR']),
+                               fitted.expected(['Raja', 'Nouveau'], ['Wydad', 'FAR']))
+
+
+def test_changed_data_or_params_rebuild_model(cache, history):
+    fit = CountingFit()
+    base = cache.get_or_fit(EloModel(k=20.0, home_advantage=60.0), history, fit=fit)
+
+    changed = history.copy()
+    played = changed.index[changed['score'] != ''][0]
+    changed.loc[played, 'score'] = '9 - 0'
+    rescored = cache.get_or_fit(EloModel(k=20.0, home_advantage=60.0), changed, fit=fit)
+    assert fit.calls == 2
+    assert not np.allclose(rescored.ratings().sort_index(), base.ratings().sort_index())
+
+    retuned = cache.get_or_fit(EloModel(k=40.0, home_advantage=60.0), history, fit=fit)
+    assert fit.calls == 3
+    assert retuned.k == 40.0
+    assert not np.allclose(retuned.ratings().sort_index(), base.ratings().sort_index())
+
+    # Les trois artefacts coexistent: chacun est rechargé sans réajustement
+    for model, df in [(EloModel(k=20.0, home_advantage=60.0), history),
+                      (EloModel(k=20.0, home_advantage=60.0), changed),
+                      (EloModel(k=40.0, home_advantage=60.0), history)]:
+        cache.get_or_fit(model, df, fit=fit)
+    assert fit.calls == 3
+    assert len(list((cache.root / 'EloModel').iterdir())) == 3
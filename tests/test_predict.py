@@ -0,0 +1,51 @@
+"""API de prédiction par lot"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('scipy')
+
+from feature_store import FeatureStore
+from predict import MatchPredictor, predict_fixtures
+from test_feature_store import round_robin_history
+
+
+@pytest.fixture(scope='module')
+def predictor():
+    return MatchPredictor(round_robin_history(10))
+
+
+def fixtures():
+    return pd.DataFrame({'date': ['2023-12-01', '2023-12-01', '2023-12-02'],
+                         'home_team': ['Raja', 'FAR', 'Inconnue'],
+                         'away_team': ['Wydad', 'RSB', 'FUS']})
+
+
+def test_probabilities_and_markets(predictor):
+    result = predict_fixtures(fixtures(), predictor)
+    assert len(result) == 3
+    np.testing.assert_allclose(result[['p_home', 'p_draw', 'p_away']].sum(axis=1), 1.0, atol=1e-3)
+    np.testing.assert_allclose(result['over_2.5'] + result['under_2.5'], 1.0)
+    assert (result['home_xg'] > 0).all()
+
+
+def test_features_built_for_the_whole_batch(predictor):
+    batch = fixtures()
+    result = predict_fixtures(batch, predictor)
+    for i, row in batch.iterrows():
+        expected = predictor.features.fixture_features(row['home_team'], row['away_team'], row['date'])
+        for name, value in expected.items():
+            assert result.at[i, name] == pytest.approx(value, nan_ok=True), name
+    assert result.at[2, 'home_matches_played'] == 0
+
+    without = predict_fixtures(batch, predictor, with_features=False)
+    assert 'home_goals_for_r5' not in without.columns
+    pd.testing.assert_frame_equal(result[without.columns], without)
+
+
+def test_batch_equals_single_predictions(predictor):
+    batch = predict_fixtures(fixtures(), predictor)
+    for i in range(len(batch)):
+        single = predict_fixtures(fixtures().iloc[[i]], predictor)
+        pd.testing.assert_frame_equal(single.reset_index(drop=True), batch.iloc[[i]].reset_index(drop=True))
@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+import rate_limiter
+from rate_limiter import AdaptiveRateLimiter, parse_retry_after
+
+URL = 'http://example.test/matches'
+
+
+class FakeClock:
+    """Horloge monotone contrôlée: time.sleep avance le temps sans attendre"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, 'monotonic', fake.monotonic)
+    monkeypatch.setattr(rate_limiter.time, 'sleep', fake.sleep)
+    return fake
+
+
+def make_limiter(**kwargs):
+    params = dict(rate=1.0, min_rate=0.1, max_rate=2.0, burst=1.0, increase=0.25, decrease=0.5,
+                  slow_response=5.0, backoff_base=2.0, max_backoff=16.0, seed=0)
+    params.update(kwargs)
+    return AdaptiveRateLimiter(**params)
+
+
+def test_additive_increase_on_fast_success_up_to_max_rate(clock):
+    limiter = make_limiter()
+    assert limiter.feedback(URL, status=200, elapsed=0.1) == 0.0
+    assert limiter.rate(URL) == pytest.approx(1.25)
+    for _ in range(10):
+        limiter.feedback(URL, status=200, elapsed=0.1)
+    assert limiter.rate(URL) == pytest.approx(2.0)
+
+
+def test_slow_success_does_not_increase_rate(clock):
+    limiter = make_limiter()
+    limiter.feedback(URL, status=200, elapsed=6.0)
+    assert limiter.rate(URL) == pytest.approx(1.0)
+
+
+def test_multiplicative_decrease_on_throttle_down_to_min_rate(clock):
+    limiter = make_limiter()
+    limiter.feedback(URL, status=429)
+    assert limiter.rate(URL) == pytest.approx(0.5)
+    limiter.feedback(URL, status=503)
+    assert limiter.rate(URL) == pytest.approx(0.25)
+    for _ in range(10):
+        limiter.feedback(URL, status=429)
+    assert limiter.rate(URL) == pytest.approx(0.1)
+
+
+def test_other_errors_back_off_without_decrease(clock):
+    limiter = make_limiter()
+    assert limiter.feedback(URL, status=500) > 0
+    assert limiter.feedback(URL, error=True) > 0
+    assert limiter.rate(URL) == pytest.approx(1.0)
+
+
+def test_exponential_backoff_with_jitter_and_cap(clock):
+    limiter = make_limiter()
+    delays = [limiter.feedback(URL, status=500) for _ in range(6)]
+    for failure, delay in enumerate(delays):
+        backoff = min(16.0, 2.0 * 2 ** failure)
+        assert backoff * 0.5 <= delay <= backoff
+
+
+def test_success_resets_backoff(clock):
+    limiter = make_limiter()
+    for _ in range(4):
+        limiter.feedback(URL, status=500)
+    limiter.feedback(URL, status=200, elapsed=0.1)
+    assert limiter._hosts['example.test'].failures == 0
+    assert limiter.feedback(URL, status=500) <= 2.0
+
+
+def test_acquire_waits_for_backoff_then_recovers(clock):
+    limiter = make_limiter()
+    assert limiter.acquire(URL) == 0.0
+    delay = limiter.feedback(URL, status=503)
+    assert limiter._hosts['example.test'].blocked_until == pytest.approx(clock.now + delay)
+
+    waited = limiter.acquire(URL)
+    assert waited >= delay
+    assert clock.now >= limiter._hosts['example.test'].blocked_until
+
+
+def test_token_bucket_paces_requests(clock):
+    limiter = make_limiter(rate=2.0, burst=2.0)
+    assert limiter.acquire(URL) == 0.0
+    assert limiter.acquire(URL) == 0.0
+    assert limiter.acquire(URL) == pytest.approx(0.5)
+    # Les hôtes ont chacun leur seau
+    assert limiter.acquire('http://other.test/') == 0.0
+
+
+def test_parse_retry_after_seconds_and_http_date():
+    assert parse_retry_after('30') == 30.0
+    assert parse_retry_after(' 1.5 ') == 1.5
+    assert parse_retry_after('-4') == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('') is None
+    assert parse_retry_after('bientôt') is None
+
+    when = datetime.now(timezone.utc) + timedelta(seconds=120)
+    assert parse_retry_after(format_datetime(when, usegmt=True)) == pytest.approx(120, abs=2)
+    past = datetime.now(timezone.utc) - timedelta(hours=1)
+    assert parse_retry_after(format_datetime(past, usegmt=True)) == 0.0
+
+
+def test_retry_after_overrides_shorter_backoff(clock):
+    limiter = make_limiter()
+    assert limiter.feedback(URL, status=429, retry_after='60') == pytest.approx(60.0)
+    assert limiter._hosts['example.test'].blocked_until == pytest.approx(clock.now + 60.0)
+
+    when = datetime.now(timezone.utc) + timedelta(seconds=90)
+    delay = limiter.feedback(URL, status=503, retry_after=format_datetime(when, usegmt=True))
+    assert delay == pytest.approx(90, abs=2)
+
+
+def test_retry_after_shorter_than_backoff_is_ignored(clock):
+    limiter = make_limiter(backoff_base=10.0, max_backoff=10.0)
+    assert limiter.feedback(URL, status=429, retry_after='1') >= 5.0
@@ -0,0 +1,96 @@
+"""Classements: départage par confrontations directes, par journée et en simulation"""
+
+import numpy as np
+import pandas as pd
+
+from simulator import simulate_season
+from standings import assign_matchdays, standings, standings_by_matchday
+from test_feature_store import round_robin_history
+
+SEASON = '2023/2024'
+
+
+def match(date, home, away, score):
+    return {'season': SEASON, 'date': date, 'home_team': home, 'away_team': away, 'score': score}
+
+
+def h2h_tie():
+    """A et B à 6 points, A meilleure différence de buts (+5 contre +2), B a battu A"""
+    return pd.DataFrame([
+        match('2023-09-01', 'A', 'C', '3 - 0'),
+        match('2023-09-08', 'B', 'A', '1 - 0'),
+        match('2023-09-15', 'A', 'C', '3 - 0'),
+        match('2023-09-15', 'B', 'C', '1 - 0'),
+    ])
+
+
+def final_matchday(by_matchday: pd.DataFrame) -> pd.DataFrame:
+    last = by_matchday['matchday'] == by_matchday.groupby('season')['matchday'].transform('max')
+    return by_matchday[last].drop(columns='matchday').reset_index(drop=True)
+
+
+def test_head_to_head_beats_goal_difference():
+    table = standings(h2h_tie())
+    assert table['team'].tolist() == ['B', 'A', 'C']
+    assert table.set_index('team').loc[['A', 'B'], 'goal_diff'].tolist() == [5, 2]
+
+
+def test_final_matchday_matches_standings_on_head_to_head_tie():
+    by_matchday = standings_by_matchday(h2h_tie())
+    assert final_matchday(by_matchday)['team'].tolist() == ['B', 'A', 'C']
+    pd.testing.assert_frame_equal(final_matchday(by_matchday), standings(h2h_tie()))
+
+
+def friday_to_monday_rounds(n_rounds: int = 14, seed: int = 5) -> pd.DataFrame:
+    """Journées du vendredi (round_robin_history) dont un match est joué le lundi suivant"""
+    history = round_robin_history(n_rounds, seed=seed)
+    monday = history.groupby('date').head(1).index
+    history.loc[monday, 'date'] = (pd.to_datetime(history.loc[monday, 'date'])
+                                   + pd.Timedelta(days=3)).dt.strftime('%Y-%m-%d')
+    return history
+
+
+def test_round_crossing_a_monday_is_one_matchday():
+    history = friday_to_monday_rounds()
+    dates = pd.to_datetime(history['date'])
+    assert set(dates.dt.day_name()) == {'Friday', 'Monday'}
+
+    matchdays = assign_matchdays(history)
+    assert matchdays.max() == 14
+    # Chaque journée: 4 matchs, du vendredi au lundi suivant
+    assert (matchdays.value_counts() == 4).all()
+    spans = dates.groupby(matchdays.to_numpy()).agg(['min', 'max'])
+    assert ((spans['max'] - spans['min']) == pd.Timedelta(days=3)).all()
+
+
+def test_round_column_takes_precedence():
+    history = friday_to_monday_rounds(4)
+    history['round'] = np.repeat([10, 11, 12, 13], 4)
+    history.loc[history.index[:2], 'round'] = 11
+    assert assign_matchdays(history).tolist() == [2, 2, 1, 1] + [2] * 4 + [3] * 4 + [4] * 4
+    by_matchday = standings_by_matchday(history)
+    assert by_matchday.groupby('matchday')['played'].sum().tolist() == [4, 16, 24, 32]
+
+
+def test_each_matchday_matches_standings_as_of():
+    history = friday_to_monday_rounds()
+    by_matchday = standings_by_matchday(history)
+    # Dernier jour de chaque journée: le lundi qui la termine
+    round_ends = sorted(pd.to_datetime(history['date']).loc[lambda d: d.dt.dayofweek == 0].unique())
+    assert sorted(by_matchday['matchday'].unique()) == list(range(1, len(round_ends) + 1))
+    for matchday, table in by_matchday.groupby('matchday'):
+        expected = standings(history, as_of=round_ends[matchday - 1])
+        assert table['team'].tolist() == expected['team'].tolist(), matchday
+        assert table['played'].sum() == 8 * matchday
+
+
+def test_simulation_uses_head_to_head_tie_break():
+    played = h2h_tie()
+    # Match restant C - D certain (0 - 0): le classement final est déterministe
+    fixtures = pd.DataFrame({'home_team': ['C'], 'away_team': ['D']})
+    matrices = np.zeros((1, 4, 4))
+    matrices[0, 0, 0] = 1.0
+    result = simulate_season(played, fixtures, matrices, n_sims=200, seed=1, workers=1).set_index('team')
+    assert result.loc['B', 'pos_1'] == 1.0
+    assert result.loc['A', 'pos_2'] == 1.0
+    assert result.loc['B', 'p_title'] == 1.0
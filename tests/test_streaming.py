@@ -0,0 +1,49 @@
+"""Extraction en streaming de la table des matchs (comparée à parse_match_rows)"""
+
+import pytest
+
+import html_parsing
+from benchmark_parsing import build_matches_page
+from html_parsing import iter_match_rows, parse_match_rows
+
+
+@pytest.fixture(params=['lxml', 'strainer'])
+def streaming_backend(request, monkeypatch):
+    if request.param == 'lxml' and not html_parsing.HAS_LXML:
+        pytest.skip("lxml absent")
+    if request.param == 'strainer':
+        monkeypatch.setattr(html_parsing, 'HAS_LXML', False)
+    return request.param
+
+
+def test_iter_match_rows_matches_parse_match_rows(streaming_backend):
+    page = build_matches_page(120)
+    streamed = [match for match, _ in iter_match_rows(page)]
+    assert streamed == parse_match_rows(page)
+
+
+def test_selenium_streaming_uses_matches_table_layout(streaming_backend):
+    botola_scraper = pytest.importorskip('botola_scraper')
+    page = build_matches_page(30)
+    scraper = botola_scraper.BotolaScraper()
+    streamed = list(scraper.iter_matches_from_html(page))
+    expected = parse_match_rows(page)
+
+    assert len(streamed) == len(expected)
+    for row, match in zip(streamed, expected):
+        assert {key: row[key] for key in match} == match
+        home_goals, away_goals = (int(goals) for goals in match['score'].split(' - '))
+        assert (row['home_goals'], row['away_goals']) == (home_goals, away_goals)
+        assert float(row['xg_home']) >= 0 and float(row['xg_away']) >= 0
+
+
+def test_selenium_default_and_streaming_paths_agree(streaming_backend):
+    botola_scraper = pytest.importorskip('botola_scraper')
+    page = build_matches_page(40, seed=7)
+    scraper = botola_scraper.BotolaScraper()
+    parsed = scraper.extract_matches_from_page(html_parsing.make_soup(page))
+    streamed = list(scraper.iter_matches_from_html(page))
+
+    assert len(parsed) == 40
+    assert parsed == streamed
+    assert all(row['match_url'] for row in parsed)